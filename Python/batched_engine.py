@@ -0,0 +1,186 @@
+"""
+This .py file defines the PyTacToeBatchedGame class, a vectorized counterpart of PyTacToeGame that holds many boards as one NumPy array.
+It is intended for bulk self-play and dataset generation, where looping over PyTacToeGame objects in Python is too slow.
+
+Boards are stored as a (batch, cells) uint8 array using the solved table's digits: 0 empty, 1 'X', 2 'O'.
+Batched operations cover legal-move masks, applying moves, winner/tie detection via line reductions, and the RANDOM,
+HEURISTIC/HEURISTIC_DIFFICULT (and, on 3x3 with the solved table present, MINIMAX_WIN_IMPOSSIBLE) policies.
+The heuristic mirrors PyTacToeGame.computer_move_heuristic_logic and picks the same move position for position.
+
+Requires NumPy (pip install numpy), the rest of the project does not.
+"""
+
+import numpy as np
+from game_logic import PyTacToeGame, PyTacToeGameComputerLogic
+from solved_table import HEADER_SIZE
+
+EMPTY : int = 0
+X : int = 1
+O : int = 2
+
+ONGOING : int = 0 # Result codes, X (1) and O (2) for wins
+DRAW : int = 3
+
+
+class PyTacToeBatchedGame:
+
+    def __init__(self, batch_size : int, rows : int = 3, cols : int = 3, win_length : int = 3, seed : int | None = None):
+        self.scalar_game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length) # Source of the line tables and heuristic cell groups
+        self.batch_size : int = batch_size
+        self.rows : int = rows
+        self.cols : int = cols
+        self.win_length : int = win_length
+        self.cell_count : int = rows * cols
+        self.rng : np.random.Generator = np.random.default_rng(seed)
+
+        self.lines : np.ndarray = np.array(self.scalar_game.winning_combinations, dtype=np.intp).reshape(-1, win_length) # (lines, k) cell indices
+        self.line_incidence : np.ndarray = np.zeros((len(self.lines), self.cell_count), dtype=np.float32) # 1 where a line passes through a cell
+        self.line_incidence[np.repeat(np.arange(len(self.lines)), win_length), self.lines.ravel()] = 1.0
+
+        self.center_order : np.ndarray = np.array(self.scalar_game.center_cells, dtype=np.intp)
+        self.opposite_corners : tuple[tuple[int, int], ...] = self.scalar_game.opposite_corners
+        self.fallback_order : np.ndarray = np.array(self.scalar_game.corner_cells + self.scalar_game.side_cells + self.scalar_game.inner_cells, dtype=np.intp)
+
+        self.boards : np.ndarray = np.zeros((batch_size, self.cell_count), dtype=np.uint8)
+        self.current_player : np.ndarray = np.full(batch_size, X, dtype=np.uint8)
+        self.results : np.ndarray = np.zeros(batch_size, dtype=np.uint8) # ONGOING, X, O or DRAW
+        self.move_counts : np.ndarray = np.zeros(batch_size, dtype=np.int16)
+
+
+    def apply_moves(self, moves : np.ndarray) -> None:
+        """Plays moves[i] for the current player of every ongoing board i (moves of -1 or on finished boards are skipped),
+        then updates the results and switches the player on the boards that moved.
+        """
+        active = (moves >= 0) & (self.results == ONGOING)
+        rows = np.nonzero(active)[0]
+        cells = moves[rows]
+        if np.any(self.boards[rows, cells] != EMPTY): raise ValueError("Move played on an occupied cell.")
+        self.boards[rows, cells] = self.current_player[rows]
+        self.move_counts[rows] += 1
+        self.results[rows] = self.check_results(rows=rows)
+        self.current_player[rows] = 3 - self.current_player[rows] # 1 <-> 2
+
+
+    def bitboards(self) -> list[tuple[int, int]]:
+        """Returns the (x_bits, o_bits) pair of every board, matching PyTacToeGame.x_bits/o_bits."""
+        weights = [1 << cell for cell in range(self.cell_count)]
+        return [(sum(w for w, v in zip(weights, board) if v == X), sum(w for w, v in zip(weights, board) if v == O)) for board in self.boards.tolist()]
+
+
+    def check_results(self, rows : np.ndarray | None = None) -> np.ndarray:
+        """Returns the result code (ONGOING, X, O or DRAW) of the given boards (default: all) from a reduction over the winning lines."""
+        boards = self.boards if rows is None else self.boards[rows]
+        line_marks = boards[:, self.lines] # (boards, lines, k)
+        x_wins = np.all(line_marks == X, axis=2).any(axis=1)
+        o_wins = np.all(line_marks == O, axis=2).any(axis=1)
+        full = np.all(boards != EMPTY, axis=1)
+        return np.select([x_wins, o_wins, full], [X, O, DRAW], default=ONGOING).astype(np.uint8)
+
+
+    def computer_moves(self, logic : PyTacToeGameComputerLogic | np.ndarray) -> np.ndarray:
+        """Returns the move the given logic picks on every board (-1 on finished boards), without applying it.
+        logic may be one PyTacToeGameComputerLogic for the whole batch or an array of logic values, one per board.
+        """
+        if isinstance(logic, PyTacToeGameComputerLogic): return self.moves_for_logic(logic=logic)
+        moves = np.full(self.batch_size, -1, dtype=np.intp)
+        for value in np.unique(logic):
+            selected = logic == value
+            moves[selected] = self.moves_for_logic(logic=PyTacToeGameComputerLogic(int(value)))[selected]
+        return moves
+
+
+    def first_empty(self, order : np.ndarray, candidates : np.ndarray | None = None) -> np.ndarray:
+        """Returns, per board, the first cell of order that is empty (and flagged in candidates if given), -1 if none."""
+        if len(order) == 0: return np.full(self.batch_size, -1, dtype=np.intp)
+        usable = self.boards[:, order] == EMPTY
+        if candidates is not None: usable &= candidates[:, order]
+        return np.where(usable.any(axis=1), order[usable.argmax(axis=1)], -1)
+
+
+    def heuristic_moves(self, difficult : bool) -> np.ndarray:
+        """Batched PyTacToeGame.computer_move_heuristic_logic (HEURISTIC, or HEURISTIC_DIFFICULT if difficult), -1 on finished boards."""
+        moves = self.winning_cells(marks=self.current_player)                               # 1 - Win if possible
+        if difficult:                                                                       # 2 - Block the opponent's win
+            blocks = self.winning_cells(marks=3 - self.current_player)
+            moves = np.where(moves >= 0, moves, blocks)
+
+        moves = np.where(moves >= 0, moves, self.first_empty(order=self.center_order))     # 3 - Center
+        for corner, opposite in self.opposite_corners:                                      # 4 - Corner opposite a mark
+            take = (moves < 0) & (self.boards[:, corner] != EMPTY) & (self.boards[:, opposite] == EMPTY)
+            moves = np.where(take, opposite, moves)
+        moves = np.where(moves >= 0, moves, self.first_empty(order=self.fallback_order))   # 5/6/7 - Corners, sides, rest
+        return np.where(self.results == ONGOING, moves, -1)
+
+
+    def legal_move_mask(self) -> np.ndarray:
+        """Returns a (batch, cells) bool mask of the legal moves, all False on finished boards."""
+        return (self.boards == EMPTY) & (self.results == ONGOING)[:, None]
+
+
+    def load_bitboards(self, positions : list[tuple[int, int]]) -> None:
+        """Replaces the batch with the given (x_bits, o_bits) positions, the side to move is derived from the piece counts."""
+        self.batch_size = len(positions)
+        cells = range(self.cell_count)
+        x_bits = np.array([[x >> cell & 1 for cell in cells] for x, _ in positions], dtype=np.uint8).reshape(-1, self.cell_count)
+        o_bits = np.array([[o >> cell & 1 for cell in cells] for _, o in positions], dtype=np.uint8).reshape(-1, self.cell_count)
+        self.boards = (x_bits * X + o_bits * O).astype(np.uint8)
+        x_count = x_bits.sum(axis=1)
+        o_count = o_bits.sum(axis=1)
+        self.current_player = np.where(x_count == o_count, X, O).astype(np.uint8)
+        self.move_counts = (x_count + o_count).astype(np.int16)
+        self.results = self.check_results()
+
+
+    def minimax_moves(self) -> np.ndarray:
+        """Best moves looked up in the memory-mapped solved table (3x3, 3 in a row only), picked like PyTacToeGame.computer_move_minimax_best."""
+        table = self.scalar_game.solved_table
+        if table is None: raise ValueError("MINIMAX_WIN_IMPOSSIBLE is only batched on 3x3 boards w/the solved table present.")
+        records = np.frombuffer(table.mmap, dtype="<u2", count=3 ** self.cell_count, offset=HEADER_SIZE)
+        indices = self.boards.astype(np.int64) @ (3 ** np.arange(self.cell_count, dtype=np.int64))
+        best_mask = records[indices] & 0x1FF
+        order = np.array(self.scalar_game.minimax_engine.move_order, dtype=np.intp)
+        candidates = ((best_mask[:, None] >> np.arange(self.cell_count)) & 1).astype(bool)
+        return np.where(self.results == ONGOING, self.first_empty(order=order, candidates=candidates), -1)
+
+
+    def moves_for_logic(self, logic : PyTacToeGameComputerLogic) -> np.ndarray:
+        """Returns the moves of a single logic for the whole batch."""
+        if logic == PyTacToeGameComputerLogic.RANDOM: return self.random_moves()
+        if logic == PyTacToeGameComputerLogic.HEURISTIC: return self.heuristic_moves(difficult=False)
+        if logic == PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT: return self.heuristic_moves(difficult=True)
+        if logic == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE: return self.minimax_moves()
+        raise ValueError(f"{logic} has no batched policy.")
+
+
+    def play_games(self, x_logic : PyTacToeGameComputerLogic, o_logic : PyTacToeGameComputerLogic) -> np.ndarray:
+        """Plays every board to the end ('X' using x_logic, 'O' using o_logic) and returns the result codes."""
+        logic = np.empty(self.batch_size, dtype=np.int8)
+        while np.any(self.results == ONGOING):
+            logic[:] = np.where(self.current_player == X, x_logic.value, o_logic.value)
+            self.apply_moves(self.computer_moves(logic=logic))
+        return self.results
+
+
+    def random_moves(self) -> np.ndarray:
+        """Uniformly random legal move on every board (the batched RANDOM policy), -1 on finished boards."""
+        legal = self.legal_move_mask()
+        keys = np.where(legal, self.rng.random(legal.shape), -1.0)
+        return np.where(legal.any(axis=1), keys.argmax(axis=1), -1)
+
+
+    def reset(self) -> None:
+        """Clears every board, 'X' moves first."""
+        self.boards[:] = EMPTY
+        self.current_player[:] = X
+        self.results[:] = ONGOING
+        self.move_counts[:] = 0
+
+
+    def winning_cells(self, marks : np.ndarray) -> np.ndarray:
+        """Returns, per board, the lowest empty cell that completes a line for marks[i] (-1 if none), like scan_board_for_winning_move."""
+        line_marks = self.boards[:, self.lines]
+        own = (line_marks == marks[:, None, None]).sum(axis=2)
+        empty = (line_marks == EMPTY).sum(axis=2)
+        open_lines = ((own == self.win_length - 1) & (empty == 1)).astype(np.float32) # (boards, lines)
+        candidates = (open_lines @ self.line_incidence > 0) & (self.boards == EMPTY)
+        return np.where(candidates.any(axis=1), candidates.argmax(axis=1), -1)
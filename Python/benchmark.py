@@ -0,0 +1,286 @@
+"""
+This .py file is the benchmark suite for the engine hot paths in game_logic.py (headless, no tkinter).
+
+Each benchmark is timed with timeit over several repeats, the per-call median/min (in microseconds) are written as JSON so runs
+can be compared over time. Passing --compare checks the run against an earlier JSON file and exits with status 1 if any benchmark
+got slower than the allowed threshold. --memory measures the per-game memory footprint instead (tracemalloc), --startup the
+startup time of fresh interpreters (imports and the GUI's first frame).
+
+Examples:
+    python benchmark.py --output baseline.json
+    python benchmark.py --output current.json --compare baseline.json --threshold 0.15
+    python benchmark.py --memory 100000
+    python benchmark.py --startup --output startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable
+from game_logic import PyTacToeBoardGeometry, PyTacToeGame, PyTacToeGameComputerLogic, build_winning_combinations
+from mcts_engine import PyTacToeMCTSEngine
+from self_play import play_headless_game
+
+DEFAULT_REPEAT : int = 5
+DEFAULT_MIN_TIME : float = 0.2 # Seconds each repeat should at least take, used to pick the # of calls per repeat
+
+# Representative 3x3 positions as (board, player to move), cells listed 0-8
+MIDGAME_POSITIONS : dict[str, tuple[str, str]] = {
+    "opening": ("X        ", 'O'),
+    "early": ("X   O   X", 'O'),
+    "middle": ("XO  X   O", 'X'),
+    "late": ("XOX OX  O", 'X'),
+}
+
+DEFAULT_STARTUP_SAMPLES : int = 5
+STARTUP_TIMEOUT : float = 30.0
+
+# Each script runs in a fresh interpreter, the time until it exits is its startup time. The engine must import without tkinter.
+STARTUP_SCRIPTS : dict[str, str] = {
+    "interpreter": "pass",
+    "import_game_logic": "import sys, game_logic; sys.exit('tkinter' in sys.modules)",
+    "import_gui": "import gui_main",
+    "first_frame": (
+        "import os, tkinter as tk\n"
+        "from gui_main import PyTacToeGUI\n"
+        "root = tk.Tk()\n"
+        "root.bind('<Map>', lambda event: os._exit(0))\n"  # Exits once the main window is mapped (the game mode modal is waiting)
+        "PyTacToeGUI(root, width=660, height=345)\n"
+        "root.mainloop()\n"
+    ),
+}
+
+
+def new_game(cells : str = " " * 9, player : str = 'X') -> PyTacToeGame:
+    """Returns a new game (w/its own seeded RNG) set to the position described by cells ('X', 'O' or ' ' per cell) and player to move.
+    Every benchmark gets its own game, so no benchmark sees the state another one left behind and the results don't depend on the run order.
+    """
+    game = PyTacToeGame()
+    game.rng = random.Random(0)
+    game.board = [cell if cell in ('X', 'O') else game.empty_mark for cell in cells]
+    game.current_player = player
+    return game
+
+
+def build_benchmarks() -> dict[str, Callable[[], object]]:
+    """Returns {benchmark name: zero-argument callable}, each callable performs one timed call."""
+    benchmarks : dict[str, Callable[[], object]] = {}
+
+    # Win/tie checks on a full board w/no winner (worst case) and a won board
+    full_game = new_game(cells="XOXXOOOXX")
+    x_bits, o_bits = full_game.x_bits, full_game.o_bits
+    def check_winner_full_scan() -> object:
+        full_game.x_bits, full_game.o_bits, full_game.last_move = x_bits, o_bits, -1
+        return full_game.check_winner()
+    last_move_game = new_game(cells="XOXXOOOXX")
+    def check_winner_last_move() -> object:
+        last_move_game.x_bits, last_move_game.o_bits, last_move_game.last_move = x_bits, o_bits, 8
+        return last_move_game.check_winner()
+    benchmarks["check_winner_full_scan"] = check_winner_full_scan
+    benchmarks["check_winner_last_move"] = check_winner_last_move
+    tie_game = new_game(cells="XOXXOOOXX")
+    benchmarks["check_tie"] = lambda: tie_game.check_tie()
+
+    scan_game = new_game(cells="XO  X   O")
+    empty_positions = [4, 5, 6, 7]
+    benchmarks["scan_board_for_winning_move"] = lambda: scan_game.scan_board_for_winning_move(board_mark='X', empty_positions=empty_positions)
+
+    # computer_move at every difficulty, from each representative position
+    for logic in PyTacToeGameComputerLogic:
+        if logic == PyTacToeGameComputerLogic.MCTS: continue # Always spends its time budget, timed by a fixed # of iterations below
+        for position_name, (cells, player) in MIDGAME_POSITIONS.items():
+            benchmarks[f"computer_move_{logic.name.lower()}_{position_name}"] = make_computer_move_benchmark(logic=logic, cells=cells, player=player)
+
+    # computer_move_minimax_best: solved table probe, engine search w/a cold (cleared) and warm transposition table, exhaustive reference
+    for position_name, (cells, player) in {"empty": (" " * 9, 'X'), **MIDGAME_POSITIONS}.items():
+        benchmarks[f"minimax_best_table_{position_name}"] = make_minimax_benchmark(cells=cells, player=player, use_table=True, cold=False)
+        benchmarks[f"minimax_best_search_cold_{position_name}"] = make_minimax_benchmark(cells=cells, player=player, use_table=False, cold=True)
+        benchmarks[f"minimax_best_search_warm_{position_name}"] = make_minimax_benchmark(cells=cells, player=player, use_table=False, cold=False)
+    # MCTS w/a fixed # of iterations (measures playout speed, the game logic itself runs for its time budget), a seeded engine per position
+    for position_name, (cells, player) in MIDGAME_POSITIONS.items():
+        mcts_game = new_game(cells=cells, player=player)
+        mcts_engine = PyTacToeMCTSEngine(rows=3, cols=3, winning_masks=mcts_game.winning_masks, iterations=500, seed=0)
+        benchmarks[f"mcts_500_iterations_{position_name}"] = (lambda mcts_engine=mcts_engine, mcts_x=mcts_game.x_bits, mcts_o=mcts_game.o_bits, player=player:
+                                                              mcts_engine.best_move(x_bits=mcts_x, o_bits=mcts_o, x_to_move=player == 'X', time_budget=1.0))
+
+    reference_game = new_game(cells="X        ", player='O')
+    reference_x, reference_o = reference_game.x_bits, reference_game.o_bits
+    benchmarks["minimax_reference_exhaustive_opening"] = lambda: reference_game.minimax_bits(x_bits=reference_x, o_bits=reference_o, is_maximizing=False)
+
+    # Full headless games (one call = one game), each matchup w/its own game and seeded RNG
+    for x_logic, o_logic in ((PyTacToeGameComputerLogic.RANDOM, PyTacToeGameComputerLogic.RANDOM),
+                             (PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT, PyTacToeGameComputerLogic.RANDOM),
+                             (PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE, PyTacToeGameComputerLogic.HEURISTIC)):
+        benchmarks[f"headless_game_{x_logic.name.lower()}_vs_{o_logic.name.lower()}"] = (
+            lambda x_logic=x_logic, o_logic=o_logic, headless_game=new_game(): play_headless_game(game=headless_game, x_logic=x_logic, o_logic=o_logic))
+    return benchmarks
+
+
+def compare_results(current : dict, baseline : dict, threshold : float) -> list[str]:
+    """Returns a description of every benchmark whose median got slower than baseline by more than threshold (0.1 -> 10%)."""
+    regressions : list[str] = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or base["median_us"] <= 0: continue
+        ratio = result["median_us"] / base["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {base['median_us']:.2f}us -> {result['median_us']:.2f}us ({(ratio - 1) * 100:+.1f}%)")
+    return regressions
+
+
+def make_computer_move_benchmark(logic : PyTacToeGameComputerLogic, cells : str, player : str) -> Callable[[], object]:
+    """Returns a callable that resets its own game to the position and plays one computer_move with the given logic."""
+    game = new_game(cells=cells, player=player)
+    x_bits, o_bits = game.x_bits, game.o_bits
+    def run() -> object:
+        game.x_bits, game.o_bits, game.last_move, game.current_player = x_bits, o_bits, -1, player
+        game.move_history.clear()
+        game.computer_logic_enum = logic
+        return game.computer_move()
+    return run
+
+
+def make_minimax_benchmark(cells : str, player : str, use_table : bool, cold : bool) -> Callable[[], object]:
+    """Returns a callable that runs computer_move_minimax_best on the position in its own game, w/ or w/o the solved table and w/a cleared table if cold.
+    The engine (and its transposition table) is still shared per geometry, a warm benchmark's table is warmed by its own calls.
+    """
+    game = new_game(cells=cells, player=player)
+    x_bits, o_bits = game.x_bits, game.o_bits
+    solved_table = game.solved_table
+    def run() -> object:
+        game.x_bits, game.o_bits, game.current_player = x_bits, o_bits, player
+        game.solved_table = solved_table if use_table else None
+        if cold: game.minimax_engine.transposition_table.clear()
+        try:
+            return game.computer_move_minimax_best()
+        finally:
+            game.solved_table = solved_table
+    return run
+
+
+def make_legacy_layout_game() -> SimpleNamespace:
+    """Returns an emulation of a PyTacToeGame before __slots__ and the shared geometry: a SimpleNamespace holding the old per-game attributes
+    (an instance __dict__ and per-game line tables). It approximates the old class, it isn't the old class itself, so its figure is labelled as emulated.
+    """
+    geometry = PyTacToeBoardGeometry.get(rows=3, cols=3, win_length=3)
+    game = SimpleNamespace(rows=3, cols=3, win_length=3, cell_count=9, match_count=0, empty_mark=' ', x_bits=0, o_bits=0,
+                           full_mask=(1 << 9) - 1, last_move=-1, computer_logic_enum=PyTacToeGameComputerLogic.HEURISTIC,
+                           current_player='X', rng=random.Random(), minimax_nodes_visited=0, minimax_engine=None, solved_table=None)
+    game.winning_combinations = build_winning_combinations(rows=3, cols=3, win_length=3)
+    game.winning_masks = tuple(sum(1 << i for i in combo) for combo in game.winning_combinations)
+    game.cell_line_masks = tuple(tuple(mask for mask in game.winning_masks if mask >> cell & 1) for cell in range(9))
+    game.center_cells, game.corner_cells, game.side_cells, game.inner_cells = (tuple(geometry.center_cells), tuple(geometry.corner_cells),
+                                                                               tuple(geometry.side_cells), tuple(geometry.inner_cells))
+    game.opposite_corners = tuple(tuple(pair) for pair in geometry.opposite_corners)
+    return game
+
+
+def measure_memory(count : int) -> dict[str, float]:
+    """Returns the bytes allocated per game when holding count games at once: the emulated old per-game layout, PyTacToeGame, and to_bytes() snapshots."""
+    PyTacToeGame() # Build the shared geometry, engine and solved table mapping outside the measurements
+    factories : dict[str, Callable[[], object]] = {
+        "legacy_layout_emulated": make_legacy_layout_game,
+        "slotted_game": PyTacToeGame,
+        "snapshot_bytes": lambda: PyTacToeGame().to_bytes(),
+    }
+    results : dict[str, float] = {}
+    for name, factory in factories.items():
+        tracemalloc.start()
+        games = [factory() for _ in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = current / count
+        del games
+    return results
+
+
+def measure_startup(samples : int = DEFAULT_STARTUP_SAMPLES) -> dict:
+    """Runs every STARTUP_SCRIPTS entry samples times in a fresh interpreter and returns the median/min wall time in milliseconds.
+    A script that fails (e.g. first_frame w/o a display, or game_logic pulling in tkinter) is reported as None.
+    """
+    results : dict[str, dict[str, float] | None] = {}
+    for name, script in STARTUP_SCRIPTS.items():
+        times : list[float] = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            try:
+                completed = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=STARTUP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                break
+            if completed.returncode != 0: break
+            times.append((time.perf_counter() - start) * 1e3)
+        results[name] = {"median_ms": statistics.median(times), "min_ms": min(times)} if len(times) == samples else None
+    return {"python": platform.python_version(), "platform": platform.platform(), "samples": samples, "results": results}
+
+
+def run_benchmarks(name_filter : str | None = None, repeat : int = DEFAULT_REPEAT, min_time : float = DEFAULT_MIN_TIME) -> dict:
+    """Runs every benchmark (whose name contains name_filter, if given) and returns the JSON serializable results."""
+    results : dict[str, dict] = {}
+    for name, func in build_benchmarks().items():
+        if name_filter and name_filter not in name: continue
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        number = max(1, int(number * min_time / 0.2)) # autorange targets 0.2s per repeat
+        per_call = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+        results[name] = {"median_us": statistics.median(per_call), "min_us": min(per_call), "calls_per_repeat": number, "repeat": repeat}
+    return {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "platform": platform.platform()},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Py-Tac-Toe engine hot paths.")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="Baseline JSON file to check for regressions against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown vs the baseline before failing (0.10 -> 10%%)")
+    parser.add_argument("--filter", dest="name_filter", default=None, help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Minimum seconds per repeat")
+    parser.add_argument("--memory", type=int, default=None, metavar="GAMES", help="Measure the memory per game holding this many games instead")
+    parser.add_argument("--startup", action="store_true", help="Measure import/first frame time in fresh interpreters instead")
+    args = parser.parse_args()
+
+    if args.startup:
+        startup = measure_startup(samples=args.repeat)
+        for name, result in startup["results"].items():
+            print(f"{name:<20} " + (f"{result['median_ms']:>10.1f} ms (min {result['min_ms']:.1f})" if result else "       n/a"))
+        if args.output:
+            with open(args.output, "w") as file: json.dump(startup, file, indent=2)
+        return
+
+    if args.memory:
+        for name, per_game in measure_memory(count=args.memory).items():
+            print(f"{name:<22} {per_game:>10.1f} bytes/game  ({per_game * 1_000_000 / 2 ** 20:,.0f} MiB per million games)")
+        print("legacy_layout_emulated is a SimpleNamespace w/the pre-__slots__ attributes, an estimate of the old class rather than a measurement of it")
+        return
+
+    current = run_benchmarks(name_filter=args.name_filter, repeat=args.repeat, min_time=args.min_time)
+    for name, result in current["results"].items():
+        print(f"{name:<55} {result['median_us']:>12.2f} us/call (min {result['min_us']:.2f})")
+
+    if args.output:
+        with open(args.output, "w") as file: json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file: baseline = json.load(file)
+        regressions = compare_results(current=current, baseline=baseline, threshold=args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold * 100:.0f}%:")
+            for regression in regressions: print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold * 100:.0f}% vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+This .py file exports labelled positions as NumPy .npy files for training compact policy/value models.
+
+Positions come from one of two sources:
+    all         every reachable position that is not over yet, layer by layer (# of moves played), sorted within a layer (boards up to 16 cells)
+    self-play   --positions positions sampled from batched games between two computer strategies (PyTacToeBatchedGame),
+                each game stopped at a random ply, w/--random-rate of the moves played at random for variety (boards up to 16 cells)
+Every position is labelled w/its game value and optimal moves. They are probed from the 3x3 solved table or the 4x4 tablebase when the
+geometry has one (vectorized over a whole chunk), otherwise searched to the end w/the alpha-beta engine (one search per legal move), which
+is why both sources are limited to boards of up to MAX_EXHAUSTIVE_CELLS cells.
+
+Files written to --output:
+    planes.npy          uint8 (N, 2, rows, cols)    plane 0 X marks, plane 1 O marks
+    side_to_move.npy    uint8 (N,)                  1 if 'X' is to move, 0 if 'O'
+    value.npy           int8 (N,)                   game value from X's perspective (+1 X wins, 0 draw, -1 O wins)
+    policy.npy          float32 (N, rows * cols)    best-move distribution, uniform over the optimal moves
+    manifest.json       geometry, source, seed and # of positions
+The arrays are created w/np.lib.format.open_memmap and filled chunk by chunk as the workers return them (in chunk order), so memory stays
+bounded by the chunks in flight and the files only depend on the arguments, not on the # of workers. Read them back w/np.load(path, mmap_mode='r').
+
+Requires NumPy (pip install numpy).
+
+Examples:
+    python dataset_export.py --source all --output data/3x3
+    python dataset_export.py --source all --rows 4 --cols 4 --win-length 4 --output data/4x4k4      (after python tablebase.py build --win-length 4)
+    python dataset_export.py --source self-play --positions 1000000 --strategy-a HEURISTIC --random-rate 0.3 --output data/3x3_self_play
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+import numpy as np
+from batched_engine import EMPTY, ONGOING, O, X, PyTacToeBatchedGame
+from game_logic import MAX_EXHAUSTIVE_CELLS, PyTacToeGame, PyTacToeGameComputerLogic
+from self_play import parse_logic
+from solved_table import HEADER_SIZE
+
+DEFAULT_CHUNK_SIZE : int = 65536    # Positions per job submitted to the pool (and per write to the output files)
+MAX_ENUMERATED_CELLS : int = 16     # --source all keeps a 2^cells line table and packs positions into 32 bits
+DATASET_FILES : tuple[str, ...] = ("planes", "side_to_move", "value", "policy")
+
+
+def enumerate_reachable(rows : int, cols : int, win_length : int) -> np.ndarray:
+    """Returns every reachable position that is not over yet as a (N, cells) array of board digits (0 empty, 1 X, 2 O).
+    Positions are generated one layer (# of moves played) at a time from the unfinished positions of the previous layer,
+    packed as x_bits | o_bits << cells, so every layer comes out sorted and the order is fixed.
+    """
+    cell_count = rows * cols
+    if cell_count > MAX_ENUMERATED_CELLS: raise ValueError(f"--source all supports boards of up to {MAX_ENUMERATED_CELLS} cells, use --source self-play.")
+    winning_masks = PyTacToeGame(rows=rows, cols=cols, win_length=win_length).geometry.winning_masks
+    all_bits = np.arange(1 << cell_count, dtype=np.uint32)
+    has_line = np.zeros(1 << cell_count, dtype=bool)
+    for mask in winning_masks: has_line |= (all_bits & mask) == mask
+    low_mask = np.uint32((1 << cell_count) - 1)
+
+    layer = np.zeros(1, dtype=np.uint32)
+    open_layers : list[np.ndarray] = []
+    for count in range(cell_count):
+        x_bits, o_bits = layer & low_mask, layer >> cell_count
+        layer = layer[~(has_line[x_bits] | has_line[o_bits])] # Finished positions are neither exported nor expanded
+        if not len(layer): break
+        open_layers.append(layer)
+        occupied = (layer | layer >> cell_count) & low_mask
+        shift = 0 if count % 2 == 0 else cell_count
+        children = [layer[(occupied >> cell & 1) == 0] | np.uint32(1 << (cell + shift)) for cell in range(cell_count)]
+        layer = np.unique(np.concatenate(children))
+
+    packed = np.concatenate(open_layers)
+    cells = np.arange(cell_count, dtype=np.uint32)
+    return ((packed[:, None] >> cells & 1) * X + (packed[:, None] >> (cells + cell_count) & 1) * O).astype(np.uint8)
+
+
+def sample_self_play(rows : int, cols : int, win_length : int, count : int, seed : int, x_logic : PyTacToeGameComputerLogic,
+                     o_logic : PyTacToeGameComputerLogic, random_rate : float) -> np.ndarray:
+    """Plays count batched games and returns one unfinished position of each as a (count, cells) array of board digits.
+    Each game is stopped at a random ply (the last position before the game ended if it ended sooner).
+    """
+    batch = PyTacToeBatchedGame(batch_size=count, rows=rows, cols=cols, win_length=win_length, seed=seed)
+    stop_ply = batch.rng.integers(0, batch.cell_count, size=count)
+    positions = batch.boards.copy()
+    logic = np.empty(count, dtype=np.int8)
+    while np.any(batch.results == ONGOING):
+        take = (batch.results == ONGOING) & (batch.move_counts <= stop_ply)
+        positions[take] = batch.boards[take]
+        logic[:] = np.where(batch.current_player == X, x_logic.value, o_logic.value)
+        logic[batch.rng.random(count) < random_rate] = PyTacToeGameComputerLogic.RANDOM.value
+        batch.apply_moves(batch.computer_moves(logic=logic))
+    return positions
+
+
+def label_positions(game : PyTacToeGame, boards : np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns (game values from X's perspective as int8, (N, cells) bool mask of the optimal moves) for unfinished positions."""
+    cell_count = boards.shape[1]
+    indices = boards.astype(np.int64) @ (3 ** np.arange(cell_count, dtype=np.int64)) # Perfect index of the solved table and the tablebase
+    code_to_value = np.array([0, -1, 0, 1], dtype=np.int8)
+
+    if game.solved_table is not None:
+        records = np.frombuffer(game.solved_table.mmap, dtype="<u2", count=3 ** cell_count, offset=HEADER_SIZE)[indices]
+        return code_to_value[records >> 9 & 0x3], (records[:, None] >> np.arange(cell_count) & 1).astype(bool)
+
+    if game.tablebase is not None:
+        codes = game.tablebase.codes(indices)
+        x_counts = (boards == X).sum(axis=1)
+        digits = np.where(x_counts == (boards == O).sum(axis=1), X, O).astype(np.int64)
+        best = np.zeros(boards.shape, dtype=bool)
+        for cell in range(cell_count):
+            empty = boards[:, cell] == EMPTY
+            best[empty, cell] = game.tablebase.codes(indices[empty] + digits[empty] * 3 ** cell) == codes[empty]
+        return code_to_value[codes], best
+
+    # No table for this geometry: search the position and every successor
+    engine = game.minimax_engine
+    values = np.zeros(len(boards), dtype=np.int8)
+    best = np.zeros(boards.shape, dtype=bool)
+    weights = [1 << cell for cell in range(cell_count)]
+    for row, board in enumerate(boards.tolist()):
+        x_bits = sum(weight for weight, digit in zip(weights, board) if digit == X)
+        o_bits = sum(weight for weight, digit in zip(weights, board) if digit == O)
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        _, value = engine.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move)
+        values[row] = value
+        for cell, digit in enumerate(board):
+            if digit != EMPTY: continue
+            child = (x_bits | weights[cell], o_bits) if x_to_move else (x_bits, o_bits | weights[cell])
+            best[row, cell] = engine.best_move(x_bits=child[0], o_bits=child[1], x_to_move=not x_to_move)[1] == value
+    return values, best
+
+
+def export_chunk(job : tuple) -> tuple[int, dict[str, np.ndarray]]:
+    """Worker entry point: builds (or samples) and labels one chunk of positions, returns (offset of its first position, arrays by file name).
+    job = (offset, rows, cols, win length, boards or None, count, seed, X strategy, O strategy, random rate), boards None -> self-play sample
+    """
+    offset, rows, cols, win_length, boards, count, seed, x_logic, o_logic, random_rate = job
+    if boards is None:
+        boards = sample_self_play(rows=rows, cols=cols, win_length=win_length, count=count, seed=seed, x_logic=x_logic, o_logic=o_logic,
+                                  random_rate=random_rate)
+    game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+    values, best = label_positions(game=game, boards=boards)
+
+    x_marks, o_marks = boards == X, boards == O
+    return offset, {
+        "planes": np.stack((x_marks, o_marks), axis=1).reshape(len(boards), 2, rows, cols).astype(np.uint8),
+        "side_to_move": (x_marks.sum(axis=1) == o_marks.sum(axis=1)).astype(np.uint8),
+        "value": values,
+        "policy": (best / best.sum(axis=1, keepdims=True)).astype(np.float32),
+    }
+
+
+def export_dataset(output : str, source : str, rows : int = 3, cols : int = 3, win_length : int = 3, positions : int = 0, seed : int = 0,
+                   x_logic : PyTacToeGameComputerLogic = PyTacToeGameComputerLogic.HEURISTIC,
+                   o_logic : PyTacToeGameComputerLogic = PyTacToeGameComputerLogic.HEURISTIC, random_rate : float = 0.25,
+                   workers : int | None = None, chunk_size : int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Writes the dataset files to the output directory over a process pool (workers=1 runs in-process) and returns the manifest.
+    Raises ValueError for boards w/more than MAX_EXHAUSTIVE_CELLS cells, their positions can't be labelled in reasonable time.
+    """
+    start = time.perf_counter()
+    cell_count = rows * cols
+    if cell_count > MAX_EXHAUSTIVE_CELLS: raise ValueError(f"Positions are labelled by exhaustive search, boards are limited to {MAX_EXHAUSTIVE_CELLS} cells.")
+    if source == "all":
+        boards = enumerate_reachable(rows=rows, cols=cols, win_length=win_length)
+        total = len(boards)
+        jobs = [(offset, rows, cols, win_length, boards[offset:offset + chunk_size], 0, 0, None, None, 0.0) for offset in range(0, total, chunk_size)]
+    else:
+        total = positions
+        jobs = [(offset, rows, cols, win_length, None, min(chunk_size, total - offset), random.Random(f"{seed}:{offset}").getrandbits(64),
+                 x_logic, o_logic, random_rate) for offset in range(0, total, chunk_size)]
+
+    os.makedirs(output, exist_ok=True)
+    shapes = {"planes": ((total, 2, rows, cols), np.uint8), "side_to_move": ((total,), np.uint8), "value": ((total,), np.int8),
+              "policy": ((total, cell_count), np.float32)}
+    arrays = {name: np.lib.format.open_memmap(os.path.join(output, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape)
+              for name, (shape, dtype) in shapes.items()}
+
+    workers = workers or os.cpu_count() or 1
+
+    def collect(offset : int, chunk : dict[str, np.ndarray]) -> None:
+        for name, values in chunk.items(): arrays[name][offset:offset + len(values)] = values
+
+    if workers == 1:
+        for job in jobs: collect(*export_chunk(job))
+    else:
+        with Pool(processes=workers) as pool:
+            for offset, chunk in pool.imap(export_chunk, jobs): collect(offset, chunk) # In order, one chunk in memory at a time
+    for array in arrays.values(): array.flush()
+    del arrays
+
+    manifest = {"rows": rows, "cols": cols, "win_length": win_length, "source": source, "positions": total, "seed": seed,
+                "chunk_size": chunk_size, "files": {name: f"{name}.npy" for name in DATASET_FILES},
+                "seconds": round(time.perf_counter() - start, 3)}
+    if source == "self-play": manifest.update(x_logic=x_logic.name, o_logic=o_logic.name, random_rate=random_rate)
+    with open(os.path.join(output, "manifest.json"), "w") as file: json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export labelled Py-Tac-Toe positions as .npy training data.")
+    parser.add_argument("--output", required=True, help="Directory for the .npy files and manifest.json")
+    parser.add_argument("--source", choices=("all", "self-play"), default="all")
+    parser.add_argument("--positions", type=int, default=100000, help="# of positions to sample (self-play)")
+    parser.add_argument("--strategy-a", type=parse_logic, default=PyTacToeGameComputerLogic.HEURISTIC, help="Strategy of 'X' (self-play)")
+    parser.add_argument("--strategy-b", type=parse_logic, default=PyTacToeGameComputerLogic.HEURISTIC, help="Strategy of 'O' (self-play)")
+    parser.add_argument("--random-rate", type=float, default=0.25, help="Fraction of self-play moves played at random instead")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: # of CPU cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Positions per job and per write")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed, each self-play chunk derives its own seed from it")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    args = parser.parse_args()
+
+    manifest = export_dataset(output=args.output, source=args.source, rows=args.rows, cols=args.cols, win_length=args.win_length,
+                              positions=args.positions, seed=args.seed, x_logic=args.strategy_a, o_logic=args.strategy_b,
+                              random_rate=args.random_rate, workers=args.workers, chunk_size=args.chunk_size)
+    print(f"Wrote {manifest['positions']} positions ({args.rows}x{args.cols}, {args.win_length} in a row, {args.source}) "
+          f"to {args.output} in {manifest['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
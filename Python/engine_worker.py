@@ -0,0 +1,262 @@
+"""
+This .py file runs the Py-Tac-Toe engine as a long-lived worker process speaking a line-based text protocol on stdin/stdout (in the spirit of UCI),
+and defines PyTacToeEngineClient, which starts such a worker and asks it for moves (used by the GUI w/--engine-process).
+
+The worker keeps one PyTacToeGame per board geometry for its whole life, so the transposition tables, tables and pools stay warm across requests.
+Commands are read on a separate thread and run in order, so a client can pipeline any # of position/go pairs without waiting for the replies.
+Replies are flushed once no more commands are queued, a pipelined batch costs one write instead of one per position.
+
+Commands (one per line, cells are numbered row by row from 0):
+    ptt                                     -> id name Py-Tac-Toe, then pttok (handshake)
+    isready                                 -> readyok once every command before it has run
+    geometry <rows> <cols> <win length>     board size for the following positions (default 3 3 3)
+    position startpos [moves <cell> ...]    empty board plus the given moves, 'X' first
+    position board <cells> [X|O]            one character per cell: X, O or . (empty), the side to move defaults to the piece counts
+    difficulty <0-5>                        0 Easy, 1 Medium, 2 Hard, 3 Impossible, 4 Timed search, 5 MCTS
+    go [movetime <ms>] [id <tag>]           -> bestmove <cell> [id <tag>] (bestmove none if the game is over), or cancelled [id <tag>]
+    stop                                    cancels the running search and every go queued before it
+    quit                                    exits once every command before it has run
+A malformed command is answered w/error <message> and otherwise ignored.
+
+Example:
+    printf 'geometry 4 4 4\\nposition startpos moves 5 6\\ndifficulty 3\\ngo id 1\\nquit\\n' | python engine_worker.py
+"""
+
+import queue
+import subprocess
+import sys
+import threading
+from game_logic import DEFAULT_SEARCH_TIME_BUDGET, PyTacToeGame, PyTacToeGameComputerLogic, PyTacToeSearchCancelled
+
+ENGINE_NAME : str = "Py-Tac-Toe"
+WORKER_PATH : str = __file__
+CLIENT_POLL_SECONDS : float = 0.02 # How often a waiting client checks its stop_event
+
+
+class PyTacToeEngineError(Exception):
+    """Raised for a malformed command (answered w/an error line), or by the client when the worker reports an error or exits."""
+
+
+class PyTacToeWorkerStop:
+    """stop_event of one search: set once a stop command arrives after the go command that started it."""
+
+    def __init__(self, worker : "PyTacToeEngineWorker", generation : int):
+        self.worker : PyTacToeEngineWorker = worker
+        self.generation : int = generation
+
+
+    def is_set(self) -> bool:
+        return self.worker.stop_generation > self.generation
+
+
+class PyTacToeEngineWorker:
+
+    def __init__(self, input_stream = sys.stdin, output_stream = sys.stdout):
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.commands : queue.Queue = queue.Queue() # (stop generation when read, command line), None at the end of the input
+        self.stop_generation : int = 0              # Bumped by the reader thread on every stop command
+        self.games : dict[tuple[int, int, int], PyTacToeGame] = {}
+        self.game : PyTacToeGame = self.get_game(rows=3, cols=3, win_length=3)
+        self.logic : PyTacToeGameComputerLogic = PyTacToeGameComputerLogic.HEURISTIC # Set by difficulty, kept across positions and geometries
+
+
+    def get_game(self, rows : int, cols : int, win_length : int) -> PyTacToeGame:
+        """Returns the worker's game for the geometry, created on first use and kept (w/its engines) for the life of the worker."""
+        key = (rows, cols, win_length)
+        game = self.games.get(key)
+        if game is None: game = self.games[key] = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+        return game
+
+
+    def go(self, args : list[str], generation : int) -> str:
+        """Searches the current position w/the current difficulty, returns the bestmove (or cancelled) reply."""
+        options = dict(zip(args[::2], args[1::2]))
+        tag = f" id {options['id']}" if "id" in options else ""
+        game = self.game
+        game.computer_logic_enum = self.logic
+        try:
+            game.search_time_budget = int(options["movetime"]) / 1000 if "movetime" in options else DEFAULT_SEARCH_TIME_BUDGET
+        except ValueError:
+            raise PyTacToeEngineError(f"Invalid movetime '{options['movetime']}'")
+
+        stop_event = PyTacToeWorkerStop(worker=self, generation=generation)
+        if stop_event.is_set(): return f"cancelled{tag}"
+        if game.has_line(game.x_bits) or game.has_line(game.o_bits): return f"bestmove none{tag}"
+        try:
+            move = game.select_computer_move(stop_event=stop_event)
+        except PyTacToeSearchCancelled:
+            return f"cancelled{tag}"
+        return f"bestmove {move if move != -1 else 'none'}{tag}"
+
+
+    def handle(self, line : str, generation : int) -> str | None:
+        """Runs one command line, returns its reply (None for commands w/o one). Raises PyTacToeEngineError for a malformed command."""
+        command, *args = line.split()
+        if command == "ptt": return f"id name {ENGINE_NAME}\npttok"
+        if command == "isready": return "readyok"
+        if command == "go": return self.go(args=args, generation=generation)
+        if command == "geometry":
+            try:
+                rows, cols, win_length = (int(arg) for arg in args)
+                self.game = self.get_game(rows=rows, cols=cols, win_length=win_length)
+            except ValueError as error:
+                raise PyTacToeEngineError(f"Invalid geometry '{' '.join(args)}': {error}")
+            self.game.reset_game()
+            self.game.current_player = 'X'
+            return None
+        if command == "position":
+            self.set_position(args=args)
+            return None
+        if command == "difficulty":
+            try:
+                self.logic = PyTacToeGameComputerLogic(int(args[0]))
+            except (IndexError, ValueError):
+                raise PyTacToeEngineError(f"Invalid difficulty '{' '.join(args)}'")
+            return None
+        raise PyTacToeEngineError(f"Unknown command '{command}'")
+
+
+    def read_commands(self) -> None:
+        """Reader thread: queues the command lines, except stop, which takes effect right away."""
+        for line in self.input_stream:
+            line = line.strip()
+            if not line: continue
+            if line == "stop": self.stop_generation += 1
+            else: self.commands.put((self.stop_generation, line))
+            if line == "quit": break
+        self.commands.put(None) # Commands queued before quit (or the end of the input) still run and get their replies
+
+
+    def run(self) -> None:
+        """Runs commands until quit or the end of the input."""
+        threading.Thread(target=self.read_commands, daemon=True).start()
+        while True:
+            item = self.commands.get()
+            if item is None or item[1] == "quit": break
+            generation, line = item
+            try:
+                reply = self.handle(line=line, generation=generation)
+            except PyTacToeEngineError as error:
+                reply = f"error {error}"
+            if reply is not None: self.output_stream.write(reply + "\n")
+            if self.commands.empty(): self.output_stream.flush() # Pipelined replies go out together
+        self.output_stream.flush()
+
+
+    def set_position(self, args : list[str]) -> None:
+        """Sets up the position of a position command."""
+        game = self.game
+        if args[:1] == ["startpos"]:
+            if args[1:2] not in ([], ["moves"]): raise PyTacToeEngineError(f"Expected 'moves' after startpos, got '{args[1]}'")
+            game.reset_game()
+            game.current_player = 'X'
+            for move in args[2:]:
+                if not move.isdigit() or int(move) >= game.cell_count or not game.make_move(int(move)):
+                    raise PyTacToeEngineError(f"Illegal move '{move}'")
+                game.switch_player()
+        elif args[:1] == ["board"] and len(args) in (2, 3):
+            cells = args[1]
+            if len(cells) != game.cell_count or set(cells) - set("XO."):
+                raise PyTacToeEngineError(f"Expected {game.cell_count} cells of X, O or '.', got '{cells}'")
+            game.board = [game.empty_mark if cell == '.' else cell for cell in cells]
+            if len(args) == 3 and args[2] not in ('X', 'O'): raise PyTacToeEngineError(f"Invalid side to move '{args[2]}'")
+            game.current_player = args[2] if len(args) == 3 else ('X' if cells.count('X') == cells.count('O') else 'O')
+        else:
+            raise PyTacToeEngineError("Expected 'position startpos [moves ...]' or 'position board <cells> [X|O]'")
+
+
+class PyTacToeEngineClient:
+    """Starts an engine worker process and asks it for moves. best_move() is meant to be called from one thread at a time (e.g. the GUI's search thread)."""
+
+    def __init__(self, command : list[str] | None = None):
+        self.process = subprocess.Popen(command or [sys.executable, WORKER_PATH], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        self.replies : queue.Queue = queue.Queue() # Reply lines, None once the worker exits
+        self.write_lock = threading.Lock()
+        self.next_id : int = 0
+        self.geometry : tuple[int, int, int] | None = None # Last geometry sent, only sent again when it changes
+        threading.Thread(target=self.read_replies, daemon=True).start()
+        self.send("ptt")
+        while self.read_reply() != "pttok": pass
+
+
+    def best_move(self, game : PyTacToeGame, stop_event : threading.Event | None = None) -> int:
+        """Returns the move the worker picks for the game's position, computer logic and time budget, like game.select_computer_move().
+        Raises PyTacToeSearchCancelled if stop_event gets set first (the worker is told to stop, its late reply is skipped).
+        """
+        return self.best_moves(games=[game], stop_event=stop_event)[0]
+
+
+    def best_moves(self, games : list[PyTacToeGame], stop_event : threading.Event | None = None) -> list[int]:
+        """Pipelines the positions of all the games to the worker and returns its moves in the same order (-1 if a game is over)."""
+        lines : list[str] = []
+        tags : list[str] = []
+        for game in games:
+            geometry = (game.rows, game.cols, game.win_length)
+            if geometry != self.geometry:
+                lines.append("geometry {} {} {}".format(*geometry))
+                self.geometry = geometry
+            cells = "".join('.' if mark == game.empty_mark else mark for mark in game.board)
+            tags.append(str(self.next_id))
+            self.next_id += 1
+            lines += [f"position board {cells} {game.current_player}", f"difficulty {game.computer_logic_enum.value}",
+                      f"go movetime {round(game.search_time_budget * 1000)} id {tags[-1]}"]
+        self.send(*lines)
+
+        moves : list[int] = []
+        for tag in tags:
+            while True:
+                reply = self.read_reply(stop_event=stop_event)
+                if reply.startswith("error"): raise PyTacToeEngineError(reply[len("error "):])
+                words = reply.split()
+                if words[-2:] != ["id", tag]: continue # Late reply of an earlier, cancelled request
+                if words[0] == "cancelled": raise PyTacToeSearchCancelled()
+                moves.append(-1 if words[1] == "none" else int(words[1]))
+                break
+        return moves
+
+
+    def close(self) -> None:
+        """Asks the worker to quit and waits for it."""
+        try:
+            self.send("quit")
+            self.process.stdin.close()
+        except (OSError, PyTacToeEngineError):
+            pass # Already gone
+        self.process.wait()
+
+
+    def read_replies(self) -> None:
+        """Reader thread: queues the worker's reply lines."""
+        for line in self.process.stdout: self.replies.put(line.strip())
+        self.replies.put(None)
+
+
+    def read_reply(self, stop_event : threading.Event | None = None) -> str:
+        """Returns the next reply line. If stop_event gets set while waiting, tells the worker to stop and raises PyTacToeSearchCancelled."""
+        while True:
+            try:
+                reply = self.replies.get(timeout=CLIENT_POLL_SECONDS)
+            except queue.Empty:
+                if stop_event is not None and stop_event.is_set():
+                    self.send("stop")
+                    raise PyTacToeSearchCancelled()
+                continue
+            if reply is None:
+                self.replies.put(None)
+                raise PyTacToeEngineError(f"Engine worker exited w/code {self.process.wait()}")
+            return reply
+
+
+    def send(self, *lines : str) -> None:
+        """Writes the command lines to the worker in one go, raises PyTacToeEngineError if the worker is gone."""
+        with self.write_lock:
+            try:
+                self.process.stdin.write("".join(line + "\n" for line in lines))
+                self.process.stdin.flush()
+            except (OSError, ValueError) as error: # Broken pipe, or stdin already closed by close()
+                raise PyTacToeEngineError(f"Engine worker is not running: {error}")
+
+
+if __name__ == "__main__":
+    PyTacToeEngineWorker().run()
@@ -0,0 +1,267 @@
+"""
+This .py file is a headless analysis tool (no tkinter) that annotates every move of the games in a binary game log (see game_log.py).
+
+Games stream through a generator pipeline, so memory use doesn't grow w/the size of the log:
+    read_game_log()  ->  annotate_game() (replays the record through PyTacToeGame, evaluates each position)  ->  PyTacToeAnalysisSummary
+Each move gets the game-theoretic value of the position before and after it (from X's perspective: +1 X wins, 0 draw, -1 O wins).
+A move is a blunder if it makes the value worse for the player who made it, e.g. turns a draw into a loss.
+
+Positions are evaluated by PyTacToePositionEvaluator: the solved table on 3x3 (O(1) probe), the alpha-beta engine otherwise.
+The engine searches to the end of the game, so games on boards w/more than MAX_EXHAUSTIVE_CELLS cells are skipped (and counted) rather than
+evaluated, as are records that can't be replayed (e.g. a corrupted log), instead of aborting the whole analysis.
+Values are cached on the canonical (symmetry-reduced) position, so positions repeated across games are evaluated once per process.
+Large logs are split into chunks of games analyzed over a process pool.
+
+Example:
+    python self_play.py --games 100000 --strategy-a HEURISTIC --strategy-b RANDOM --alternate --log games.log
+    python game_analysis.py games.log --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Iterable, Iterator
+from game_log import DEFAULT_GAME_LOG_PATH, HUMAN, PyTacToeGameRecord, read_game_log
+from game_logic import MAX_EXHAUSTIVE_CELLS, PyTacToeGame, PyTacToeGameComputerLogic
+
+DEFAULT_CHUNK_GAMES : int = 2000 # Games per chunk handed to a worker process
+DEFAULT_MAX_CACHE : int = 1 << 20 # Max # of cached position values per evaluator, the cache is cleared when it fills up
+
+
+def logic_name(logic : int) -> str:
+    """Returns the display name of a logic value stored in the game log ('HUMAN' for a person)."""
+    return "HUMAN" if logic == HUMAN else PyTacToeGameComputerLogic(logic).name
+
+
+class PyTacToePositionEvaluator:
+
+    def __init__(self, rows : int = 3, cols : int = 3, win_length : int = 3, max_cache : int = DEFAULT_MAX_CACHE):
+        self.game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length) # Source of the solved table and the shared engine
+        self.cache : dict[int, int] = {}   # Canonical position key -> value from X's perspective
+        self.max_cache : int = max_cache
+        self.hits : int = 0
+        self.misses : int = 0
+
+
+    def value(self, x_bits : int, o_bits : int, x_first : bool = True) -> int:
+        """Returns the game-theoretic value of a position from X's perspective (+1 X wins, 0 draw, -1 O wins), in a game 'X' (or 'O', x_first=False)
+        started. The tables are built for 'X' moving first, so an 'O'-first position is looked up w/the marks swapped and its value negated.
+        """
+        if not x_first: return -self.value(x_bits=o_bits, o_bits=x_bits)
+        key, _ = self.game.minimax_engine.canonical_key(own=x_bits, opp=o_bits) # The value is the same for every symmetric position
+        value = self.cache.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        table = self.game.solved_table if self.game.solved_table is not None else self.game.tablebase
+        value = table.value(x_bits=x_bits, o_bits=o_bits) if table is not None else None
+        if value is None: # No table for this geometry (or unreachable position), search it
+            _, value = self.game.minimax_engine.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_bits.bit_count() == o_bits.bit_count())
+        if len(self.cache) >= self.max_cache: self.cache.clear()
+        self.cache[key] = value
+        return value
+
+
+class PyTacToeMoveAnnotation:
+
+    __slots__ = ("ply", "player", "logic", "move", "value_before", "value_after")
+
+    def __init__(self, ply : int, player : str, logic : int, move : int, value_before : int, value_after : int):
+        self.ply : int = ply                    # 0 for the first move of the game
+        self.player : str = player              # 'X' or 'O'
+        self.logic : int = logic                # Logic value that made the move (HUMAN for a person)
+        self.move : int = move
+        self.value_before : int = value_before  # Values from X's perspective
+        self.value_after : int = value_after
+
+
+    @property
+    def blunder(self) -> bool:
+        """True if the move made the game value worse for the player who made it."""
+        return self.value_after < self.value_before if self.player == 'X' else self.value_after > self.value_before
+
+
+    def to_dict(self) -> dict:
+        """Returns the annotation as a JSON serializable dict."""
+        return {"ply": self.ply, "player": self.player, "logic": logic_name(self.logic), "move": self.move,
+                "value_before": self.value_before, "value_after": self.value_after, "blunder": self.blunder}
+
+
+def annotate_game(record : PyTacToeGameRecord, evaluator : PyTacToePositionEvaluator) -> Iterator[PyTacToeMoveAnnotation]:
+    """Replays a recorded game through PyTacToeGame and yields the annotation of every move, in order."""
+    game = PyTacToeGame(rows=record.rows, cols=record.cols, win_length=record.win_length)
+    game.current_player = record.first_player
+    x_first = record.first_player == 'X'
+    value = evaluator.value(x_bits=0, o_bits=0, x_first=x_first)
+    for ply, move in enumerate(record.moves):
+        player = game.current_player
+        if not 0 <= move < game.cell_count or not game.make_move(move): raise ValueError(f"Illegal move {move} at ply {ply} in a recorded game.")
+        value_after = evaluator.value(x_bits=game.x_bits, o_bits=game.o_bits, x_first=x_first)
+        yield PyTacToeMoveAnnotation(ply=ply, player=player, logic=record.x_logic if player == 'X' else record.o_logic, move=move,
+                                     value_before=value, value_after=value_after)
+        value = value_after
+        game.switch_player()
+
+
+class PyTacToeAnalysisSummary:
+
+    def __init__(self):
+        self.games : int = 0
+        self.moves : Counter = Counter()            # Logic value -> # of moves made
+        self.blunders : Counter = Counter()         # Logic value -> # of blunders made
+        self.games_with_blunder : Counter = Counter() # Logic value -> # of games in which it blundered at least once
+        self.cache_hits : int = 0
+        self.cache_misses : int = 0
+        self.skipped : Counter = Counter()          # Reason -> # of games not analyzed (unsupported geometry, invalid record)
+
+
+    def add_game(self, annotations : Iterable[PyTacToeMoveAnnotation]) -> None:
+        """Counts the moves and blunders of one annotated game."""
+        self.games += 1
+        blundered : set[int] = set()
+        for annotation in annotations:
+            self.moves[annotation.logic] += 1
+            if annotation.blunder:
+                self.blunders[annotation.logic] += 1
+                blundered.add(annotation.logic)
+        self.games_with_blunder.update(blundered)
+
+
+    def merge(self, other : "PyTacToeAnalysisSummary") -> None:
+        """Adds the counts of another (partial) summary into this one."""
+        self.games += other.games
+        self.moves.update(other.moves)
+        self.blunders.update(other.blunders)
+        self.games_with_blunder.update(other.games_with_blunder)
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.skipped.update(other.skipped)
+
+
+    def to_dict(self) -> dict:
+        """Returns the summary as a JSON serializable dict, w/the blunder rate (blunders per move) of every logic."""
+        return {
+            "games": self.games, "cache_hits": self.cache_hits, "cache_misses": self.cache_misses, "skipped": dict(self.skipped),
+            "by_logic": {logic_name(logic): {"moves": moves, "blunders": self.blunders[logic], "blunder_rate": self.blunders[logic] / moves,
+                                             "games_with_blunder": self.games_with_blunder[logic]}
+                         for logic, moves in sorted(self.moves.items())},
+        }
+
+
+_evaluators : dict[tuple[int, int, int], PyTacToePositionEvaluator] = {} # Per-process evaluators (one per geometry), their caches persist across chunks
+
+
+def get_evaluator(rows : int, cols : int, win_length : int) -> PyTacToePositionEvaluator:
+    """Returns this process's evaluator for the geometry, creating it on first use."""
+    evaluator = _evaluators.get((rows, cols, win_length))
+    if evaluator is None: evaluator = _evaluators[(rows, cols, win_length)] = PyTacToePositionEvaluator(rows=rows, cols=cols, win_length=win_length)
+    return evaluator
+
+
+def analyze_records(records : Iterable[PyTacToeGameRecord], annotate_moves : bool = False) -> tuple[PyTacToeAnalysisSummary, list[str]]:
+    """Worker entry point: analyzes games and returns (summary, one JSON line per move if annotate_moves else [])."""
+    summary = PyTacToeAnalysisSummary()
+    lines : list[str] = []
+    for record in records:
+        if record.rows * record.cols > MAX_EXHAUSTIVE_CELLS:
+            summary.skipped[f"{record.rows}x{record.cols} board, {record.win_length} in a row (too large to evaluate)"] += 1
+            continue
+        try:
+            evaluator = get_evaluator(rows=record.rows, cols=record.cols, win_length=record.win_length)
+            hits, misses = evaluator.hits, evaluator.misses
+            annotations = list(annotate_game(record=record, evaluator=evaluator))
+        except ValueError: # Invalid geometry or illegal move, e.g. a corrupted record
+            summary.skipped["invalid record"] += 1
+            continue
+        summary.cache_hits += evaluator.hits - hits
+        summary.cache_misses += evaluator.misses - misses
+        summary.add_game(annotations)
+        if annotate_moves:
+            lines.extend(json.dumps({"game": summary.games - 1, **annotation.to_dict()}) for annotation in annotations)
+    return summary, lines
+
+
+def analyze_chunk(job : tuple) -> tuple[PyTacToeAnalysisSummary, list[str]]:
+    """Pool entry point, job = (list of records, annotate moves)."""
+    records, annotate_moves = job
+    return analyze_records(records=records, annotate_moves=annotate_moves)
+
+
+def chunked(records : Iterable[PyTacToeGameRecord], size : int) -> Iterator[list[PyTacToeGameRecord]]:
+    """Groups a record stream into lists of up to size records."""
+    chunk : list[PyTacToeGameRecord] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+
+def run_analysis(path : str, workers : int | None = None, chunk_games : int = DEFAULT_CHUNK_GAMES, annotate_moves : bool = False,
+                 move_output = None) -> PyTacToeAnalysisSummary:
+    """Analyzes every game in the log over a process pool (workers=1 runs in-process) and returns the aggregated summary.
+    If annotate_moves, one JSON line per move is written to move_output (the game index in each line restarts at every chunk).
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = PyTacToeAnalysisSummary()
+    records = read_game_log(path=path)
+
+    if workers == 1:
+        partials : Iterable[tuple[PyTacToeAnalysisSummary, list[str]]] = (analyze_records(records=chunk, annotate_moves=annotate_moves)
+                                                                           for chunk in chunked(records, size=chunk_games))
+        for partial, lines in partials:
+            summary.merge(partial)
+            if move_output is not None: move_output.writelines(line + "\n" for line in lines)
+        return summary
+
+    with Pool(processes=workers) as pool:
+        jobs = ((chunk, annotate_moves) for chunk in chunked(records, size=chunk_games))
+        for partial, lines in pool.imap(analyze_chunk, jobs): # imap keeps the move annotations in log order
+            summary.merge(partial)
+            if move_output is not None: move_output.writelines(line + "\n" for line in lines)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Annotate every move of a Py-Tac-Toe game log w/the engine evaluation and report blunder rates.")
+    parser.add_argument("path", nargs="?", default=DEFAULT_GAME_LOG_PATH, help="Binary game log (see game_log.py)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: # of CPU cores)")
+    parser.add_argument("--chunk-games", type=int, default=DEFAULT_CHUNK_GAMES, help="Games per chunk handed to a worker")
+    parser.add_argument("--moves", dest="moves_path", default=None, help="Write one JSON line per annotated move to this file ('-' for stdout)")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    move_output = None
+    if args.moves_path: move_output = sys.stdout if args.moves_path == "-" else open(args.moves_path, "w")
+    try:
+        summary = run_analysis(path=args.path, workers=args.workers, chunk_games=args.chunk_games, annotate_moves=move_output is not None,
+                               move_output=move_output)
+    finally:
+        if move_output not in (None, sys.stdout): move_output.close()
+    elapsed = time.perf_counter() - start
+
+    result = summary.to_dict()
+    print(f"{summary.games} games analyzed in {elapsed:.2f}s (evaluation cache: {summary.cache_hits} hits, {summary.cache_misses} misses)")
+    for reason, count in summary.skipped.most_common(): print(f"  skipped {count} games: {reason}")
+    for name, counts in result["by_logic"].items():
+        print(f"  {name:<24} {counts['moves']:>10} moves  {counts['blunders']:>8} blunders  blunder rate {counts['blunder_rate'] * 100:6.2f}%  "
+              f"({counts['games_with_blunder']} games w/a blunder)")
+    by_logic = result["by_logic"]
+    if "HEURISTIC" in by_logic and "HEURISTIC_DIFFICULT" in by_logic:
+        print(f"  HEURISTIC vs HEURISTIC_DIFFICULT blunder rate: {by_logic['HEURISTIC']['blunder_rate'] * 100:.2f}% vs "
+              f"{by_logic['HEURISTIC_DIFFICULT']['blunder_rate'] * 100:.2f}%")
+
+    if args.json_path:
+        with open(args.json_path, "w") as file: json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
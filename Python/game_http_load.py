@@ -0,0 +1,122 @@
+"""
+This .py file is a local load test for game_http_server.py.
+
+It generates --positions random positions (random legal games stopped at a random move, never finished) and sends them from --clients
+threads, each over its own keep-alive connection, either one /move request per position or --batch positions per /batch request.
+It reports the p50/p99 request latency, requests/s and positions/s, and the server's cache hit rate afterwards.
+With --spawn-server an in-process server is started on a free port, otherwise --host/--port must point at a running server.
+
+Examples:
+    python game_http_load.py --spawn-server --clients 8 --positions 20000 --difficulty 3
+    python game_http_load.py --spawn-server --clients 4 --positions 200000 --batch 5000 --difficulty 2
+"""
+
+import argparse
+import http.client
+import json
+import random
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from game_http_server import DEFAULT_HOST, DEFAULT_PORT, PyTacToeHTTPServer
+from game_logic import PyTacToeGame
+from game_server_load import percentile
+
+
+def random_positions(count : int, rows : int, cols : int, win_length : int, seed : int) -> list[dict]:
+    """Returns count positions reached by random play that are not over yet, as /move request bodies (w/o difficulty)."""
+    rng = random.Random(seed)
+    game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+    positions : list[dict] = []
+    while len(positions) < count:
+        game.reset_game()
+        game.current_player = 'X'
+        for _ in range(rng.randrange(game.cell_count)):
+            game.make_move(rng.choice(game.get_empty_positions()))
+            if game.check_winner(): break
+            game.switch_player()
+        else:
+            positions.append({"board": "".join(game.board), "player": game.current_player, "rows": rows, "cols": cols, "win_length": win_length})
+    return positions
+
+
+def post(connection : http.client.HTTPConnection, path : str, body : dict) -> dict:
+    """Sends one POST request on the keep-alive connection and returns the decoded response, raises RuntimeError on an HTTP error."""
+    connection.request("POST", path, body=json.dumps(body), headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    if response.status != 200: raise RuntimeError(f"HTTP {response.status}: {data.get('error')}")
+    return data
+
+
+def run_client(host : str, port : int, requests : list[tuple[str, dict]], latencies : list[float]) -> int:
+    """Sends the requests in order on one connection, appending each latency (seconds). Returns the # of positions answered."""
+    connection = http.client.HTTPConnection(host, port)
+    connection.connect()
+    connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Headers and body go out in separate writes
+    answered = 0
+    try:
+        for path, body in requests:
+            start = time.perf_counter()
+            response = post(connection=connection, path=path, body=body)
+            latencies.append(time.perf_counter() - start)
+            answered += len(response["moves"]) - len(response["errors"]) if path == "/batch" else 1
+    finally:
+        connection.close()
+    return answered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for the Py-Tac-Toe HTTP move service.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spawn-server", action="store_true", help="Start an in-process server on a free port instead")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent connections (one thread each)")
+    parser.add_argument("--positions", type=int, default=10000, help="# of positions to request")
+    parser.add_argument("--batch", type=int, default=0, help="Positions per /batch request (0 -> one /move request per position)")
+    parser.add_argument("--difficulty", type=int, default=1, help="0 Easy, 1 Medium, 2 Hard, 3 Impossible, 4 Timed search, 5 MCTS")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    host, port, server = args.host, args.port, None
+    if args.spawn_server:
+        server = PyTacToeHTTPServer(("127.0.0.1", 0))
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    positions = random_positions(count=args.positions, rows=args.rows, cols=args.cols, win_length=args.win_length, seed=args.seed)
+    if args.batch:
+        requests = [("/batch", {"difficulty": args.difficulty, "positions": positions[i:i + args.batch]}) for i in range(0, len(positions), args.batch)]
+    else:
+        requests = [("/move", {**position, "difficulty": args.difficulty}) for position in positions]
+
+    latencies : list[float] = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        answered = sum(pool.map(lambda client: run_client(host=host, port=port, requests=requests[client::args.clients], latencies=latencies),
+                                range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    connection = http.client.HTTPConnection(host, port)
+    connection.request("GET", "/health")
+    cache = json.loads(connection.getresponse().read())["cache"]
+    connection.close()
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{args.clients} clients, {len(requests)} requests, {answered} positions in {elapsed:.2f}s")
+    print(f"  request latency p50: {percentile(latencies, 0.50) * 1e3:.2f} ms  p99: {percentile(latencies, 0.99) * 1e3:.2f} ms  "
+          f"mean: {statistics.fmean(latencies) * 1e3 if latencies else 0.0:.2f} ms")
+    print(f"  {len(requests) / elapsed:.0f} requests/s, {answered / elapsed:.0f} positions/s")
+    lookups = cache["hits"] + cache["misses"]
+    print(f"  cache: {cache['entries']} entries, hit rate {cache['hits'] / lookups * 100 if lookups else 0.0:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
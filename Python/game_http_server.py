@@ -0,0 +1,283 @@
+"""
+This .py file defines the PyTacToeMoveService class and a threaded, stdlib-only HTTP server exposing it (no tkinter):
+given a board, the side to move and a difficulty, it returns the move PyTacToeGame.select_computer_move() picks for that computer logic.
+
+Endpoints (JSON request and response bodies):
+    POST /move      {"board": "X   O    ", "player": "X", "difficulty": 3, "rows": 3, "cols": 3, "win_length": 3}  -> {"move": 8}
+    POST /batch     {"difficulty": 3, "positions": [{"board": "X   O    ", "player": "X"}, ...]}               -> {"moves": [8, ...], "errors": {}}
+    GET  /health    -> {"ok": true, "cache": {...}}
+The board is a string (or list) of cell_count marks, 'X', 'O' and ' ', '.', '-' or '_' for an empty cell. Only board is required,
+player defaults to the side to move by mark counts and the other fields default as above. Every field of a /batch position may also be
+given once at the top level for the whole batch, errors are reported per position index (its move is null). A position repeated within a batch
+is answered once.
+
+Answers of the deterministic logics (HEURISTIC, HEURISTIC_DIFFICULT, MINIMAX_WIN_IMPOSSIBLE) are kept in an LRU cache keyed on the exact
+position. These logics break ties by cell order, which isn't preserved by the board symmetries, so symmetric positions don't share an entry
+(the minimax engine's own transposition table is still symmetry-aware, a miss on a mirrored position is cheap). Every answer is the move
+select_computer_move() picks on the position as given. RANDOM, ITERATIVE_DEEPENING and MCTS are never cached (nor deduplicated in a batch).
+MINIMAX_WIN_IMPOSSIBLE searches to the end of the game, so it is only accepted on boards of up to MAX_EXHAUSTIVE_CELLS cells (use difficulty 4 or 5
+on larger ones). The search engines are shared per process and geometry, searches on one geometry are serialized by that geometry's lock.
+
+Run: python game_http_server.py --port 8080       (see game_http_load.py for the load-test client)
+"""
+
+import argparse
+import json
+import random
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from game_logic import MAX_EXHAUSTIVE_CELLS, PyTacToeBoardGeometry, PyTacToeGame, PyTacToeGameComputerLogic
+
+DEFAULT_HOST : str = "127.0.0.1"
+DEFAULT_PORT : int = 8080
+DEFAULT_CACHE_SIZE : int = 1 << 16
+MAX_BODY_BYTES : int = 16 << 20     # Large enough for batches of ~100k 3x3 positions
+MAX_CELLS : int = 400               # Largest board accepted (20x20)
+EMPTY_MARKS : frozenset[str] = frozenset(" .-_")
+
+CACHEABLE_LOGICS : frozenset[PyTacToeGameComputerLogic] = frozenset((PyTacToeGameComputerLogic.HEURISTIC, PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT,
+                                                                    PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE))
+SEARCH_LOGICS : frozenset[PyTacToeGameComputerLogic] = frozenset((PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE, PyTacToeGameComputerLogic.ITERATIVE_DEEPENING,
+                                                                 PyTacToeGameComputerLogic.MCTS)) # Use the engines shared by every thread
+
+
+class PyTacToeRequestError(Exception):
+    """Raised for invalid requests/positions, reported to the client as {"error": ...} (HTTP 400 for a whole request)."""
+
+
+class PyTacToeResponseCache:
+
+    def __init__(self, max_entries : int = DEFAULT_CACHE_SIZE):
+        self.max_entries : int = max_entries
+        self.entries : OrderedDict[tuple, int] = OrderedDict() # (rows, cols, win length, logic value, x to move, x bits, o bits) -> move
+        self.lock = threading.Lock()
+        self.hits : int = 0
+        self.misses : int = 0
+
+
+    def lookup(self, key : tuple) -> int | None:
+        """Returns the move stored for key (marking it as most recently used), or None if there isn't one."""
+        with self.lock:
+            move = self.entries.get(key)
+            if move is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return move
+
+
+    def stats(self) -> dict:
+        """Returns the entry count and hit/miss counters."""
+        with self.lock:
+            return {"entries": len(self.entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+    def store(self, key : tuple, move : int) -> None:
+        """Stores move for key, evicting the least recently used entry once the cache is full."""
+        with self.lock:
+            self.entries[key] = move
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries: self.entries.popitem(last=False)
+
+
+class PyTacToeMoveService:
+
+    def __init__(self, cache_size : int = DEFAULT_CACHE_SIZE):
+        self.cache = PyTacToeResponseCache(max_entries=cache_size)
+        self.search_locks : dict[tuple[int, int, int], threading.Lock] = {} # Per geometry, the minimax/MCTS engines are shared per geometry and keep per-search state
+        self.search_locks_lock = threading.Lock()
+        self.local = threading.local()           # Per-thread PyTacToeGame per geometry (each w/its own RNG for RANDOM)
+
+
+    def get_game(self, rows : int, cols : int, win_length : int) -> PyTacToeGame:
+        """Returns this thread's game for the geometry, raises PyTacToeRequestError for an invalid geometry."""
+        games : dict[tuple[int, int, int], PyTacToeGame] | None = getattr(self.local, "games", None)
+        if games is None: games = self.local.games = {}
+        game = games.get((rows, cols, win_length))
+        if game is None:
+            if rows * cols > MAX_CELLS: raise PyTacToeRequestError(f"Board too large: {rows}x{cols} (max {MAX_CELLS} cells)")
+            try:
+                PyTacToeBoardGeometry.get(rows=rows, cols=cols, win_length=win_length)
+            except ValueError as error:
+                raise PyTacToeRequestError(str(error))
+            game = games[(rows, cols, win_length)] = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+            game.rng = random.Random()
+        return game
+
+
+    def best_move(self, request : dict) -> int:
+        """Returns the computer move for one position request (see the module docstring), raises PyTacToeRequestError if it's invalid."""
+        game, logic, x_bits, o_bits, player = self.parse_position(request=request)
+        return self.move_for(game=game, logic=logic, x_bits=x_bits, o_bits=o_bits, player=player)
+
+
+    def parse_position(self, request : dict) -> tuple[PyTacToeGame, PyTacToeGameComputerLogic, int, int, str]:
+        """Validates one position request, returns (this thread's game for its geometry, logic, x bits, o bits, player to move).
+        Raises PyTacToeRequestError if it's invalid.
+        """
+        try:
+            rows, cols, win_length = int(request.get("rows", 3)), int(request.get("cols", 3)), int(request.get("win_length", 3))
+            logic = PyTacToeGameComputerLogic(int(request.get("difficulty", PyTacToeGameComputerLogic.HEURISTIC.value)))
+        except (TypeError, ValueError) as error:
+            raise PyTacToeRequestError(f"Invalid field: {error}")
+        game = self.get_game(rows=rows, cols=cols, win_length=win_length)
+
+        board = request.get("board")
+        if not isinstance(board, (str, list)) or len(board) != game.cell_count:
+            raise PyTacToeRequestError(f"board must be a string or list of {game.cell_count} marks")
+        x_bits = o_bits = 0
+        for cell, mark in enumerate(board):
+            if mark == 'X': x_bits |= 1 << cell
+            elif mark == 'O': o_bits |= 1 << cell
+            elif not isinstance(mark, str) or mark not in EMPTY_MARKS: raise PyTacToeRequestError(f"Invalid mark {mark!r} in cell {cell}")
+        player = request.get("player") or ('X' if x_bits.bit_count() == o_bits.bit_count() else 'O')
+        if player not in ('X', 'O'): raise PyTacToeRequestError(f"Invalid player: {player}")
+        if game.has_line(x_bits) or game.has_line(o_bits) or (x_bits | o_bits) == game.full_mask: raise PyTacToeRequestError("Game is over")
+        if logic == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE and game.cell_count > MAX_EXHAUSTIVE_CELLS:
+            raise PyTacToeRequestError(f"Difficulty {logic.value} searches to the end of the game, it is limited to boards of up to {MAX_EXHAUSTIVE_CELLS} cells "
+                                       f"(use difficulty {PyTacToeGameComputerLogic.ITERATIVE_DEEPENING.value} or {PyTacToeGameComputerLogic.MCTS.value})")
+        return game, logic, x_bits, o_bits, player
+
+
+    def move_for(self, game : PyTacToeGame, logic : PyTacToeGameComputerLogic, x_bits : int, o_bits : int, player : str) -> int:
+        """Returns the move for a validated position, from the response cache for the deterministic logics."""
+        if logic not in CACHEABLE_LOGICS: return self.compute_move(game=game, x_bits=x_bits, o_bits=o_bits, player=player, logic=logic)
+        cache_key = (game.rows, game.cols, game.win_length, logic.value, player == 'X', x_bits, o_bits)
+        move = self.cache.lookup(cache_key)
+        if move is None:
+            move = self.compute_move(game=game, x_bits=x_bits, o_bits=o_bits, player=player, logic=logic)
+            self.cache.store(cache_key, move)
+        return move
+
+
+    def best_moves(self, request : dict) -> tuple[list[int | None], dict[str, str]]:
+        """Answers every position of a /batch request in one pass, returns (moves w/None for invalid positions, {index: error}).
+        Repeats of a position already answered in the batch (for the deterministic logics) reuse its move, w/o another cache lookup or search.
+        """
+        positions = request.get("positions")
+        if not isinstance(positions, list): raise PyTacToeRequestError("positions must be a list")
+        defaults = {key: value for key, value in request.items() if key != "positions"}
+        moves : list[int | None] = []
+        errors : dict[str, str] = {}
+        answered : dict[tuple, int] = {} # (geometry, logic value, player, x bits, o bits) -> move, for the positions of this batch
+        for index, position in enumerate(positions):
+            try:
+                if not isinstance(position, dict): raise PyTacToeRequestError("Position must be a JSON object")
+                game, logic, x_bits, o_bits, player = self.parse_position(request={**defaults, **position})
+                if logic not in CACHEABLE_LOGICS:
+                    moves.append(self.move_for(game=game, logic=logic, x_bits=x_bits, o_bits=o_bits, player=player))
+                    continue
+                key = (game.rows, game.cols, game.win_length, logic.value, player, x_bits, o_bits)
+                move = answered.get(key)
+                if move is None: move = answered[key] = self.move_for(game=game, logic=logic, x_bits=x_bits, o_bits=o_bits, player=player)
+                moves.append(move)
+            except PyTacToeRequestError as error:
+                moves.append(None)
+                errors[str(index)] = str(error)
+        return moves, errors
+
+
+    def compute_move(self, game : PyTacToeGame, x_bits : int, o_bits : int, player : str, logic : PyTacToeGameComputerLogic) -> int:
+        """Runs select_computer_move() for the position on this thread's game."""
+        game.x_bits, game.o_bits, game.last_move, game.current_player = x_bits, o_bits, -1, player
+        game.computer_logic_enum = logic
+        if logic in SEARCH_LOGICS:
+            with self.get_search_lock(game=game): return game.select_computer_move()
+        return game.select_computer_move()
+
+
+    def get_search_lock(self, game : PyTacToeGame) -> threading.Lock:
+        """Returns the lock serializing the searches on the game's geometry (whose engines every thread shares), created on first use."""
+        geometry = (game.rows, game.cols, game.win_length)
+        lock = self.search_locks.get(geometry)
+        if lock is None:
+            with self.search_locks_lock: lock = self.search_locks.setdefault(geometry, threading.Lock())
+        return lock
+
+
+class PyTacToeHTTPRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1" # Keep-alive, clients can send many requests per connection
+    disable_nagle_algorithm = True # Headers and body are written separately, don't let Nagle hold the body back w/keep-alive
+    server : "PyTacToeHTTPServer"
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] == "/health": self.send_json(status=200, body={"ok": True, "cache": self.server.service.cache.stats()})
+        else: self.send_json(status=404, body={"error": f"Unknown path: {self.path}"})
+
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_json(status=413, body={"error": f"Body must be at most {MAX_BODY_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+
+        path = self.path.split("?", 1)[0]
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict): raise PyTacToeRequestError("Request must be a JSON object.")
+            if path == "/move":
+                response : dict = {"move": self.server.service.best_move(request=request)}
+            elif path == "/batch":
+                moves, errors = self.server.service.best_moves(request=request)
+                response = {"moves": moves, "errors": errors}
+            else:
+                self.send_json(status=404, body={"error": f"Unknown path: {self.path}"})
+                return
+        except (PyTacToeRequestError, ValueError, TypeError) as error: # json.JSONDecodeError is a ValueError
+            self.send_json(status=400, body={"error": str(error)})
+            return
+        self.send_json(status=200, body=response)
+
+
+    def log_message(self, format : str, *args) -> None:
+        if self.server.verbose: super().log_message(format, *args)
+
+
+    def send_json(self, status : int, body : dict) -> None:
+        """Writes a JSON response w/a Content-Length, so the connection can be kept alive."""
+        data = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class PyTacToeHTTPServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address : tuple[str, int], service : PyTacToeMoveService | None = None, verbose : bool = False):
+        super().__init__(address, PyTacToeHTTPRequestHandler)
+        self.service : PyTacToeMoveService = service or PyTacToeMoveService()
+        self.verbose : bool = verbose
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Threaded HTTP service returning Py-Tac-Toe computer moves (JSON).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Max # of cached positions")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = PyTacToeHTTPServer((args.host, args.port), service=PyTacToeMoveService(cache_size=args.cache_size), verbose=args.verbose)
+    print(f"Py-Tac-Toe HTTP move service listening on {args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
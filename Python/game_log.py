@@ -0,0 +1,264 @@
+"""
+This .py file defines the append-only binary game log: PyTacToeGameLogWriter (buffered, batched appends), read_game_log() (a generator
+that streams records in constant memory) and the PyTacToeGameRecord class they exchange.
+
+The file starts w/a 5 byte header (magic b"PTTL", version), followed by one variable-length record per finished game (little-endian):
+    flags           1 byte      bits 0-1 outcome (0 draw, 1 X won, 2 O won, 3 unfinished), bits 2-3 mode (0 2-Player, 1 vs-computer, 2 self-play),
+                                bit 4 set if the geometry bytes follow, bit 5 set if 'O' moved first (2-Player games can start w/either side)
+    logic           1 byte      low nibble: computer logic playing 'X', high nibble: 'O' (15 for a human player)
+    geometry        3 bytes     rows, cols, win length (only for boards other than 3x3, 3 in a row)
+    timestamp       4 bytes     seconds since the epoch
+    move count      varint
+    moves           packed      each cell index in (cell count - 1).bit_length() bits (4 bits on 3x3), first move in the lowest bits
+A 3x3 game takes 10-12 bytes. Records are only ever appended, a record cut short by a crash at the end of the file is skipped by the reader
+and truncated away by the next writer before it appends (otherwise the records after it would be misparsed).
+
+Run this file directly to summarize or dump a log:
+    python game_log.py summary games.log
+    python game_log.py dump games.log --limit 10
+"""
+
+import argparse
+import atexit
+import json
+import os
+import struct
+import time
+from collections import Counter
+from typing import Iterator
+
+DEFAULT_GAME_LOG_PATH : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "py_tac_toe_games.log")
+DEFAULT_BUFFER_RECORDS : int = 256 # Records buffered in memory before they are written out in one batch
+READ_CHUNK_SIZE : int = 1 << 16
+
+MAGIC : bytes = b"PTTL"
+VERSION : int = 1
+HEADER_SIZE : int = len(MAGIC) + 1
+
+OUTCOME_DRAW : int = 0
+OUTCOME_X : int = 1
+OUTCOME_O : int = 2
+OUTCOME_UNFINISHED : int = 3
+OUTCOME_TO_WINNER : dict[int, str | None] = {OUTCOME_DRAW: None, OUTCOME_X: 'X', OUTCOME_O: 'O', OUTCOME_UNFINISHED: None}
+OUTCOME_NAMES : tuple[str, ...] = ('draw', 'X', 'O', 'unfinished')
+
+MODES : tuple[str, ...] = ('2-Player', 'vs-computer', 'self-play')
+HUMAN : int = 15 # Logic nibble of a human player
+FLAG_GEOMETRY : int = 0x10
+FLAG_O_FIRST : int = 0x20
+TIMESTAMP_FORMAT : struct.Struct = struct.Struct("<I")
+
+
+class PyTacToeGameRecord:
+
+    __slots__ = ("moves", "outcome", "mode", "x_logic", "o_logic", "timestamp", "rows", "cols", "win_length", "first_player")
+
+    def __init__(self, moves : list[int], outcome : int, mode : str, x_logic : int = HUMAN, o_logic : int = HUMAN, timestamp : int | None = None,
+                 rows : int = 3, cols : int = 3, win_length : int = 3, first_player : str = 'X'):
+        self.moves : list[int] = moves         # Cells in the order they were played, first_player first
+        self.outcome : int = outcome           # OUTCOME_DRAW, OUTCOME_X, OUTCOME_O or OUTCOME_UNFINISHED
+        self.mode : str = mode                 # One of MODES
+        self.x_logic : int = x_logic           # PyTacToeGameComputerLogic value playing each side, HUMAN for a person
+        self.o_logic : int = o_logic
+        self.timestamp : int = int(time.time()) if timestamp is None else timestamp
+        self.rows : int = rows
+        self.cols : int = cols
+        self.win_length : int = win_length
+        self.first_player : str = first_player # 'X' or 'O'
+
+
+    @property
+    def winner(self) -> str | None:
+        """'X', 'O' or None (draw or unfinished)."""
+        return OUTCOME_TO_WINNER[self.outcome]
+
+
+    def encode(self) -> bytes:
+        """Returns the record in its binary log format."""
+        custom_geometry = (self.rows, self.cols, self.win_length) != (3, 3, 3)
+        flags = self.outcome | MODES.index(self.mode) << 2 | (FLAG_GEOMETRY if custom_geometry else 0) | (FLAG_O_FIRST if self.first_player == 'O' else 0)
+        out = bytearray((flags, self.x_logic | self.o_logic << 4))
+        if custom_geometry: out += bytes((self.rows, self.cols, self.win_length))
+        out += TIMESTAMP_FORMAT.pack(self.timestamp)
+
+        count = len(self.moves)
+        while True: # LEB128 varint
+            byte = count & 0x7F
+            count >>= 7
+            out.append(byte | 0x80 if count else byte)
+            if not count: break
+
+        bits_per_move = max(1, (self.rows * self.cols - 1).bit_length())
+        packed = 0
+        for i, move in enumerate(self.moves): packed |= move << (i * bits_per_move)
+        out += packed.to_bytes((len(self.moves) * bits_per_move + 7) // 8, "little")
+        return bytes(out)
+
+
+    def to_dict(self) -> dict:
+        """Returns the record as a JSON serializable dict."""
+        return {
+            "moves": self.moves, "winner": self.winner, "outcome": self.outcome, "mode": self.mode, "x_logic": self.x_logic,
+            "o_logic": self.o_logic, "timestamp": self.timestamp, "rows": self.rows, "cols": self.cols, "win_length": self.win_length,
+            "first_player": self.first_player,
+        }
+
+
+def decode_record(data : bytes | memoryview, offset : int) -> tuple[PyTacToeGameRecord, int]:
+    """Decodes the record starting at data[offset], returns (record, offset of the next record).
+    Raises IndexError if data ends before the record does.
+    """
+    flags, logic = data[offset], data[offset + 1]
+    offset += 2
+    rows, cols, win_length = 3, 3, 3
+    if flags & FLAG_GEOMETRY:
+        rows, cols, win_length = data[offset], data[offset + 1], data[offset + 2]
+        offset += 3
+    if offset + TIMESTAMP_FORMAT.size > len(data): raise IndexError("Truncated record")
+    (timestamp,) = TIMESTAMP_FORMAT.unpack_from(data, offset)
+    offset += TIMESTAMP_FORMAT.size
+
+    count = 0
+    shift = 0
+    while True: # LEB128 varint
+        byte = data[offset]
+        offset += 1
+        count |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80: break
+
+    bits_per_move = max(1, (rows * cols - 1).bit_length())
+    size = (count * bits_per_move + 7) // 8
+    if offset + size > len(data): raise IndexError("Truncated record")
+    packed = int.from_bytes(data[offset:offset + size], "little")
+    move_mask = (1 << bits_per_move) - 1
+    moves = [packed >> (i * bits_per_move) & move_mask for i in range(count)]
+    record = PyTacToeGameRecord(moves=moves, outcome=flags & 0x3, mode=MODES[flags >> 2 & 0x3], x_logic=logic & 0xF, o_logic=logic >> 4,
+                                timestamp=timestamp, rows=rows, cols=cols, win_length=win_length, first_player='O' if flags & FLAG_O_FIRST else 'X')
+    return record, offset + size
+
+
+class PyTacToeGameLogWriter:
+
+    def __init__(self, path : str = DEFAULT_GAME_LOG_PATH, buffer_records : int = DEFAULT_BUFFER_RECORDS):
+        self.path : str = path
+        self.buffer_records : int = buffer_records
+        self.buffer = bytearray()
+        self.buffered : int = 0             # Records in self.buffer
+        self.records_written : int = 0      # Records appended through this writer (including the buffered ones)
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            valid_size = HEADER_SIZE
+            for _, valid_size in scan_game_log(path=path): pass
+            if valid_size != os.path.getsize(path): # A record cut short by an interrupted write
+                with open(path, "rb+") as file: file.truncate(valid_size)
+        elif os.path.exists(path):
+            with open(path, "rb+") as file: file.truncate(0) # Interrupted before the header was complete
+        self.file = open(path, "ab")
+        if self.file.tell() == 0: self.file.write(MAGIC + bytes((VERSION,)))
+        atexit.register(self.close) # Buffered records must not be lost when the app exits
+
+
+    def __enter__(self) -> "PyTacToeGameLogWriter":
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    def append(self, record : PyTacToeGameRecord) -> None:
+        """Buffers one record, the buffer is written out once it holds buffer_records records."""
+        self.buffer += record.encode()
+        self.buffered += 1
+        self.records_written += 1
+        if self.buffered >= self.buffer_records: self.flush()
+
+
+    def append_encoded(self, data : bytes, count : int) -> None:
+        """Buffers count records already in the binary log format (e.g. encoded by worker processes)."""
+        self.buffer += data
+        self.buffered += count
+        self.records_written += count
+        if self.buffered >= self.buffer_records: self.flush()
+
+
+    def close(self) -> None:
+        """Flushes the buffered records and closes the file, safe to call more than once."""
+        if self.file.closed: return
+        self.flush()
+        self.file.close()
+        atexit.unregister(self.close)
+
+
+    def flush(self) -> None:
+        """Writes the buffered records to the file in one batch."""
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+            self.buffered = 0
+        self.file.flush()
+
+
+def read_game_log(path : str = DEFAULT_GAME_LOG_PATH, chunk_size : int = READ_CHUNK_SIZE) -> Iterator[PyTacToeGameRecord]:
+    """Yields the records of a game log in order, reading it in chunks so memory use doesn't grow w/the file size.
+    A truncated record at the end of the file (interrupted write) is skipped.
+    """
+    for record, _ in scan_game_log(path=path, chunk_size=chunk_size): yield record
+
+
+def scan_game_log(path : str, chunk_size : int = READ_CHUNK_SIZE) -> Iterator[tuple[PyTacToeGameRecord, int]]:
+    """Yields (record, file offset just past it) for every complete record of a game log, in order.
+    Raises ValueError if the file doesn't start w/a game log header.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC or header[len(MAGIC)] != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Py-Tac-Toe game log.")
+
+        data = b""
+        offset = 0
+        data_start = HEADER_SIZE # File offset of data[0]
+        while True:
+            chunk = file.read(chunk_size)
+            if data:
+                data_start += offset
+                data = data[offset:] + chunk
+            else:
+                data_start = file.tell() - len(chunk)
+                data = chunk
+            offset = 0
+            while offset < len(data):
+                try:
+                    record, next_offset = decode_record(data=data, offset=offset)
+                except IndexError:
+                    break # Record continues in the next chunk
+                yield record, data_start + next_offset
+                offset = next_offset
+            if not chunk: return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize or dump a Py-Tac-Toe binary game log.")
+    parser.add_argument("command", choices=("summary", "dump"))
+    parser.add_argument("path", nargs="?", default=DEFAULT_GAME_LOG_PATH)
+    parser.add_argument("--limit", type=int, default=None, help="dump: stop after this many records")
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        for i, record in enumerate(read_game_log(path=args.path)):
+            if args.limit is not None and i >= args.limit: break
+            print(json.dumps(record.to_dict()))
+        return
+
+    games = 0
+    outcomes : Counter = Counter()
+    for record in read_game_log(path=args.path):
+        games += 1
+        outcomes[(record.mode, record.x_logic, record.o_logic, OUTCOME_NAMES[record.outcome])] += 1
+    print(f"{games} games in {args.path} ({os.path.getsize(args.path)} bytes)")
+    for (mode, x_logic, o_logic, result), count in sorted(outcomes.items(), key=lambda item: -item[1]):
+        print(f"  {mode:<12} X logic {x_logic:>2}  O logic {o_logic:>2}  {result:<10} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,154 +1,614 @@
 """
 This .py file defines the PyTacToeGame class which is used to contain the inner game logic/state.  
 It is not intended to invoke this alone, but rather to create an instantiation of this class within the main GUI .py file.
+
+It also defines PyTacToeInstrumentation (module instance: instrumentation), optional call counts/timings of the engine hot paths.
 """
 
+from collections import deque
 from enum import Enum
+import functools
 import random
+import threading
+import time
+from mcts_engine import PyTacToeMCTSEngine, get_shared_mcts_engine
+from minimax_engine import PyTacToeMinimaxEngine, PyTacToeSearchCancelled, get_shared_minimax_engine
+from solved_table import PyTacToeSolvedTable, load_shared_solved_table
+from tablebase import PyTacToeTablebase, load_shared_tablebase
 
 class PyTacToeGameComputerLogic(Enum):
     RANDOM = 0
     HEURISTIC = 1
     HEURISTIC_DIFFICULT = 2
     MINIMAX_WIN_IMPOSSIBLE = 3
+    ITERATIVE_DEEPENING = 4 # Time-budgeted search w/a heuristic evaluation, for boards too large for MINIMAX_WIN_IMPOSSIBLE
+    MCTS = 5                # Monte Carlo Tree Search w/random playouts, scales w/the time budget and # of worker processes
+
+
+def build_winning_combinations(rows : int, cols : int, win_length : int) -> list[tuple[int, ...]]:
+    """Returns every line of win_length cells on a rows x cols board (cell index = row * cols + col).
+    Lines are ordered horizontals, verticals, then diagonals (down-right) and anti-diagonals (down-left).
+    """
+    combinations : list[tuple[int, ...]] = []
+    directions = ((0, 1), (1, 0), (1, 1), (1, -1)) # (row step, col step)
+    for row_step, col_step in directions:
+        for row in range(rows):
+            for col in range(cols):
+                end_row = row + row_step * (win_length - 1)
+                end_col = col + col_step * (win_length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    combinations.append(tuple((row + row_step * i) * cols + col + col_step * i for i in range(win_length)))
+    return combinations
+
+
+def bits_to_positions(bits : int) -> list[int]:
+    """Returns the indices of the set bits of a bitmask in ascending order."""
+    positions : list[int] = []
+    while bits:
+        low = bits & -bits
+        positions.append(low.bit_length() - 1)
+        bits ^= low
+    return positions
+
+
+def positions_to_bits(positions) -> int:
+    """Returns the bitmask w/the bits of the given cell indices set (inverse of bits_to_positions)."""
+    bits : int = 0
+    for position in positions: bits |= 1 << position
+    return bits
+
+
+class PyTacToeBoardGeometry:
+    """Line tables and heuristic cell groups of one board geometry (rows x cols, win_length in a row).
+    Built once per geometry and shared by every PyTacToeGame using it (see PyTacToeBoardGeometry.get()).
+    """
+    _cache : dict[tuple[int, int, int], "PyTacToeBoardGeometry"] = {}
+
+    def __init__(self, rows : int, cols : int, win_length : int):
+        if rows < 1 or cols < 1 or not 1 <= win_length <= max(rows, cols):
+            raise ValueError(f"Invalid board geometry: {rows}x{cols} with {win_length} in a row.")
+        self.rows : int = rows
+        self.cols : int = cols
+        self.win_length : int = win_length
+        self.cell_count : int = rows * cols
+        self.full_mask : int = (1 << self.cell_count) - 1 # Bitmask with every cell of the board set
+        self.winning_combinations : list[tuple[int, ...]] = build_winning_combinations(rows=rows, cols=cols, win_length=win_length)
+        self.winning_masks : tuple[int, ...] = tuple(sum(1 << i for i in combo) for combo in self.winning_combinations) # Precomputed line masks
+        self.cell_line_masks : tuple[tuple[int, ...], ...] = tuple(tuple(mask for mask in self.winning_masks if mask >> cell & 1) for cell in range(self.cell_count)) # Lines through each cell
+        self.cell_lines : tuple[tuple[int, ...], ...] = tuple(tuple(line for line, mask in enumerate(self.winning_masks) if mask >> cell & 1) for cell in range(self.cell_count)) # Same, as line indices
+        self.position_bytes : int = ((3 ** self.cell_count - 1).bit_length() + 7) // 8 # Size of a base-3 packed position (2 on 3x3)
+
+        # Zobrist keys, one random 64-bit key per (mark, cell). Seeded by the board size, so every process derives the same keys
+        zobrist_rng = random.Random(f"zobrist {rows}x{cols}")
+        self.zobrist_x_keys : tuple[int, ...] = tuple(zobrist_rng.getrandbits(64) for _ in range(self.cell_count))
+        self.zobrist_o_keys : tuple[int, ...] = tuple(zobrist_rng.getrandbits(64) for _ in range(self.cell_count))
+
+        # Cell groups used by the heuristic logic (center, corners, sides), on 3x3 these are 4 / 0, 2, 6, 8 / 1, 3, 5, 7
+        self.center_cells : tuple[int, ...] = self.cells_nearest_center(cells=range(self.cell_count), nearest_only=True)
+        self.corner_cells : tuple[int, ...] = tuple(dict.fromkeys((0, cols - 1, (rows - 1) * cols, self.cell_count - 1)))
+        self.opposite_corners : tuple[tuple[int, int], ...] = tuple((corner, self.cell_count - 1 - corner) for corner in (0, self.cell_count - 1, cols - 1, (rows - 1) * cols)
+                                                                    if corner != self.cell_count - 1 - corner)
+        self.side_cells : tuple[int, ...] = tuple(cell for cell in range(self.cell_count) if cell not in self.corner_cells and cell not in self.center_cells
+                                                  and (cell // cols in (0, rows - 1) or cell % cols in (0, cols - 1)))
+        self.inner_cells : tuple[int, ...] = self.cells_nearest_center(cells=[cell for cell in range(self.cell_count) if cell not in self.center_cells
+                                                                              and cell not in self.corner_cells and cell not in self.side_cells])
+
+
+    @classmethod
+    def get(cls, rows : int, cols : int, win_length : int) -> "PyTacToeBoardGeometry":
+        """Returns the shared geometry for the given board, building it on first use."""
+        geometry = cls._cache.get((rows, cols, win_length))
+        if geometry is None:
+            geometry = cls._cache[(rows, cols, win_length)] = cls(rows=rows, cols=cols, win_length=win_length)
+        return geometry
+
+
+    def zobrist_hash(self, x_bits : int, o_bits : int) -> int:
+        """Returns the Zobrist hash of a position (XOR of the keys of every mark on the board)."""
+        position_hash = 0
+        for cell in bits_to_positions(x_bits): position_hash ^= self.zobrist_x_keys[cell]
+        for cell in bits_to_positions(o_bits): position_hash ^= self.zobrist_o_keys[cell]
+        return position_hash
+
+
+    def cells_nearest_center(self, cells, nearest_only : bool = False) -> tuple[int, ...]:
+        """Returns the given cells sorted by distance to the middle of the board (ties by index), or only the nearest ones if nearest_only."""
+        def distance(cell : int) -> float: return abs(cell // self.cols - (self.rows - 1) / 2) + abs(cell % self.cols - (self.cols - 1) / 2)
+        ordered = sorted(cells, key=lambda cell: (distance(cell), cell))
+        if nearest_only and ordered: ordered = [cell for cell in ordered if distance(cell) == distance(ordered[0])]
+        return tuple(ordered)
+
+
+def geometry_attribute(name : str) -> property:
+    """Returns a read-only property forwarding to the game's shared PyTacToeBoardGeometry, so the tables cost nothing per game."""
+    return property(lambda self: getattr(self.geometry, name), doc=f"Shared '{name}' of the board geometry.")
+
+
+class PyTacToeLineIndex:
+    """Per-line counts of 'X' and 'O' marks for one position, updated move by move instead of rescanning the board.
+    A line holding win_length - 1 marks of one player and none of the other is a threat: its one empty cell wins for that player,
+    so the winning/blocking cells are read straight off the threat sets (a handful of lines) on any board size / k-in-a-row.
+    """
+
+    __slots__ = ("geometry", "x_bits", "o_bits", "x_counts", "o_counts", "x_threats", "o_threats")
+
+    def __init__(self, geometry : PyTacToeBoardGeometry, x_bits : int = 0, o_bits : int = 0):
+        self.geometry : PyTacToeBoardGeometry = geometry
+        self.rebuild(x_bits=x_bits, o_bits=o_bits)
+
+
+    def unplay(self, cell : int, is_x : bool) -> None:
+        """Reverts play(cell, is_x), only the lines through the cell change."""
+        if is_x: own_counts, other_counts, own_threats, other_threats = self.x_counts, self.o_counts, self.x_threats, self.o_threats
+        else: own_counts, other_counts, own_threats, other_threats = self.o_counts, self.x_counts, self.o_threats, self.x_threats
+        threat_count = self.geometry.win_length - 1
+        for line in self.geometry.cell_lines[cell]:
+            own_counts[line] -= 1
+            if own_counts[line] == threat_count and not other_counts[line]: own_threats.add(line)
+            else: own_threats.discard(line)
+            if other_counts[line] == threat_count and not own_counts[line]: other_threats.add(line) # Unblocked again
+        if is_x: self.x_bits &= ~(1 << cell)
+        else: self.o_bits &= ~(1 << cell)
+
+
+    def play(self, cell : int, is_x : bool) -> None:
+        """Updates the counts for a mark placed in the (empty) cell, only the lines through it change."""
+        if is_x: own_counts, other_counts, own_threats, other_threats = self.x_counts, self.o_counts, self.x_threats, self.o_threats
+        else: own_counts, other_counts, own_threats, other_threats = self.o_counts, self.x_counts, self.o_threats, self.x_threats
+        threat_count = self.geometry.win_length - 1
+        for line in self.geometry.cell_lines[cell]:
+            own_counts[line] += 1
+            if own_counts[line] == threat_count and not other_counts[line]: own_threats.add(line)
+            else: own_threats.discard(line) # Line completed, or still short of a threat
+            other_threats.discard(line)      # The opponent can no longer complete this line
+        if is_x: self.x_bits |= 1 << cell
+        else: self.o_bits |= 1 << cell
+
+
+    def rebuild(self, x_bits : int, o_bits : int) -> None:
+        """Recounts every line for the given position (used when the position was set w/o going through play())."""
+        masks = self.geometry.winning_masks
+        threat_count = self.geometry.win_length - 1
+        self.x_counts = bytearray((x_bits & mask).bit_count() for mask in masks)
+        self.o_counts = bytearray((o_bits & mask).bit_count() for mask in masks)
+        self.x_threats : set[int] = {line for line in range(len(masks)) if self.x_counts[line] == threat_count and not self.o_counts[line]}
+        self.o_threats : set[int] = {line for line in range(len(masks)) if self.o_counts[line] == threat_count and not self.x_counts[line]}
+        self.x_bits : int = x_bits # Position the counts describe
+        self.o_bits : int = o_bits
+
+
+    def winning_cells(self, is_x : bool) -> int:
+        """Returns the bitmask of the empty cells that complete a line for 'X' (is_x) or 'O'."""
+        masks = self.geometry.winning_masks
+        cells = 0
+        for line in (self.x_threats if is_x else self.o_threats): cells |= masks[line]
+        return cells & ~(self.x_bits if is_x else self.o_bits) # A threat line's only cell w/o an own mark is empty
+
+
+_default_rng : random.Random = random.Random() # Shared by every game that hasn't been given its own rng
+
+DEFAULT_SEARCH_TIME_BUDGET : float = 0.05 # Seconds per move for ITERATIVE_DEEPENING and MCTS
+MAX_EXHAUSTIVE_CELLS : int = 16 # Largest board MINIMAX_WIN_IMPOSSIBLE searches to the end in reasonable time (4x4, also covered by the tablebases)
+
+SNAPSHOT_PLAYER_O : int = 0x01     # Snapshot flag bits, bits 1-3 hold the computer logic value
+SNAPSHOT_GEOMETRY : int = 0x10     # Set if rows/cols/win_length bytes follow (omitted for the default 3x3 board)
 
 
 class PyTacToeGame:
 
-    def __init__(self):
+    # Per-game state only, the line tables live in the shared geometry. About 300 bytes per game (benchmark.py --memory), vs ~5 KB w/a __dict__ per game.
+    __slots__ = ("geometry", "match_count", "x_bits", "o_bits", "last_move", "computer_logic_enum", "current_player",
+                 "minimax_engine", "solved_table", "tablebase", "minimax_nodes_visited", "move_history", "redo_stack", "search_time_budget", "line_index",
+                 "_rng", "_zobrist_hash", "_hashed_x_bits", "_hashed_o_bits")
+
+    empty_mark : str = ' ' # Obvious constraint for this is that it cannot be 'X' or 'O', but could be any other str really, ' ' is simple and makes sense
+
+    rows = geometry_attribute("rows")
+    cols = geometry_attribute("cols")
+    win_length = geometry_attribute("win_length")
+    cell_count = geometry_attribute("cell_count")
+    full_mask = geometry_attribute("full_mask")
+    winning_combinations = geometry_attribute("winning_combinations")
+    winning_masks = geometry_attribute("winning_masks")
+    cell_line_masks = geometry_attribute("cell_line_masks")
+    center_cells = geometry_attribute("center_cells")
+    corner_cells = geometry_attribute("corner_cells")
+    opposite_corners = geometry_attribute("opposite_corners")
+    side_cells = geometry_attribute("side_cells")
+    inner_cells = geometry_attribute("inner_cells")
+
+    def __init__(self, rows : int = 3, cols : int = 3, win_length : int = 3):
+        self.geometry : PyTacToeBoardGeometry = PyTacToeBoardGeometry.get(rows=rows, cols=cols, win_length=win_length) # Shared line tables
         self.match_count : int = 0 # Counter to counter the # of match
-        self.empty_mark : str = ' ' # Obvious constraint for this is that it cannot be 'X' or 'O', but could be any other str really, ' ' is simple and makes sense
-        self.board : list[str] = [self.empty_mark for _ in range(9)] # Game board modeled as 1-D list of str ('X', 'O', or self.empty_mark are the only valid entries) 
+        self.x_bits : int = 0 # Game board modeled as one bitmask per player, bit i set -> cell i holds that player's mark
+        self.o_bits : int = 0 # Empty cells are the complement of (x_bits | o_bits) within self.full_mask
+        self.last_move : int = -1 # Cell of the most recent move, win checks only examine the lines through it (-1 -> scan every line)
+        self.move_history : list[int] = [] # Cells played since the last reset, in order (written to the game log when a game ends), the undo stack
+        self.redo_stack : list[int] = [] # Cells taken back by undo_move(), the last one is replayed first by redo_move()
         self.computer_logic_enum = PyTacToeGameComputerLogic.HEURISTIC
         self.current_player : str = 'X'
-        self.winning_combinations : list[tuple[int]] = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8), # horizontals
-            (0, 3, 6), (1, 4, 7), (2, 5, 8), # verticals
-            (0, 4, 8), (2, 4, 6)             # two diagonals
-                        ]            
+        self._rng : random.Random | None = None
+        self.minimax_engine : PyTacToeMinimaxEngine = get_shared_minimax_engine(rows=rows, cols=cols, winning_masks=self.geometry.winning_masks) # Shared, keeps its cache across games
+        self.solved_table : PyTacToeSolvedTable | None = load_shared_solved_table() if (rows, cols, win_length) == (3, 3, 3) else None # Memory-mapped solved positions
+        self.tablebase : PyTacToeTablebase | None = load_shared_tablebase(win_length=win_length) if (rows, cols) == (4, 4) else None # Memory-mapped 4x4 game values, if built
+        self.minimax_nodes_visited : int = 0 # Node counter for the exhaustive reference search (minimax_bits), for comparison w/the engine's
+        self.search_time_budget : float = DEFAULT_SEARCH_TIME_BUDGET # Per-move time limit of the ITERATIVE_DEEPENING and MCTS logic
+        self.line_index : PyTacToeLineIndex | None = None # Per-line mark counts for the heuristic, built on first use (see get_line_index())
+        self._zobrist_hash : int = 0 # Zobrist hash of the position (_hashed_x_bits, _hashed_o_bits), updated by make_move()/unmake_move()
+        self._hashed_x_bits : int = 0
+        self._hashed_o_bits : int = 0
+
+
+    @property
+    def board(self) -> list[str]:
+        """List view of the bitboards (1-D list of 'X', 'O', or self.empty_mark), built on demand for the GUI.
+        Writing into the returned list does not change the game state, use make_move() or assign a whole list to board instead.
+        """
+        return [self.mark_at(i) for i in range(self.geometry.cell_count)]
+
+
+    @board.setter
+    def board(self, board : list[str]) -> None:
+        self.x_bits, self.o_bits = self.board_to_bits(board=board)
+        self.last_move = -1 # Position set wholesale, the next win check scans every line
+        self.move_history.clear() # and the order the marks were played in is unknown
+        self.redo_stack.clear()
+
+
+    @property
+    def mcts_engine(self) -> PyTacToeMCTSEngine:
+        """MCTS engine shared by every game of this geometry, set its workers/iterations there (e.g. game.mcts_engine.workers = 4)."""
+        return get_shared_mcts_engine(rows=self.geometry.rows, cols=self.geometry.cols, winning_masks=self.geometry.winning_masks)
+
+
+    @property
+    def zobrist_hash(self) -> int:
+        """64-bit Zobrist hash of the marks on the board (not the player to move), a cheap position key for caches and replay tools.
+        Kept up to date move by move, recomputed here if the bitboards were assigned directly.
+        """
+        if self._hashed_x_bits != self.x_bits or self._hashed_o_bits != self.o_bits:
+            self._zobrist_hash = self.geometry.zobrist_hash(x_bits=self.x_bits, o_bits=self.o_bits)
+            self._hashed_x_bits, self._hashed_o_bits = self.x_bits, self.o_bits
+        return self._zobrist_hash
+
+
+    @property
+    def rng(self) -> random.Random:
+        """RNG used by the RANDOM logic, assign a seeded random.Random for reproducible games (games share one RNG until then)."""
+        return self._rng or _default_rng
+
+
+    @rng.setter
+    def rng(self, rng : random.Random) -> None:
+        self._rng = rng
+
+
+    @classmethod
+    def from_bytes(cls, data : bytes) -> "PyTacToeGame":
+        """Restores a game from a to_bytes() snapshot."""
+        flags = data[0]
+        offset = 1
+        rows, cols, win_length = 3, 3, 3
+        if flags & SNAPSHOT_GEOMETRY:
+            rows, cols, win_length = data[1], data[2], data[3]
+            offset = 4
+
+        match_count = 0
+        shift = 0
+        while True: # LEB128 varint
+            byte = data[offset]
+            offset += 1
+            match_count |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80: break
+
+        game = cls(rows=rows, cols=cols, win_length=win_length)
+        packed = int.from_bytes(data[offset:offset + game.geometry.position_bytes], "little")
+        for cell in range(game.geometry.cell_count):
+            packed, digit = divmod(packed, 3)
+            if digit == 1: game.x_bits |= 1 << cell
+            elif digit == 2: game.o_bits |= 1 << cell
+        game.current_player = 'O' if flags & SNAPSHOT_PLAYER_O else 'X'
+        game.computer_logic_enum = PyTacToeGameComputerLogic(flags >> 1 & 0x7)
+        game.match_count = match_count
+        return game
+
+
+    def to_bytes(self) -> bytes:
+        """Returns a compact snapshot of the game state (4 bytes for a 3x3 game under 128 matches), restore it with PyTacToeGame.from_bytes().
+        Layout: flags byte, [rows, cols, win_length bytes if not 3x3], match_count as a varint, then the board packed as a base-3 integer.
+        The RNG, last move, move history and engine caches aren't part of the snapshot.
+        """
+        geometry = self.geometry
+        flags = (SNAPSHOT_PLAYER_O if self.current_player == 'O' else 0) | self.computer_logic_enum.value << 1
+        header = bytearray()
+        if (geometry.rows, geometry.cols, geometry.win_length) != (3, 3, 3):
+            flags |= SNAPSHOT_GEOMETRY
+            header += bytes((geometry.rows, geometry.cols, geometry.win_length))
+
+        match_count = self.match_count
+        while True: # LEB128 varint
+            byte = match_count & 0x7F
+            match_count >>= 7
+            header.append(byte | 0x80 if match_count else byte)
+            if not match_count: break
+
+        packed = 0
+        for cell in reversed(range(geometry.cell_count)):
+            packed = packed * 3 + (1 if self.x_bits >> cell & 1 else 2 if self.o_bits >> cell & 1 else 0)
+        return bytes((flags,)) + bytes(header) + packed.to_bytes(geometry.position_bytes, "little")
+
+
+    def bits_for_mark(self, board_mark : str) -> int:
+        """Returns the bitboard of the given player mark ('X' or 'O')."""
+        return self.x_bits if board_mark == 'X' else self.o_bits
+
+
+    def board_to_bits(self, board : list[str]) -> tuple[int, int]:
+        """Converts a 1-D list board into the (x_bits, o_bits) bitboard pair."""
+        x_bits : int = 0
+        o_bits : int = 0
+        for i, mark in enumerate(board):
+            if mark == 'X': x_bits |= 1 << i
+            elif mark == 'O': o_bits |= 1 << i
+        return x_bits, o_bits
 
 
     def check_winner(self) -> None | str:
-        """This functions contains the inner game state logic to check if there is a winner based on the current game state."""
-        for combo in self.winning_combinations:
-            if self.board[combo[0]] == self.board[combo[1]] == self.board[combo[2]] != self.empty_mark:
+        """This functions contains the inner game state logic to check if there is a winner based on the current game state.
+        Only the lines through the last move are examined, the full line list is scanned if the last move isn't known.
+        """
+        if self.last_move >= 0:
+            board_mark = self.mark_at(self.last_move)
+            bits = self.bits_for_mark(board_mark)
+            for mask in self.geometry.cell_line_masks[self.last_move]:
+                if bits & mask == mask:
+                    self.match_count = self.match_count + 1
+                    return board_mark
+            return None
+
+        for board_mark in ('X', 'O'):
+            if self.has_line(self.bits_for_mark(board_mark)):
                 self.match_count = self.match_count + 1
-                return self.board[combo[0]]
+                return board_mark
         return None
-    
+
 
     def check_tie(self) -> None | str:
         """This functions contains the inner game state logic to check if the game is in a tie(draw) based on the current game state."""
-        if self.empty_mark in self.board: 
+        if self.empty_bits(): 
             return None
         else: 
             self.match_count = self.match_count + 1
             return self.empty_mark
-        
-    
+
+
     def computer_move(self) -> None:
         """This functions contains the logic for performing the move for the computer opponent.
         Used if 'vs-computer' mode is the currently selected game mode. 
         It handles updating the board state within this class and switching to the user once the move is complete.
         """
-        empty_positions = [i for i in range(9) if self.board[i] == self.empty_mark]
-
-        if empty_positions:
-            if self.computer_logic_enum == PyTacToeGameComputerLogic.RANDOM:
-                move = random.choice(empty_positions) 
-            elif self.computer_logic_enum in {PyTacToeGameComputerLogic.HEURISTIC, PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT}:
-                move = self.computer_move_heuristic_logic(empty_positions=empty_positions)
-            elif self.computer_logic_enum == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE:
-                move = self.computer_move_minimax_best()
-            else:
-                raise ValueError("Invalid selection for computer logic enumeration.")
+        move = self.select_computer_move()
 
-            self.board[move] = self.current_player
+        if move != -1:
+            self.make_move(move)
             self.switch_player()
 
 
-    def computer_move_heuristic_logic(self, empty_positions : list[int]) -> int:
+    def computer_move_heuristic_logic(self, empty_positions : list[int] | None = None) -> int:
         """
         Uses heuristic logic to compute the next move for the computer opponent to take in the game.
+        Moves are picked from empty_positions (default: every empty cell), membership is tested on a bitmask rather than the list.
                     0 | 1 | 2
-        Board -->   3 | 4 | 5
+        Board -->   3 | 4 | 5       (3x3 cell indices used in the comments below, see __init__ for the cell groups on other sizes)
                     6 | 7 | 8
         """
-        
+        empty : int = self.empty_bits() if empty_positions is None else positions_to_bits(empty_positions)
+
         # 1 - Check for winning move for computer, if there is take it
-        temp_result : int = self.scan_board_for_winning_move(board_mark=self.current_player, empty_positions=empty_positions) 
-        if temp_result != -1: return temp_result # func returns -1 if there isn't a winning move
+        temp_cells : int = self.winning_cells(board_mark=self.current_player) & empty # Looked up in the line index, no board scan
+        if temp_cells: return (temp_cells & -temp_cells).bit_length() - 1 # Lowest winning cell
 
         # 2 - Check for winning move for user, if there is block it
         if self.computer_logic_enum == PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT:
             temp_user_char: str = 'O' if self.current_player == 'X' else 'X'
-            temp_result = self.scan_board_for_winning_move(board_mark=temp_user_char, empty_positions=empty_positions)
-            if temp_result != -1: return temp_result # func returns -1 if there isn't a winning move
+            temp_cells = self.winning_cells(board_mark=temp_user_char) & empty
+            if temp_cells: return (temp_cells & -temp_cells).bit_length() - 1
         
         # 3 - Take Center if availible (4)
-        if 4 in empty_positions: return 4
+        for pos in self.geometry.center_cells:
+            if empty >> pos & 1: return pos
 
         # 4 - Take Corner opposite from a user mark (u:0,8 -> c:8,0) or (u:2,6 -> c:6,2)
-        if 0 not in empty_positions and 8 in empty_positions: return 8
-        if 8 not in empty_positions and 0 in empty_positions: return 0
-        if 2 not in empty_positions and 6 in empty_positions: return 6
-        if 6 not in empty_positions and 2 in empty_positions: return 2
+        for corner, opposite in self.geometry.opposite_corners:
+            if not empty >> corner & 1 and empty >> opposite & 1: return opposite
 
         # 5 - Take any empty Corner (0, 2, 6, 8)
-        if 0 in empty_positions: return 0
-        if 2 in empty_positions: return 2
-        if 6 in empty_positions: return 6
-        if 8 in empty_positions: return 8
+        for pos in self.geometry.corner_cells:
+            if empty >> pos & 1: return pos
 
         # 6 - Take any empty Side (1, 3, 5, 7)
-        if 1 in empty_positions: return 1
-        if 3 in empty_positions: return 3
-        if 5 in empty_positions: return 5
-        if 7 in empty_positions: return 7
+        for pos in self.geometry.side_cells:
+            if empty >> pos & 1: return pos
+
+        # 7 - Take any other empty cell, nearest the center first (only reached on boards larger than 3x3)
+        for pos in self.geometry.inner_cells:
+            if empty >> pos & 1: return pos
+        return -1
+
+
+    def computer_move_iterative_deepening(self, stop_event : threading.Event | None = None) -> int:
+        """Finds a move for the current player within self.search_time_budget seconds (ITERATIVE_DEEPENING logic).
+        The solved table (3x3) or tablebase (4x4) answers directly, otherwise the engine deepens its search until the budget runs out and returns the best move found so far.
+        """
+        move = self.lookup_solved_table_move(logic=PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE)
+        if move != -1: return move
+        move, _ = self.minimax_engine.best_move_timed(x_bits=self.x_bits, o_bits=self.o_bits, x_to_move=self.current_player == 'X',
+                                                      time_budget=self.search_time_budget, stop_event=stop_event)
+        return move
+
+
+    def computer_move_mcts(self, stop_event : threading.Event | None = None) -> int:
+        """Finds a move for the current player w/Monte Carlo Tree Search (MCTS logic), within self.search_time_budget seconds
+        unless the engine is set to a fixed # of iterations.
+        """
+        return self.mcts_engine.best_move(x_bits=self.x_bits, o_bits=self.o_bits, x_to_move=self.current_player == 'X',
+                                          time_budget=self.search_time_budget, stop_event=stop_event)
 
-    
-    def computer_move_minimax_best(self):
-        """Finds the best move for the computer (O)."""
-        best_score = float("inf")
-        best_position : int = -1
 
-        empty_positions : list[int] = [i for i in range(9) if self.board[i] == self.empty_mark]
-        copy_board : list[str] = self.board.copy()  # Make shallow copy, separate obj refs in this case as desired
+    def computer_move_minimax_best(self, stop_event : threading.Event | None = None) -> int:
+        """Finds the best move for the computer (the current player, 'O' minimizes and 'X' maximizes).
+        Probes the solved table / 4x4 tablebase first, then falls back to the shared alpha-beta engine (raises PyTacToeSearchCancelled if stop_event gets set).
+        The exhaustive reference search is still available through return_move_minimax_logic().
+        """
+        move = self.lookup_solved_table_move(logic=PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE)
+        if move != -1: return move
+        move, _ = self.minimax_engine.best_move(x_bits=self.x_bits, o_bits=self.o_bits, x_to_move=self.current_player == 'X', stop_event=stop_event)
+        return move
+
+
+    def empty_bits(self) -> int:
+        """Returns the bitmask of the empty cells on the board."""
+        return self.geometry.full_mask & ~(self.x_bits | self.o_bits)
 
-        for pos in empty_positions:
-            copy_board[pos] = self.current_player   # Try 'O' move
-            score = self.return_move_minimax_logic(board=copy_board, is_maximizing=True)
-            copy_board[pos] = self.empty_mark       # Undo move
-            
-            if score < best_score:
-                best_score = score
-                best_position = pos
 
-        return best_position
+    def get_empty_positions(self) -> list[int]:
+        """Returns the indices of the empty cells on the board in ascending order."""
+        return bits_to_positions(self.empty_bits())
+
+
+    def get_line_index(self) -> PyTacToeLineIndex:
+        """Returns the line index of the current position. It is kept up to date by make_move(), and rebuilt here if the bitboards
+        were assigned directly (board setter, snapshots, reset, tools setting x_bits/o_bits).
+        """
+        index = self.line_index
+        if index is None:
+            index = self.line_index = PyTacToeLineIndex(geometry=self.geometry, x_bits=self.x_bits, o_bits=self.o_bits)
+        elif index.x_bits != self.x_bits or index.o_bits != self.o_bits:
+            index.rebuild(x_bits=self.x_bits, o_bits=self.o_bits)
+        return index
+
+
+    def has_line(self, bits : int) -> bool:
+        """Returns True if the given bitboard completes any of the winning lines."""
+        for mask in self.geometry.winning_masks:
+            if bits & mask == mask: return True
+        return False
+
+
+    def lookup_solved_table_move(self, logic : PyTacToeGameComputerLogic | None = None) -> int:
+        """Looks up the move for the current position in the solved table, for HEURISTIC_DIFFICULT or MINIMAX_WIN_IMPOSSIBLE logic (default: self.computer_logic_enum).
+        On 4x4 the tablebase answers MINIMAX_WIN_IMPOSSIBLE the same way (it holds game values only, no heuristic moves).
+        Returns -1 if no table is loaded, the logic isn't tabulated, or the current player doesn't match the side to move of the position.
+        """
+        logic = logic or self.computer_logic_enum
+        table = self.solved_table if self.solved_table is not None else self.tablebase
+        if table is None: return -1
+        x_to_move : bool = self.x_bits.bit_count() == self.o_bits.bit_count()
+        if x_to_move != (self.current_player == 'X'): return -1
+
+        if logic == PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT:
+            return self.solved_table.heuristic_move(x_bits=self.x_bits, o_bits=self.o_bits) if self.solved_table is not None else -1
+        if logic == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE:
+            best_moves = table.best_moves(x_bits=self.x_bits, o_bits=self.o_bits)
+            for move in self.minimax_engine.move_order: # Same preference order as the search engine
+                if best_moves >> move & 1: return move
+        return -1
 
 
     def make_move(self, position : int) -> bool:
         """This function checks if the requested user move is valid, if the move requested is invalid it does not perform any move and returns False.
         Otherwise, it performs the move, updating the board state within the class and returns True.
+        The board is changed in place (no copy), unmake_move() takes the move back. A new move discards the moves that could be redone.
         """
-        if self.board[position] != self.empty_mark: return False
-        self.board[position] = self.current_player
+        if (self.x_bits | self.o_bits) >> position & 1: return False
+        self.play_move(position=position, is_x=self.current_player == 'X')
+        self.redo_stack.clear()
         return True
-    
+
+
+    def play_move(self, position : int, is_x : bool) -> None:
+        """Places a mark in an empty cell and pushes it on the move history, updating the line index and Zobrist hash in O(1) if they are in sync."""
+        bit = 1 << position
+        index = self.line_index
+        if index is not None and index.x_bits == self.x_bits and index.o_bits == self.o_bits:
+            index.play(cell=position, is_x=is_x) # Only the lines through position change
+        in_sync = self._hashed_x_bits == self.x_bits and self._hashed_o_bits == self.o_bits
+        if is_x:
+            self.x_bits |= bit
+            if in_sync: self._zobrist_hash ^= self.geometry.zobrist_x_keys[position]
+        else:
+            self.o_bits |= bit
+            if in_sync: self._zobrist_hash ^= self.geometry.zobrist_o_keys[position]
+        if in_sync: self._hashed_x_bits, self._hashed_o_bits = self.x_bits, self.o_bits
+        self.last_move = position
+        self.move_history.append(position)
+
+
+    def mark_at(self, position : int) -> str:
+        """Returns the mark ('X', 'O', or self.empty_mark) stored in the given cell."""
+        bit = 1 << position
+        if self.x_bits & bit: return 'X'
+        if self.o_bits & bit: return 'O'
+        return self.empty_mark
+
+
+    def minimax_bits(self, x_bits : int, o_bits : int, is_maximizing : bool = False) -> int:
+        """Bitboard implementation of return_move_minimax_logic, the full game tree below the given position is evaluated."""
+        self.minimax_nodes_visited += 1
+        score : int = self.minimax_evaluate_bits(x_bits=x_bits, o_bits=o_bits) # check for terminal state
+        if score is not None: return score # return the evaluated result if score is terminal
+        
+        empty : int = self.geometry.full_mask & ~(x_bits | o_bits)
+
+        if is_maximizing: # 'X'
+            best_score = float("-inf")
+            while empty:
+                bit = empty & -empty # lowest empty cell
+                empty ^= bit
+                best_score = max(best_score, self.minimax_bits(x_bits=x_bits | bit, o_bits=o_bits, is_maximizing=False))
+            return best_score
+        
+        else: # 'O'
+            best_score = float("inf")
+            while empty:
+                bit = empty & -empty # lowest empty cell
+                empty ^= bit
+                best_score = min(best_score, self.minimax_bits(x_bits=x_bits, o_bits=o_bits | bit, is_maximizing=True))
+            return best_score
+
+
+    def minimax_evaluate_bits(self, x_bits : int, o_bits : int) -> int | None:
+        """Evaluates a bitboard position for a win or tie."""
+        if self.has_line(x_bits): return 1   # X wins: 1
+        if self.has_line(o_bits): return -1  # O wins: -1
+        return 0 if (x_bits | o_bits) == self.geometry.full_mask else None  # Tie: 0, game continues: None
+
 
     def minimax_evaluate_board(self, minimax_board : list[str]) -> int | None:
         """Evaluates the minimax board for a win or tie."""
-        for combo in self.winning_combinations:
-            if minimax_board[combo[0]] == minimax_board[combo[1]] == minimax_board[combo[2]] != self.empty_mark:
-                return 1 if minimax_board[combo[0]] == 'X' else -1  # X wins: 1, O wins: -1
-        return 0 if self.empty_mark not in minimax_board else None  # Tie: 0, game continues: None
-    
+        x_bits, o_bits = self.board_to_bits(board=minimax_board)
+        return self.minimax_evaluate_bits(x_bits=x_bits, o_bits=o_bits)
+
+
+    def redo_move(self) -> int:
+        """Replays the last move taken back by undo_move() and passes the turn on, returns its cell (-1 if there is nothing to redo)."""
+        if not self.redo_stack: return -1
+        position = self.redo_stack.pop()
+        self.play_move(position=position, is_x=self.current_player == 'X')
+        self.switch_player()
+        return position
+
 
     def reset_game(self) -> None:
         """This function resets the board state within the class back to default (all cells marked with self.empty_mark)."""
-        self.board = [self.empty_mark for _ in range(9)]
+        self.x_bits = 0
+        self.o_bits = 0
+        self.last_move = -1
+        self.move_history.clear()
+        self.redo_stack.clear()
+
 
-    
     def return_move_minimax_logic(self, board : list[str], is_maximizing : bool = False) -> int:
         """
         Minimax implementation for Tic-Tac-Toe game, should always make it such that implementer wins or the game is a draw.
@@ -159,50 +619,199 @@ class PyTacToeGame:
         Return param(s):
             int: Used to store the minimax result 
         """
-        score : int = self.minimax_evaluate_board(minimax_board=board) # check for terminal state
-        if score is not None: return score # return the evaluated result if score is terminal
-        
-        empty_positions : list[int] = [i for i in range(9) if board[i] == self.empty_mark] 
+        x_bits, o_bits = self.board_to_bits(board=board)
+        return self.minimax_bits(x_bits=x_bits, o_bits=o_bits, is_maximizing=is_maximizing)
 
-        if is_maximizing: # 'X'
-            best_score = float("-inf")
-            for pos in empty_positions:
-                board[pos] = 'X'
-                minimax_score = self.return_move_minimax_logic(board=board, is_maximizing=False)
-                board[pos] = self.empty_mark
-                best_score = max(best_score, minimax_score)
-            return best_score
-        
-        else: # 'O'
-            best_score = float("inf")
-            for pos in empty_positions:
-                board[pos] = 'O'
-                minimax_score = self.return_move_minimax_logic(board=board, is_maximizing=True)
-                board[pos] = self.empty_mark
-                best_score = min(best_score, minimax_score)
-            return best_score
 
-    
-    def scan_board_for_winning_move(self, board_mark : str, empty_positions : list[int]) -> int:
-        """This is a helper function that can be used to scan the current game state to evaluate if there is a winning move that could be made."""
-        for pos in empty_positions:
-            temp_board : list[int] = self.board.copy() # Make shallow copy, separate obj refs in this case as desired
-            temp_board[pos] = board_mark
-            for combo in self.winning_combinations:
-                if temp_board[combo[0]] == temp_board[combo[1]] == temp_board[combo[2]] != self.empty_mark:
-                    for i in range(3):
-                        if self.board[combo[i]] == self.empty_mark: 
-                            return combo[i]
-        return -1
-    
+    def scan_board_for_winning_move(self, board_mark : str, empty_positions : list[int] | None = None) -> int:
+        """This is a helper function that can be used to evaluate if there is a winning move that could be made in the current game state.
+        Returns the lowest such cell within empty_positions (default: every empty cell), or -1. The line index answers this w/o scanning the board.
+        """
+        cells : int = self.winning_cells(board_mark=board_mark)
+        if empty_positions is not None: cells &= positions_to_bits(empty_positions)
+        return (cells & -cells).bit_length() - 1 # -1 if there are no winning cells
+
+
+    def select_computer_move(self, stop_event : threading.Event | None = None) -> int:
+        """Returns the move the computer logic picks for the current player without playing it, or -1 if the board is full.
+        computer_move() plays this move, callers that compute the move elsewhere (e.g. off the GUI thread) can apply it w/make_move().
+        Setting stop_event from another thread aborts a search w/PyTacToeSearchCancelled.
+        """
+        if not self.empty_bits(): return -1
+
+        if self.computer_logic_enum == PyTacToeGameComputerLogic.RANDOM:
+            return self.rng.choice(self.get_empty_positions()) 
+        elif self.computer_logic_enum == PyTacToeGameComputerLogic.HEURISTIC:
+            return self.computer_move_heuristic_logic()
+        elif self.computer_logic_enum == PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT:
+            move = self.lookup_solved_table_move() # O(1) probe of the precomputed heuristic move, -1 if no table is loaded
+            if move == -1: move = self.computer_move_heuristic_logic()
+            return move
+        elif self.computer_logic_enum == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE:
+            return self.computer_move_minimax_best(stop_event=stop_event)
+        elif self.computer_logic_enum == PyTacToeGameComputerLogic.ITERATIVE_DEEPENING:
+            return self.computer_move_iterative_deepening(stop_event=stop_event)
+        elif self.computer_logic_enum == PyTacToeGameComputerLogic.MCTS:
+            return self.computer_move_mcts(stop_event=stop_event)
+        else:
+            raise ValueError("Invalid selection for computer logic enumeration.")
+
 
     def send_difficulty_selected_to_game_class(self, difficulty : int) -> None:
         """This function is used to retrieve the selected game difficulty.
-        Valid difficulty selections are: 'EASY:0' 'MEDIUM:1' 'HARD:2' or 'IMPOSSIBLE:3'
+        Valid difficulty selections are: 'EASY:0' 'MEDIUM:1' 'HARD:2' 'IMPOSSIBLE:3' 'TIMED:4' (iterative deepening) or 'MCTS:5' (for large boards)
         """
         self.computer_logic_enum = PyTacToeGameComputerLogic(difficulty)
 
 
     def switch_player(self) -> None:
         """This functions switches the current player in the game state."""
-        self.current_player = 'O' if self.current_player == 'X' else 'X'
\ No newline at end of file
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+
+    def undo_move(self) -> int:
+        """Takes back the last move and gives the turn back to the player who made it, returns its cell (-1 if there is nothing to undo).
+        The move can be replayed w/redo_move() until a new move is made.
+        """
+        if not self.move_history: return -1
+        self.current_player = 'X' if self.x_bits >> self.move_history[-1] & 1 else 'O'
+        position = self.unmake_move()
+        self.redo_stack.append(position)
+        return position
+
+
+    def unmake_move(self) -> int:
+        """Takes back the last move of the move history in O(1) (the inverse of make_move(), the current player is left as is).
+        Returns the cell that was cleared, or -1 if the history is empty.
+        """
+        if not self.move_history: return -1
+        position = self.move_history.pop()
+        bit = 1 << position
+        is_x = bool(self.x_bits & bit)
+        index = self.line_index
+        if index is not None and index.x_bits == self.x_bits and index.o_bits == self.o_bits: index.unplay(cell=position, is_x=is_x)
+        in_sync = self._hashed_x_bits == self.x_bits and self._hashed_o_bits == self.o_bits
+        if is_x: self.x_bits &= ~bit
+        else: self.o_bits &= ~bit
+        if in_sync:
+            self._zobrist_hash ^= self.geometry.zobrist_x_keys[position] if is_x else self.geometry.zobrist_o_keys[position]
+            self._hashed_x_bits, self._hashed_o_bits = self.x_bits, self.o_bits
+        self.last_move = self.move_history[-1] if self.move_history else -1
+        return position
+
+
+    def winning_cells(self, board_mark : str) -> int:
+        """Returns the bitmask of the empty cells where board_mark ('X' or 'O') would complete a line, read from the line index."""
+        return self.get_line_index().winning_cells(is_x=board_mark == 'X')
+
+
+DEFAULT_MAX_SAMPLES : int = 100_000 # Timing samples kept per method for the percentiles (counts and totals cover every call)
+
+
+class PyTacToeInstrumentation:
+    """Call counts, cumulative/percentile timings and nodes searched per computer move for the PyTacToeGame hot paths.
+    Nodes are the alpha-beta nodes visited plus the MCTS playouts (one tree node expanded per playout) of the move.
+    enable() swaps timing wrappers onto the PyTacToeGame class and disable() puts the original methods back, so it costs nothing when off.
+    It applies to every game in the process, use the module instance (game_logic.instrumentation).
+    """
+    INSTRUMENTED_METHODS : tuple[str, ...] = ("computer_move", "select_computer_move", "check_winner", "computer_move_minimax_best",
+                                              "computer_move_iterative_deepening", "computer_move_mcts", "return_move_minimax_logic")
+
+    def __init__(self, max_samples : int = DEFAULT_MAX_SAMPLES):
+        self.max_samples : int = max_samples
+        self.enabled : bool = False
+        self.originals : dict[str, object] = {}
+        self.reset()
+
+
+    def disable(self) -> None:
+        """Restores the original (uninstrumented) methods, the recorded figures are kept."""
+        for name, method in self.originals.items(): setattr(PyTacToeGame, name, method)
+        self.originals.clear()
+        self.enabled = False
+
+
+    def dump_json(self, path : str) -> None:
+        """Writes to_dict() as JSON to path."""
+        import json # Only needed here, keeps game_logic quick to import
+        with open(path, "w") as file: json.dump(self.to_dict(), file, indent=2)
+
+
+    def enable(self) -> None:
+        """Starts recording, wraps every INSTRUMENTED_METHODS method of PyTacToeGame w/a timer."""
+        if self.enabled: return
+        for name in self.INSTRUMENTED_METHODS:
+            self.originals[name] = PyTacToeGame.__dict__[name]
+            setattr(PyTacToeGame, name, self.wrap(name=name, method=self.originals[name]))
+        self.enabled = True
+
+
+    def record(self, name : str, seconds : float) -> None:
+        """Adds one timed call of the named method."""
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.total_seconds[name] = self.total_seconds.get(name, 0.0) + seconds
+        samples = self.samples.get(name)
+        if samples is None: samples = self.samples[name] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+
+
+    def reset(self) -> None:
+        """Clears every recorded figure."""
+        self.calls : dict[str, int] = {}
+        self.total_seconds : dict[str, float] = {}
+        self.samples : dict[str, deque] = {}                         # Most recent max_samples call times (seconds) per method
+        self.nodes_per_move : deque = deque(maxlen=self.max_samples) # Engine nodes (alpha-beta nodes + MCTS playouts) of each select_computer_move call
+        self.last_move_seconds : float | None = None                 # Think time and nodes of the most recent computer move
+        self.last_move_nodes : int | None = None
+
+
+    def stats(self, name : str) -> dict:
+        """Returns {calls, total_ms, mean_us, p50_us, p90_us, p99_us, max_us} for the named method (percentiles over the kept samples)."""
+        calls = self.calls.get(name, 0)
+        ordered = sorted(self.samples.get(name, ()))
+        def percentile(fraction : float) -> float:
+            return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))] * 1e6 if ordered else 0.0
+        total = self.total_seconds.get(name, 0.0)
+        return {"calls": calls, "total_ms": total * 1e3, "mean_us": total / calls * 1e6 if calls else 0.0,
+                "p50_us": percentile(0.50), "p90_us": percentile(0.90), "p99_us": percentile(0.99), "max_us": ordered[-1] * 1e6 if ordered else 0.0}
+
+
+    def to_dict(self) -> dict:
+        """Returns every recorded figure as a JSON serializable dict."""
+        nodes = list(self.nodes_per_move)
+        return {
+            "enabled": self.enabled,
+            "methods": {name: self.stats(name) for name in self.calls},
+            "nodes_per_move": {"moves": len(nodes), "total": sum(nodes), "mean": sum(nodes) / len(nodes) if nodes else 0.0, "max": max(nodes, default=0)},
+            "last_move": {"seconds": self.last_move_seconds, "nodes": self.last_move_nodes},
+        }
+
+
+    def wrap(self, name : str, method):
+        """Returns method wrapped w/a timer recording into name, select_computer_move also records the engine nodes of the move."""
+        if name == "select_computer_move":
+            @functools.wraps(method)
+            def timed_move(game : PyTacToeGame, *args, **kwargs):
+                nodes_before = game.minimax_engine.total_nodes_visited + game.mcts_engine.total_playouts
+                start = time.perf_counter()
+                try:
+                    return method(game, *args, **kwargs)
+                finally:
+                    seconds = time.perf_counter() - start
+                    nodes = game.minimax_engine.total_nodes_visited + game.mcts_engine.total_playouts - nodes_before
+                    self.record(name, seconds)
+                    self.nodes_per_move.append(nodes)
+                    self.last_move_seconds, self.last_move_nodes = seconds, nodes
+            return timed_move
+
+        @functools.wraps(method)
+        def timed(game : PyTacToeGame, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(game, *args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return timed
+
+
+instrumentation : PyTacToeInstrumentation = PyTacToeInstrumentation()
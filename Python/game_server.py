@@ -0,0 +1,265 @@
+"""
+This .py file defines the PyTacToeGameServer class, an asyncio TCP server hosting many independent headless PyTacToeGame sessions (no tkinter).
+
+The protocol is line-delimited JSON, one request object per line and one response object per line, in order. Every request has an
+"op" field and may carry an "id" field that is echoed back. Responses have "ok": true plus the session state, or "ok": false and "error".
+    {"op": "create", "mode": "vs-computer", "difficulty": 1, "rows": 3, "cols": 3, "win_length": 3}   -> new session (all fields optional)
+    {"op": "move", "session": 1, "position": 4}        -> plays the move, in 'vs-computer' mode the computer replies in the same response
+    {"op": "state", "session": 1}                      -> current state
+    {"op": "difficulty", "session": 1, "difficulty": 3}
+    {"op": "reset", "session": 1}
+    {"op": "close", "session": 1}
+
+Computer moves that need a search (large boards, or MINIMAX_WIN_IMPOSSIBLE without the solved table) are computed in a process pool so
+they never stall the event loop, constant-time moves (table lookups, RANDOM, the 3x3 heuristic) are computed inline.
+Boards are limited to MAX_CELLS cells and MINIMAX_WIN_IMPOSSIBLE (an exhaustive search) to MAX_EXHAUSTIVE_CELLS, sessions on boards larger
+than 3x3 are built on a thread (the first game of a geometry builds its line tables and engines). A failed search is answered w/"ok": false,
+the player's move is taken back so the session can go on.
+
+Run: python game_server.py --port 8765       (see game_server_load.py for the load-generator client)
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from game_logic import MAX_EXHAUSTIVE_CELLS, PyTacToeGame, PyTacToeGameComputerLogic
+
+DEFAULT_HOST : str = "127.0.0.1"
+DEFAULT_PORT : int = 8765
+MAX_LINE_BYTES : int = 1 << 16
+MAX_CELLS : int = 400 # Largest board accepted (20x20), like game_http_server
+VALID_MODES : tuple[str, str] = ('2-Player', 'vs-computer') # Same mode names as the GUI
+
+
+def create_search_executor(workers : int | None = None) -> ProcessPoolExecutor:
+    """Returns the process pool used for searches. Workers are spawned rather than forked so they don't inherit open client sockets."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+_worker_games : dict[tuple[int, int, int], PyTacToeGame] = {} # Per-process games (one per geometry) used by compute_computer_move
+
+
+def compute_computer_move(job : tuple) -> int:
+    """Executor entry point: returns the computer move for a position without touching any session.
+    job = (rows, cols, win length, x_bits, o_bits, current player, logic value, RNG seed)
+    """
+    rows, cols, win_length, x_bits, o_bits, player, logic_value, seed = job
+    game = _worker_games.get((rows, cols, win_length))
+    if game is None:
+        game = _worker_games[(rows, cols, win_length)] = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+    game.x_bits, game.o_bits, game.last_move, game.current_player = x_bits, o_bits, -1, player
+    game.computer_logic_enum = PyTacToeGameComputerLogic(logic_value)
+    game.rng = random.Random(seed)
+    return game.select_computer_move()
+
+
+class PyTacToeServerError(Exception):
+    """Raised for invalid requests, reported to the client as {"ok": false, "error": ...}."""
+
+
+def check_settings(cells : int, difficulty : int) -> None:
+    """Raises PyTacToeServerError if a session w/this many cells can't be hosted, or can't be played at this difficulty in bounded time."""
+    if cells > MAX_CELLS: raise PyTacToeServerError(f"Board too large: {cells} cells (max {MAX_CELLS})")
+    if difficulty == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE.value and cells > MAX_EXHAUSTIVE_CELLS:
+        raise PyTacToeServerError(f"Difficulty {difficulty} searches to the end of the game, it is limited to boards of up to {MAX_EXHAUSTIVE_CELLS} cells")
+
+
+class PyTacToeServerSession:
+
+    __slots__ = ("session_id", "mode", "game", "result", "lock") # Servers hold many sessions, no per-session __dict__
+
+    def __init__(self, session_id : int, mode : str, difficulty : int, rows : int, cols : int, win_length : int):
+        self.session_id : int = session_id
+        self.mode : str = mode
+        self.game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+        self.game.send_difficulty_selected_to_game_class(difficulty=difficulty)
+        self.result : str | None = None    # None while the game is in progress, then 'X', 'O' or 'draw'
+        self.lock = asyncio.Lock()          # Serializes requests on this session (a search may be in flight)
+
+
+    def needs_executor(self) -> bool:
+        """Returns True if the computer move may need a search, rather than a constant-time lookup/heuristic."""
+        logic = self.game.computer_logic_enum
+        if logic == PyTacToeGameComputerLogic.RANDOM: return False
+        if logic == PyTacToeGameComputerLogic.ITERATIVE_DEEPENING: return self.game.solved_table is None # Spends its whole time budget
+        if logic == PyTacToeGameComputerLogic.MCTS: return True
+        if self.game.cell_count > 9: return True
+        return logic == PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE and self.game.solved_table is None
+
+
+    def play(self, position : int) -> None:
+        """Plays position for the current player and updates the result."""
+        if self.result is not None: raise PyTacToeServerError("Game is over, send a 'reset' to play again.")
+        if not 0 <= position < self.game.cell_count or not self.game.make_move(position):
+            raise PyTacToeServerError(f"Invalid move: {position}")
+        self.game.switch_player()
+        self.update_result()
+
+
+    def reset(self) -> None:
+        """Starts a new game in this session, 'X' moves first."""
+        self.game.reset_game()
+        self.game.current_player = 'X'
+        self.result = None
+
+
+    def state(self) -> dict:
+        """Returns the JSON serializable session state."""
+        return {
+            "session": self.session_id, "mode": self.mode, "difficulty": self.game.computer_logic_enum.value,
+            "rows": self.game.rows, "cols": self.game.cols, "win_length": self.game.win_length,
+            "board": "".join(self.game.board), "current_player": self.game.current_player, "result": self.result,
+        }
+
+
+    def update_result(self) -> None:
+        """Checks the last move for a win, then the board for a tie."""
+        winner = self.game.check_winner()
+        if winner: self.result = winner
+        elif self.game.check_tie(): self.result = 'draw'
+
+
+class PyTacToeGameServer:
+
+    def __init__(self, executor : Executor | None = None):
+        self.sessions : dict[int, PyTacToeServerSession] = {}
+        self.session_ids = itertools.count(1)
+        self.executor : Executor = executor or create_search_executor()
+        self.rng = random.Random()
+
+
+    async def computer_reply(self, session : PyTacToeServerSession) -> int:
+        """Computes and plays the computer move for the session, offloading searches to the executor. Returns the move."""
+        game = session.game
+        if session.needs_executor():
+            job = (game.rows, game.cols, game.win_length, game.x_bits, game.o_bits, game.current_player,
+                   game.computer_logic_enum.value, self.rng.getrandbits(32))
+            move = await asyncio.get_running_loop().run_in_executor(self.executor, compute_computer_move, job)
+        else:
+            move = game.select_computer_move()
+        session.play(position=move)
+        return move
+
+
+    def get_session(self, request : dict) -> PyTacToeServerSession:
+        """Returns the session named by the request, raises PyTacToeServerError if it doesn't exist."""
+        session = self.sessions.get(request.get("session"))
+        if session is None: raise PyTacToeServerError(f"Unknown session: {request.get('session')}")
+        return session
+
+
+    async def handle_client(self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+        """Serves one connection: reads request lines and writes one response line per request, in order."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "Request line too long."}\n')
+                    break
+                if not line: break
+                if not line.strip(): continue
+                response = await self.handle_line(line=line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def handle_line(self, line : bytes) -> dict:
+        """Parses and dispatches one request line, returns the response dict."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict): raise PyTacToeServerError("Request must be a JSON object.")
+            request_id = request.get("id")
+            response = await self.handle_request(request=request)
+            response["ok"] = True
+        except (PyTacToeServerError, ValueError, TypeError) as error: # json.JSONDecodeError is a ValueError
+            response = {"ok": False, "error": str(error)}
+        except Exception as error: # A failed search job (e.g. BrokenProcessPool), the client still gets its response line
+            response = {"ok": False, "error": f"Computer move failed: {type(error).__name__}: {error}"}
+        if request_id is not None: response["id"] = request_id
+        return response
+
+
+    async def handle_request(self, request : dict) -> dict:
+        """Executes one request and returns the response fields (without "ok")."""
+        op = request.get("op")
+
+        if op == "create":
+            mode = request.get("mode", "vs-computer")
+            if mode not in VALID_MODES: raise PyTacToeServerError(f"Invalid mode: {mode}")
+            difficulty = int(request.get("difficulty", 1))
+            rows, cols, win_length = int(request.get("rows", 3)), int(request.get("cols", 3)), int(request.get("win_length", 3))
+            if rows < 1 or cols < 1: raise PyTacToeServerError(f"Invalid board size: {rows}x{cols}")
+            check_settings(cells=rows * cols, difficulty=difficulty)
+            arguments = dict(session_id=next(self.session_ids), mode=mode, difficulty=difficulty, rows=rows, cols=cols, win_length=win_length)
+            if rows * cols > 9: session = await asyncio.to_thread(PyTacToeServerSession, **arguments) # Keeps the loop serving the other connections
+            else: session = PyTacToeServerSession(**arguments)
+            self.sessions[session.session_id] = session
+            return session.state()
+
+        session = self.get_session(request=request)
+        async with session.lock:
+            if op == "move":
+                session.play(position=int(request["position"]) if "position" in request else -1)
+                response : dict = {}
+                if session.mode == "vs-computer" and session.result is None:
+                    try:
+                        response["computer_move"] = await self.computer_reply(session=session)
+                    except BaseException:
+                        session.game.unmake_move() # Takes the player's move back, the request failed as a whole
+                        session.game.switch_player()
+                        raise
+                response.update(session.state())
+                return response
+            if op == "state":
+                return session.state()
+            if op == "difficulty":
+                difficulty = int(request.get("difficulty", -1))
+                check_settings(cells=session.game.cell_count, difficulty=difficulty)
+                session.game.send_difficulty_selected_to_game_class(difficulty=difficulty)
+                return session.state()
+            if op == "reset":
+                session.reset()
+                return session.state()
+            if op == "close":
+                del self.sessions[session.session_id]
+                return {"session": session.session_id, "closed": True}
+        raise PyTacToeServerError(f"Unknown op: {op}")
+
+
+    async def serve(self, host : str = DEFAULT_HOST, port : int = DEFAULT_PORT) -> asyncio.Server:
+        """Starts listening and returns the asyncio server (use 'async with' / serve_forever() on it)."""
+        return await asyncio.start_server(self.handle_client, host=host, port=port, limit=MAX_LINE_BYTES)
+
+
+async def run_server(host : str, port : int, workers : int | None) -> None:
+    game_server = PyTacToeGameServer(executor=create_search_executor(workers=workers))
+    server = await game_server.serve(host=host, port=port)
+    print(f"Py-Tac-Toe game server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Asyncio TCP server hosting headless Py-Tac-Toe sessions (line-delimited JSON).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="Search worker processes (default: # of CPU cores)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_server(host=args.host, port=args.port, workers=args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
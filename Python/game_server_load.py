@@ -0,0 +1,98 @@
+"""
+This .py file is a local load generator for game_server.py.
+
+It opens --clients concurrent connections, each playing --games-per-client 'vs-computer' games with random legal user moves,
+and reports the p50/p99 latency of 'move' requests (user move + computer reply), moves/s and sessions/s.
+With --spawn-server an in-process server is started on a free port, otherwise --host/--port must point at a running server.
+
+Example:
+    python game_server_load.py --spawn-server --clients 200 --games-per-client 20 --difficulty 3
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from game_server import DEFAULT_HOST, DEFAULT_PORT, PyTacToeGameServer
+
+
+def percentile(samples : list[float], fraction : float) -> float:
+    """Returns the given percentile (0.99 -> p99) of the samples, nearest-rank method."""
+    if not samples: return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+async def request(reader : asyncio.StreamReader, writer : asyncio.StreamWriter, payload : dict) -> dict:
+    """Sends one request line and returns the decoded response, raises RuntimeError on an error response."""
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if not response.get("ok"): raise RuntimeError(response.get("error"))
+    return response
+
+
+async def run_client(host : str, port : int, games : int, difficulty : int, rows : int, cols : int, win_length : int,
+                     seed : int, latencies : list[float]) -> int:
+    """Plays games on one connection, appending each move latency (seconds) to latencies. Returns the # of sessions completed."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        state = await request(reader, writer, {"op": "create", "mode": "vs-computer", "difficulty": difficulty,
+                                               "rows": rows, "cols": cols, "win_length": win_length})
+        session = state["session"]
+        for game in range(games):
+            if game: state = await request(reader, writer, {"op": "reset", "session": session})
+            while state["result"] is None:
+                position = rng.choice([i for i, mark in enumerate(state["board"]) if mark not in ('X', 'O')])
+                start = time.perf_counter()
+                state = await request(reader, writer, {"op": "move", "session": session, "position": position})
+                latencies.append(time.perf_counter() - start)
+        await request(reader, writer, {"op": "close", "session": session})
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return games
+
+
+async def run_load(args : argparse.Namespace) -> None:
+    host, port, server = args.host, args.port, None
+    if args.spawn_server:
+        server = await PyTacToeGameServer().serve(host="127.0.0.1", port=0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    latencies : list[float] = []
+    start = time.perf_counter()
+    sessions = await asyncio.gather(*(run_client(host=host, port=port, games=args.games_per_client, difficulty=args.difficulty,
+                                                 rows=args.rows, cols=args.cols, win_length=args.win_length, seed=args.seed + client,
+                                                 latencies=latencies) for client in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    print(f"{args.clients} clients, {sum(sessions)} games, {len(latencies)} moves in {elapsed:.2f}s")
+    print(f"  move latency p50: {percentile(latencies, 0.50) * 1e3:.2f} ms  p99: {percentile(latencies, 0.99) * 1e3:.2f} ms  "
+          f"mean: {statistics.fmean(latencies) * 1e3 if latencies else 0.0:.2f} ms")
+    print(f"  {len(latencies) / elapsed:.0f} moves/s, {sum(sessions) / elapsed:.1f} sessions/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the Py-Tac-Toe game server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spawn-server", action="store_true", help="Start an in-process server on a free port instead")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent connections (one session each)")
+    parser.add_argument("--games-per-client", type=int, default=10)
+    parser.add_argument("--difficulty", type=int, default=1, help="0 Easy, 1 Medium, 2 Hard, 3 Impossible, 4 Timed search, 5 MCTS")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run_load(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,29 @@ This .py file defines the PyTacToeGameController and PyTacToePlayerStateUpdater
 The PyTacToeGameController class handles game logic that requires interaction w/the GUI, often calling methods from the PyTacToeGame class.
 This class serves as an intermediary between the internal game/state logic and the GUI.
 
+Computer moves are searched on a worker thread, the result is handed back through a queue polled w/root.after so that tkinter is only
+ever touched from the main thread. Board input is locked while the computer is thinking, and a pending search is cancelled on a reset or mode change.
+If an engine client is given, the worker thread asks that engine process (engine_worker.py) for the move instead of searching in-process.
+
 The PyTacToePlayerStateUpdater class contains methods for setting/updating the GUI components.
 
 It is not intended to invoke these classes alone, but rather to create instantiations of these class within the main GUI .py file.
 """
 
+import queue
+import threading
+import time
 import tkinter as tk # import tkinter module for calling tkinter methods
 from datetime import datetime
-from game_logic import PyTacToeGame
+from typing import Callable
+from engine_worker import PyTacToeEngineClient, PyTacToeEngineError
+from game_log import HUMAN, OUTCOME_DRAW, OUTCOME_O, OUTCOME_X, PyTacToeGameLogWriter, PyTacToeGameRecord
+from game_logic import PyTacToeGame, PyTacToeSearchCancelled, instrumentation
 from gui_layout import PyTacToeLayout
 
 X_COLOR_STR_CONST = "dark red"
 O_COLOR_STR_CONST = "black"
+SEARCH_POLL_MS_CONST = 20 # How often the main thread checks for a finished computer move
 
 class PyTacToePlayerStateUpdater:
 
@@ -41,18 +52,28 @@ class PyTacToePlayerStateUpdater:
         self.root.after(1000, self.set_entry_current_time)
 
 
-    def update_current_player_display(self) -> None:
-        """This functions updates the current player entry field on the GUI."""
+    def update_current_player_display(self, thinking : bool = False) -> None:
+        """This functions updates the current player entry field on the GUI, w/a thinking indicator while the computer searches for its move."""
         self.layout.entryfield_current_player_turn.config(state="normal")
         self.layout.entryfield_current_player_turn.delete(first=0, last=tk.END)
         
         if self.game.current_player == 'X': self.layout.entryfield_current_player_turn.config(fg=X_COLOR_STR_CONST)
         else: self.layout.entryfield_current_player_turn.config(fg=O_COLOR_STR_CONST)
         
-        self.layout.entryfield_current_player_turn.insert(index=-1, string=f"Current Player: {self.game.current_player}")
+        text = f"Current Player: {self.game.current_player}" + (" (thinking...)" if thinking else "")
+        self.layout.entryfield_current_player_turn.insert(index=-1, string=text)
         self.layout.entryfield_current_player_turn.config(state="readonly") 
 
 
+    def update_engine_stats_display(self) -> None:
+        """This functions shows the think time and engine node count of the last computer move, if the GUI was built w/the engine stats field."""
+        if self.layout.entryfield_engine_stats is None or instrumentation.last_move_seconds is None: return
+        self.layout.entryfield_engine_stats.config(state="normal")
+        self.layout.entryfield_engine_stats.delete(first=0, last=tk.END)
+        self.layout.entryfield_engine_stats.insert(index=-1, string=f"{instrumentation.last_move_seconds * 1e3:.1f} ms, {instrumentation.last_move_nodes} nodes")
+        self.layout.entryfield_engine_stats.config(state="readonly")
+
+
     def update_entry_player1(self, player1_name : str) -> None:
         """This functions updates the player1 entry field on the GUI."""
         self.layout.entryfield_player1.config(state="normal", fg = X_COLOR_STR_CONST)
@@ -77,14 +98,35 @@ class PyTacToePlayerStateUpdater:
 
 class PyTacToeGameController:
     
-    def __init__(self, game : PyTacToeGame, layout : PyTacToeLayout, state_updater : PyTacToePlayerStateUpdater, root : tk.Tk):
+    def __init__(self, game : PyTacToeGame, layout : PyTacToeLayout, state_updater : PyTacToePlayerStateUpdater, root : tk.Tk,
+                 game_log : PyTacToeGameLogWriter | None = None, engine_client : PyTacToeEngineClient | None = None):
         self.game : PyTacToeGame = game
         self.layout : PyTacToeLayout = layout
         self.state_updater : PyTacToePlayerStateUpdater = state_updater
         self.mode : str = '2-Player' # Default mode : 2-Player, updated when user selects a different mode (passed down from top-level GUI class)
         self.root : tk.Tk = root
+        self.computer_thinking : bool = False   # True while a computer move is being searched, board input is locked meanwhile
+        self.search_generation : int = 0        # Bumped on every request/cancel, results of older searches are discarded
+        self.search_stop_event : threading.Event = threading.Event()
+        self.search_lock = threading.Lock()     # One search at a time, a cancelled search releases it within ~1000 nodes
+        self.search_results : queue.Queue = queue.Queue()
+        self.on_computer_move_done : Callable[[], None] | None = None
+        self.rendered_x_bits : int = 0          # Bitboards currently drawn on the GUI board, update_gui_board() only redraws cells that differ
+        self.rendered_o_bits : int = 0
+        self.render_timing_hook : Callable[[float, int], None] | None = None # Optional, called w/(seconds, # of cells redrawn) per board update
+        self.game_log : PyTacToeGameLogWriter | None = game_log # Every finished game is appended to it, if given
+        self.engine_client : PyTacToeEngineClient | None = engine_client # Engine worker process searching the computer moves, None -> in-process
     
 
+    def cancel_computer_move(self) -> None:
+        """Cancels the pending computer move search (if any) and unlocks board input, its result will be discarded."""
+        self.search_generation += 1
+        self.search_stop_event.set()
+        if self.computer_thinking:
+            self.computer_thinking = False
+            self.state_updater.update_current_player_display()
+
+
     def check_winner_and_reset(self, player1_var : str, player2_var : str) -> bool:
         """This functions checks if there is a winner, if there is it returns True, otherwise it returns false.
         It also prints out a message to the user(s), indicating that the game is over. 
@@ -99,6 +141,7 @@ class PyTacToeGameController:
         x, y = self.root.winfo_x(), self.root.winfo_y()  
         self.root.geometry(f"+{x + 50}+{y}") # Moves the main window slightly to the right
 
+        self.log_finished_game(outcome=OUTCOME_X if winner_char == 'X' else OUTCOME_O)
         message = f"{winner} wins!"
         tk.messagebox.showinfo("Game over", message)
 
@@ -121,6 +164,7 @@ class PyTacToeGameController:
         x, y = self.root.winfo_x(), self.root.winfo_y()  
         self.root.geometry(f"+{x + 50}+{y}") # Moves the main window slightly to the right
         
+        self.log_finished_game(outcome=OUTCOME_DRAW)
         message = "It's a draw!"
         tk.messagebox.showinfo("Game over", message)
 
@@ -132,8 +176,59 @@ class PyTacToeGameController:
         return True
 
 
+    def log_finished_game(self, outcome : int) -> None:
+        """This function appends the game that just ended (moves, outcome, mode, difficulty) to the game log, if one is set."""
+        if self.game_log is None: return
+        computer_logic = self.game.computer_logic_enum.value if self.mode == "vs-computer" else HUMAN # The user always plays 'X' vs the computer
+        moves = list(self.game.move_history)
+        first_player = 'O' if moves and self.game.o_bits >> moves[0] & 1 else 'X' # 2-Player games can start w/'O'
+        self.game_log.append(PyTacToeGameRecord(moves=moves, outcome=outcome, mode=self.mode, x_logic=HUMAN, o_logic=computer_logic,
+                                                rows=self.game.rows, cols=self.game.cols, win_length=self.game.win_length, first_player=first_player))
+
+
+    def poll_computer_move(self) -> None:
+        """Main thread: applies the searched computer move once the worker thread has queued it, otherwise checks again shortly."""
+        try:
+            generation, move, error = self.search_results.get_nowait()
+        except queue.Empty:
+            if self.computer_thinking: self.root.after(SEARCH_POLL_MS_CONST, self.poll_computer_move)
+            return
+
+        if generation != self.search_generation: # Stale result of a cancelled search, keep waiting for the current one
+            self.poll_computer_move()
+            return
+        self.computer_thinking = False
+        if error is not None: # The engine process failed: report it, then search in-process from now on
+            self.engine_client = None
+            self.state_updater.update_current_player_display()
+            tk.messagebox.showerror("Engine error", f"The engine process failed, searching in-process instead.\n\n{error}")
+            self.request_computer_move(on_done=self.on_computer_move_done)
+            return
+        if move != -1 and self.game.make_move(move): self.game.switch_player()
+        self.state_updater.update_engine_stats_display()
+        if self.on_computer_move_done: self.on_computer_move_done()
+
+
+    def request_computer_move(self, on_done : Callable[[], None]) -> None:
+        """Starts searching the computer move for the current position on a worker thread and locks board input.
+        The move is applied on the main thread, then on_done is called (unless the search gets cancelled first).
+        """
+        self.cancel_computer_move()
+        self.search_stop_event = threading.Event()
+        self.on_computer_move_done = on_done
+        self.computer_thinking = True
+        self.state_updater.update_current_player_display(thinking=True)
+
+        snapshot = PyTacToeGame.from_bytes(self.game.to_bytes()) # The worker never reads the live game, which the main thread may reset
+        snapshot.rng = self.game.rng
+        snapshot.search_time_budget = self.game.search_time_budget # Not part of the snapshot format, used by timed search and the engine process
+        threading.Thread(target=self.search_computer_move, args=(snapshot, self.search_generation, self.search_stop_event), daemon=True).start()
+        self.root.after(SEARCH_POLL_MS_CONST, self.poll_computer_move)
+
+
     def reset_game(self) -> None:
         """This function is used to reset the game state and to reset the GUI."""
+        self.cancel_computer_move()
         self.game.reset_game()
         
         if self.mode == "vs-computer": self.game.current_player = 'X'
@@ -142,17 +237,74 @@ class PyTacToeGameController:
         self.state_updater.update_current_player_display()  # Reset the current player display
 
     
+    def redo_move(self) -> bool:
+        """This function replays the last undone move (in 'vs-computer' mode also the computer reply that followed it), returns False if there is nothing to redo.
+        If the computer reply isn't on the redo stack, it is the computer's turn afterwards and the caller should request its move.
+        """
+        if self.computer_thinking or self.game.redo_move() == -1: return False
+        if self.mode == "vs-computer" and self.game.current_player != 'X': self.game.redo_move()
+        self.update_gui_board()
+        self.state_updater.update_current_player_display()
+        return True
+
+
+    def search_computer_move(self, snapshot : PyTacToeGame, generation : int, stop_event : threading.Event) -> None:
+        """Worker thread: searches the snapshot position and queues (generation, move, error or None), nothing is queued if the search is cancelled.
+        Never touches tkinter, the main thread picks the result up in poll_computer_move().
+        """
+        with self.search_lock:
+            if stop_event.is_set(): return
+            try:
+                if self.engine_client is not None: move = self.engine_client.best_move(game=snapshot, stop_event=stop_event)
+                else: move = snapshot.select_computer_move(stop_event=stop_event)
+            except PyTacToeSearchCancelled:
+                return
+            except PyTacToeEngineError as error: # Worker exited or rejected the request, poll_computer_move() reports it
+                self.search_results.put((generation, -1, str(error)))
+                return
+        self.search_results.put((generation, move, None))
+
+
     def send_mode_update_to_controller_class(self, mode : str) -> None:
         """This function is used to retrieve the selected game mode upon any user changes to game mode selection.
         Valid game mode are: '2-Player' or 'vs-computer'
         """
+        self.cancel_computer_move()
         self.mode = mode
 
 
+    def undo_move(self) -> bool:
+        """This function takes back the last move (in 'vs-computer' mode the user's last move and the computer reply, so it is the user's turn again).
+        A pending computer move search is cancelled. Returns False if there is nothing to undo.
+        """
+        self.cancel_computer_move()
+        if self.game.undo_move() == -1: return False
+        if self.mode == "vs-computer" and self.game.current_player != 'X': self.game.undo_move()
+        self.update_gui_board()
+        self.state_updater.update_current_player_display()
+        return True
+
+
+    def invalidate_gui_board(self) -> None:
+        """This function forces the next update_gui_board() call to redraw every cell (e.g. after the board widgets were recreated)."""
+        self.rendered_x_bits = self.rendered_o_bits = -1 # Every bit differs from any real position
+
+
     def update_gui_board(self) -> None:
-        """This functions updates the tic-tac-toe board on the GUI, and is called after game state changes."""
-        for i, button in enumerate(self.layout.buttons):
-            button.config(text=self.game.board[i])
-            
-            if self.game.board[i] == 'X': button.config(fg=X_COLOR_STR_CONST)
-            if self.game.board[i] == 'O': button.config(fg=O_COLOR_STR_CONST)  
\ No newline at end of file
+        """This functions updates the tic-tac-toe board on the GUI, and is called after game state changes.
+        Only the cells whose mark changed since the last update are redrawn.
+        """
+        start = time.perf_counter() if self.render_timing_hook else 0.0
+        x_bits, o_bits = self.game.x_bits, self.game.o_bits
+        dirty = ((x_bits ^ self.rendered_x_bits) | (o_bits ^ self.rendered_o_bits)) & self.game.full_mask
+        redrawn = dirty.bit_count()
+        while dirty:
+            bit = dirty & -dirty # lowest dirty cell
+            dirty ^= bit
+            position = bit.bit_length() - 1
+            if x_bits & bit: self.layout.set_cell_mark(position=position, mark='X', color=X_COLOR_STR_CONST)
+            elif o_bits & bit: self.layout.set_cell_mark(position=position, mark='O', color=O_COLOR_STR_CONST)
+            else: self.layout.set_cell_mark(position=position, mark=self.game.empty_mark)
+        self.rendered_x_bits, self.rendered_o_bits = x_bits, o_bits
+
+        if self.render_timing_hook: self.render_timing_hook(time.perf_counter() - start, redrawn)
@@ -3,10 +3,16 @@ This .py file defines the GUI layout class to create the frames and layouts for
 It is not intended to invoke this alone, but rather to create an instantiation of this class within the main GUI .py file.
 """
 
+import os
 import tkinter as tk  # import tkinter module for creating GUI layout/frames components
 from tkinter import ttk, PhotoImage
 from typing import Callable
 
+ICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Py-Tac-Toe_small.png")
+
+CANVAS_BOARD_MIN_CELLS = 26 # "auto" renderer: boards larger than 5x5 are drawn on a single canvas instead of one button per cell
+CANVAS_CELL_SIZE = 32       # Canvas renderer cell size in pixels
+
 class PyTacToeLayout:
 
     def __init__(self, root: tk.Tk, width: int, height: int):
@@ -17,17 +23,23 @@ class PyTacToeLayout:
         self.height: int = height
         self.x_offset = 0
         self.y_offset = 0
-
-        try: 
-            self.icon = PhotoImage(file="Py-Tac-Toe_small.png",height=15, width=30)
-        except tk.TclError:  #If image isn't found for the app icon, then just continue on. Where icon is used need to handle except case.
-            pass
+        self.icon: PhotoImage | None = None     # Loaded on first use by load_icon(), after the first frame is drawn
+        self.icon_loaded: bool = False
+        self.icon_label: tk.Label | None = None
 
         self.main_frame = tk.Frame(self.root, padx=10, pady=10)
         self.info_frame = tk.Frame(self.main_frame)
         self.grid_frame = tk.Frame(self.main_frame)
         
 
+    def apply_icon(self) -> None:
+        """Loads the icon and sets it as the window icon and the title bar image, scheduled after the first frame by setup_main_window()."""
+        icon = self.load_icon()
+        if icon is None: return
+        self.root.iconphoto(True, icon)
+        if self.icon_label is not None: self.icon_label.config(image=icon)
+
+
     def center_window(self, window, width: int, height: int) -> None:
         """Helper function that centers a window/frame on the screen, works for modals as well."""
         window.update_idletasks()  # Ensures window size is current
@@ -48,10 +60,9 @@ class PyTacToeLayout:
         title_label = tk.Label(self.title_bar, text="Py-Tac-Toe", fg="white", bg=self.bg_color1, font=("Arial", 14))
         title_label.grid(padx=10, pady=5, row=0, column=1, sticky="w")
 
-        if self.icon:
-            # Display image on the left side of the title bar
-            image_label = tk.Label(self.title_bar, image=self.icon, bg=self.bg_color2)
-            image_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        # Image on the left side of the title bar, filled in by apply_icon() once the icon is loaded
+        self.icon_label = tk.Label(self.title_bar, bg=self.bg_color2)
+        self.icon_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
 
         # Add a close button to the title bar
         close_button = tk.Button(self.title_bar, text="X", fg="red", bg=self.bg_color1, width=2, command=self.root.quit)
@@ -65,6 +76,17 @@ class PyTacToeLayout:
         self.center_window(window=self.root, width=self.width, height=self.height)
 
 
+    def load_icon(self) -> PhotoImage | None:
+        """Returns the app icon, loading it on the first call (None if the image isn't found)."""
+        if not self.icon_loaded:
+            self.icon_loaded = True
+            try:
+                self.icon = PhotoImage(file=ICON_PATH, height=15, width=30)
+            except tk.TclError:  # If image isn't found for the app icon, then just continue on w/o it
+                self.icon = None
+        return self.icon
+
+
     def start_drag(self, event: tk.Event) -> None:
         """Start dragging the window."""
         self.x_offset = event.x
@@ -87,8 +109,7 @@ class PyTacToeLayout:
 
     def setup_main_window(self) -> None:
         """This function sets up the main TK window for the application."""
-        if hasattr(self, "icon"): 
-            self.root.iconphoto(True, self.icon)  # Important to check for attr existence, since if image not found icon attr not created
+        self.root.after_idle(self.apply_icon)  # The icon isn't needed for the first frame, load it once the window is up
         self.root.title("Py-Tac-Toe")
         self.root.geometry(f"{self.width}x{self.height}")
         self.root["bg"] = self.bg_color1
@@ -96,7 +117,9 @@ class PyTacToeLayout:
         self.create_custom_title_bar()  # Call the function to create the custom title bar
 
 
-    def setup_frames(self, modal_func: Callable[[], None], button_func: Callable[[int], None], empty_mark: str) -> None:
+    def setup_frames(self, modal_func: Callable[[], None], button_func: Callable[[int], None], empty_mark: str, rows: int = 3, cols: int = 3,
+                     renderer: str = "auto", show_engine_stats: bool = False, undo_func: Callable[[], None] | None = None,
+                     redo_func: Callable[[], None] | None = None) -> None:
         """This function sets up the grid of the TK frames and calls the method that populates the GUI components on the frames."""
         self.main_frame["bg"] = self.bg_color1
         self.info_frame["bg"] = self.bg_color1
@@ -106,15 +129,27 @@ class PyTacToeLayout:
         # Set grid for internal frames
         self.info_frame.grid(row=0, column=0, sticky="NSEW")
         self.grid_frame.grid(row=0, column=1, sticky="NSEW", padx=(20, 0), pady=(20, 0))    
-        self.populate_components_info_frame(modal_func=modal_func)  # instantiate the info frame (local method)
-        self.create_tic_tac_toe_board(button_func=button_func, empty_mark=empty_mark)
+        self.populate_components_info_frame(modal_func=modal_func, show_engine_stats=show_engine_stats, undo_func=undo_func,
+                                            redo_func=redo_func)  # instantiate the info frame (local method)
+        self.create_tic_tac_toe_board(button_func=button_func, empty_mark=empty_mark, rows=rows, cols=cols, renderer=renderer)
 
 
-    def populate_components_info_frame(self, modal_func: Callable[[], None]) -> None:
-        """This function populates the GUI components on info_frame."""
+    def populate_components_info_frame(self, modal_func: Callable[[], None], show_engine_stats: bool = False, undo_func: Callable[[], None] | None = None,
+                                       redo_func: Callable[[], None] | None = None) -> None:
+        """This function populates the GUI components on info_frame, w/the last computer move's think time and node count if show_engine_stats
+        and Undo/Redo buttons if undo_func/redo_func are given."""
         # Button to open the game mode selection modal
         select_mode_button = tk.Button(self.info_frame, text="Choose Game Mode", fg="darkred", bg=self.bg_color2, command=modal_func)
         select_mode_button.grid(row=0, column=0, sticky='w', pady=5)
+
+        # Undo/Redo buttons (optional)
+        if undo_func or redo_func:
+            history_frame = tk.Frame(self.info_frame, bg=self.bg_color1)
+            history_frame.grid(row=0, column=1, sticky='e', pady=5)
+            if undo_func:
+                tk.Button(history_frame, text="Undo", bg=self.bg_color2, width=6, command=undo_func).grid(row=0, column=0, padx=(0, 5))
+            if redo_func:
+                tk.Button(history_frame, text="Redo", bg=self.bg_color2, width=6, command=redo_func).grid(row=0, column=1)
         
         # Player 1
         self.label_player1 = tk.Label(self.info_frame, text="Player 1", bg=self.bg_color1)
@@ -155,16 +190,69 @@ class PyTacToeLayout:
         self.entryfield_current_time = tk.Entry(self.info_frame, width=25, state="readonly")
         self.entryfield_current_time.grid(row=6, column=1, pady=5)
 
+        # Last computer move think time/node count (optional, filled from game_logic.instrumentation)
+        self.entryfield_engine_stats: tk.Entry | None = None
+        if show_engine_stats:
+            self.label_engine_stats = tk.Label(self.info_frame, text="Last Computer Move", bg=self.bg_color1)
+            self.label_engine_stats.grid(row=7, column=0, sticky='w', pady=5)
+            self.entryfield_engine_stats = tk.Entry(self.info_frame, width=25, state="readonly")
+            self.entryfield_engine_stats.grid(row=7, column=1, pady=5)
+
         # Button to stop game
         self._button_stop = tk.Button(self.root, text="QUIT", fg="red", bg=self.bg_color1, command=exit, width=12)
         self._button_stop.grid(row=7, column=0, sticky='w', padx=5, pady=5)
 
 
-    def create_tic_tac_toe_board(self, button_func: Callable[[int], None], empty_mark: str) -> None:
-        """This functions creates the tic-tac-toe board on the GUI."""
+    def create_tic_tac_toe_board(self, button_func: Callable[[int], None], empty_mark: str, rows: int = 3, cols: int = 3, renderer: str = "auto") -> None:
+        """This functions creates the tic-tac-toe board on the GUI, either rows x cols buttons or a single canvas (renderer "buttons", "canvas" or
+        "auto", which picks the canvas for boards of CANVAS_BOARD_MIN_CELLS cells or more). Cells are updated through set_cell_mark().
+        """
+        if renderer == "auto": renderer = "canvas" if rows * cols >= CANVAS_BOARD_MIN_CELLS else "buttons"
+        if renderer not in ("buttons", "canvas"): raise ValueError(f"Invalid board renderer: {renderer}")
+        self.board_renderer: str = renderer
+        self.board_cols: int = cols
         self.buttons: list[tk.Button] = []
-        for i in range(9):
+        if renderer == "canvas":
+            self.create_canvas_board(button_func=button_func, empty_mark=empty_mark, rows=rows, cols=cols)
+            return
+
+        for i in range(rows * cols):
             button = tk.Button(self.grid_frame, text=empty_mark, width=10, height=4, bg=self.bg_color2,
                                font=("TkDefaultFont", 12, "bold"), command=lambda pos=i: button_func(pos))
-            button.grid(row=i // 3, column=i % 3)
-            self.buttons.append(button)
\ No newline at end of file
+            button.grid(row=i // cols, column=i % cols)
+            self.buttons.append(button)
+
+
+    def create_canvas_board(self, button_func: Callable[[int], None], empty_mark: str, rows: int, cols: int) -> None:
+        """This function creates the board as one canvas: grid lines plus one text item per cell, clicks are hit-tested to a cell index."""
+        self.board_canvas = tk.Canvas(self.grid_frame, width=cols * CANVAS_CELL_SIZE, height=rows * CANVAS_CELL_SIZE,
+                                      bg=self.bg_color2, highlightthickness=0)
+        self.board_canvas.grid(row=0, column=0)
+        for r in range(1, rows): self.board_canvas.create_line(0, r * CANVAS_CELL_SIZE, cols * CANVAS_CELL_SIZE, r * CANVAS_CELL_SIZE, fill=self.bg_color1)
+        for c in range(1, cols): self.board_canvas.create_line(c * CANVAS_CELL_SIZE, 0, c * CANVAS_CELL_SIZE, rows * CANVAS_CELL_SIZE, fill=self.bg_color1)
+
+        half = CANVAS_CELL_SIZE // 2
+        self.canvas_cell_items: list[int] = [self.board_canvas.create_text((i % cols) * CANVAS_CELL_SIZE + half, (i // cols) * CANVAS_CELL_SIZE + half,
+                                                                           text=empty_mark, font=("TkDefaultFont", 12, "bold"))
+                                             for i in range(rows * cols)]
+
+        def on_click(event: tk.Event) -> None:
+            position = self.canvas_cell_at(x=event.x, y=event.y, rows=rows, cols=cols)
+            if position != -1: button_func(position)
+        self.board_canvas.bind("<Button-1>", on_click)
+
+
+    def canvas_cell_at(self, x: int, y: int, rows: int, cols: int) -> int:
+        """Hit-tests canvas pixel coordinates to a cell index, -1 if outside the board."""
+        row, col = y // CANVAS_CELL_SIZE, x // CANVAS_CELL_SIZE
+        if not (0 <= row < rows and 0 <= col < cols): return -1
+        return row * cols + col
+
+
+    def set_cell_mark(self, position: int, mark: str, color: str | None = None) -> None:
+        """Redraws one cell of the board with the given mark (and text color, if given), for either renderer."""
+        if self.board_renderer == "canvas":
+            if color: self.board_canvas.itemconfig(self.canvas_cell_items[position], text=mark, fill=color)
+            else: self.board_canvas.itemconfig(self.canvas_cell_items[position], text=mark)
+        elif color: self.buttons[position].config(text=mark, fg=color)
+        else: self.buttons[position].config(text=mark)
\ No newline at end of file
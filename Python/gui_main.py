@@ -16,28 +16,44 @@ It is not intended to invoke this alone, but rather to create an instantiation o
 
 import tkinter as tk # import tkinter module for creating GUI
 from tkinter import ttk, messagebox
-from game_logic import PyTacToeGame
+from typing import Callable
+from game_log import DEFAULT_GAME_LOG_PATH, PyTacToeGameLogWriter
+from game_logic import PyTacToeGame, instrumentation
 from gui_layout import PyTacToeLayout
 from gui_controller import PyTacToeGameController, PyTacToePlayerStateUpdater
 
 class PyTacToeGUI(tk.Frame):
         
-    def __init__(self, root : tk.Tk, width : int, height : int):
+    def __init__(self, root : tk.Tk, width : int, height : int, rows : int = 3, cols : int = 3, win_length : int = 3, renderer : str = "auto",
+                 game_log_path : str | None = DEFAULT_GAME_LOG_PATH, show_engine_stats : bool = False, engine_process : bool = False):
         super().__init__(root)
         self.root : tk.Tk = root
         self.width : int = width
         self.height : int = height
-        self.game = PyTacToeGame()
+        self.game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
         self.layout = PyTacToeLayout(root=self.root, width=self.width, height=self.height)
         self.state_updater = PyTacToePlayerStateUpdater(game=self.game, layout=self.layout, root=self.root)
-        self.game_controller = PyTacToeGameController(game = self.game, layout=self.layout, state_updater=self.state_updater, root=self.root)
+        self.game_log = PyTacToeGameLogWriter(path=game_log_path) if game_log_path else None # Finished games are appended here (None -> no log)
+        self.engine_client = None # Engine worker process for the computer moves (engine_process=True), it exits w/the GUI
+        if engine_process:
+            from engine_worker import PyTacToeEngineClient
+            self.engine_client = PyTacToeEngineClient()
+        self.game_controller = PyTacToeGameController(game = self.game, layout=self.layout, state_updater=self.state_updater, root=self.root,
+                                                      game_log=self.game_log, engine_client=self.engine_client)
         self.difficulty_var = tk.IntVar(value=1)            # Default difficulty : Medium (Options: Easy, Medium, Difficult, Impossible)
         self.mode_var = tk.StringVar(value='2-Player')      # Default mode : 2-Player
         self.player1_var = tk.StringVar(value='Player 1')   # Default name for player 1
         self.player2_var = tk.StringVar(value='Player 2')   # Default name for player 2
+        self.modals : dict[str, tk.Toplevel] = {}           # Modal windows by name, built on first use and hidden/shown after that
+        self.modal_hidden : dict[str, tk.BooleanVar] = {}   # Set to True when the modal is hidden, show_modal() waits on it
     
         self.layout.setup_main_window()
-        self.layout.setup_frames(modal_func=self.open_game_mode_modal, button_func=self.handle_button_click, empty_mark=self.game.empty_mark)
+        self.layout.setup_frames(modal_func=self.open_game_mode_modal, button_func=self.handle_button_click, empty_mark=self.game.empty_mark,
+                                 rows=self.game.rows, cols=self.game.cols, renderer=renderer, show_engine_stats=show_engine_stats,
+                                 undo_func=self.handle_undo, redo_func=self.handle_redo)
+        self.root.bind("<Control-z>", lambda event: self.handle_undo())
+        self.root.bind("<Control-y>", lambda event: self.handle_redo())
+        if show_engine_stats: instrumentation.enable() # Times every computer move, shown in the info frame
         self.initialize_components()
     
 
@@ -48,32 +64,61 @@ class PyTacToeGUI(tk.Frame):
         self.open_game_mode_modal()
         
 
-    def open_game_mode_modal(self):
-        """This function creates a modal window that is used to capture game mode (2-player or vs-computer)."""
-        modal_window = tk.Toplevel(self.root)
-        modal_window.title("Select Game Mode")
-        modal_window.geometry("300x150")
-        self.layout.center_window(window=modal_window, width=300, height=150)
+    def build_modal(self, name : str, title : str, width : int, height : int, populate : Callable[[tk.Toplevel], None]) -> tk.Toplevel:
+        """This function returns the modal window called name, building it w/populate() on first use. Modals are hidden rather than destroyed,
+        so every later open just shows the existing window again."""
+        modal_window = self.modals.get(name)
+        if modal_window is None:
+            modal_window = self.modals[name] = tk.Toplevel(self.root)
+            modal_window.withdraw() # Stays hidden until show_modal()
+            modal_window.title(title)
+            modal_window.geometry(f"{width}x{height}")
+            modal_window.protocol("WM_DELETE_WINDOW", lambda: self.hide_modal(name=name)) # Closing the window only hides it
+            self.modal_hidden[name] = tk.BooleanVar(value=True)
+            populate(modal_window)
+        return modal_window
+
+
+    def show_modal(self, name : str, width : int, height : int) -> None:
+        """This function shows a modal built by build_modal() and waits until it is hidden again."""
+        modal_window = self.modals[name]
+        self.layout.center_window(window=modal_window, width=width, height=height)
+        modal_window.deiconify()
+        modal_window.grab_set()  # Make this window modal
+        self.modal_hidden[name].set(False)
+        self.root.wait_variable(self.modal_hidden[name])  # Wait for the modal to be hidden
 
-        ttk.Label(modal_window, text="Choose Game Mode:").pack(pady=10)
 
-        # Radio buttons for game mode selection
-        ttk.Radiobutton(modal_window, text="2-Player", variable=self.mode_var, value="2-Player").pack(anchor='w')
-        ttk.Radiobutton(modal_window, text="Vs Computer", variable=self.mode_var, value="vs-computer").pack(anchor='w')
+    def hide_modal(self, name : str) -> None:
+        """This function hides a modal and releases its grab, ending the wait in show_modal()."""
+        modal_window = self.modals[name]
+        modal_window.grab_release()
+        modal_window.withdraw()
+        self.modal_hidden[name].set(True)
 
-        # Button to confirm selection
-        confirm_button = ttk.Button(master=modal_window, text="Confirm", command=lambda: self.confirm_game_mode_selection(modal_window))
-        confirm_button.pack(pady=10)
 
-        modal_window.grab_set()  # Make this window modal
-        self.root.wait_window(modal_window)  # Wait for the modal to close
+    def open_game_mode_modal(self):
+        """This function opens the modal window that is used to capture game mode (2-player or vs-computer)."""
+        def populate(modal_window : tk.Toplevel) -> None:
+            ttk.Label(modal_window, text="Choose Game Mode:").pack(pady=10)
+
+            # Radio buttons for game mode selection
+            ttk.Radiobutton(modal_window, text="2-Player", variable=self.mode_var, value="2-Player").pack(anchor='w')
+            ttk.Radiobutton(modal_window, text="Vs Computer", variable=self.mode_var, value="vs-computer").pack(anchor='w')
+
+            # Button to confirm selection
+            confirm_button = ttk.Button(master=modal_window, text="Confirm", command=self.confirm_game_mode_selection)
+            confirm_button.pack(pady=10)
+
+        self.build_modal(name="game_mode", title="Select Game Mode", width=300, height=150, populate=populate)
+        self.show_modal(name="game_mode", width=300, height=150)
         self.game_controller.reset_game() # After each call, reset the game state
 
 
-    def confirm_game_mode_selection(self, modal_window):
+    def confirm_game_mode_selection(self):
         selected_mode: str = self.mode_var.get()
         messagebox.showinfo("Game Mode Selected", f"You selected: {selected_mode}")
-        modal_window.destroy()  # Close the modal window
+        self.hide_modal(name="game_mode")  # Close the modal window
         
         if selected_mode == "vs-computer":
             self.player1_var.set(value="User")
@@ -92,50 +137,68 @@ class PyTacToeGUI(tk.Frame):
 
 
     def open_get_player_names_modal(self) -> None:
-        """This functions creates a modal window that is used to get player names."""
-        modal_window = tk.Toplevel(self.root)
-        modal_window.title("Enter Player Names")
-        modal_window.geometry("300x150")
-        self.layout.center_window(window=modal_window, width=300, height=150)
-
-        ttk.Label(modal_window, text="Enter Player Names:").pack(pady=10)
-        ttk.Entry(modal_window, text='Player1 Name', textvariable=self.player1_var).pack(anchor='w')
-        ttk.Entry(modal_window, text='Player2 Name', textvariable=self.player2_var).pack(anchor='w')
+        """This functions opens the modal window that is used to get player names."""
+        def populate(modal_window : tk.Toplevel) -> None:
+            ttk.Label(modal_window, text="Enter Player Names:").pack(pady=10)
+            ttk.Entry(modal_window, text='Player1 Name', textvariable=self.player1_var).pack(anchor='w')
+            ttk.Entry(modal_window, text='Player2 Name', textvariable=self.player2_var).pack(anchor='w')
 
-        # Button to confirm selection
-        confirm_button = ttk.Button(master=modal_window, text="Confirm", command=modal_window.destroy)
-        confirm_button.pack(pady=10)
+            # Button to confirm selection
+            confirm_button = ttk.Button(master=modal_window, text="Confirm", command=lambda: self.hide_modal(name="player_names"))
+            confirm_button.pack(pady=10)
 
-        modal_window.grab_set()  # Make this window modal
-        self.root.wait_window(modal_window)  # Wait for the modal to close    
+        self.build_modal(name="player_names", title="Enter Player Names", width=300, height=150, populate=populate)
+        self.show_modal(name="player_names", width=300, height=150)
 
 
     def open_difficulty_selection_modal(self):
-        """This function creates a modal window that is used to capture difficulty selection is the user is playing against the computer."""
-        modal_window = tk.Toplevel(self.root)
-        modal_window.title("Choose Difficulty")
-        modal_window.geometry("300x175")
-        self.layout.center_window(window=modal_window, width=300, height=175)
-
-        ttk.Label(modal_window, text="Choose Difficulty:").pack(pady=10)
-
-        # Radio buttons for game mode selection
-        ttk.Radiobutton(modal_window, text="Easy", variable=self.difficulty_var , value=0).pack(anchor='w')
-        ttk.Radiobutton(modal_window, text="Medium", variable=self.difficulty_var , value=1).pack(anchor='w')
-        ttk.Radiobutton(modal_window, text="Hard", variable=self.difficulty_var , value=2).pack(anchor='w')
-        ttk.Radiobutton(modal_window, text="Impossible", variable=self.difficulty_var , value=3).pack(anchor='w')
-
-        # Button to confirm selection
-        confirm_button = ttk.Button(master=modal_window, text="Confirm", command=modal_window.destroy)
-        
-        confirm_button.pack(pady=10)
+        """This function opens the modal window that is used to capture difficulty selection is the user is playing against the computer."""
+        def populate(modal_window : tk.Toplevel) -> None:
+            ttk.Label(modal_window, text="Choose Difficulty:").pack(pady=10)
 
-        modal_window.grab_set()  # Make this window modal
-        self.root.wait_window(modal_window)  # Wait for the modal to close
+            # Radio buttons for game mode selection
+            ttk.Radiobutton(modal_window, text="Easy", variable=self.difficulty_var , value=0).pack(anchor='w')
+            ttk.Radiobutton(modal_window, text="Medium", variable=self.difficulty_var , value=1).pack(anchor='w')
+            ttk.Radiobutton(modal_window, text="Hard", variable=self.difficulty_var , value=2).pack(anchor='w')
+            ttk.Radiobutton(modal_window, text="Impossible", variable=self.difficulty_var , value=3).pack(anchor='w')
+            ttk.Radiobutton(modal_window, text="Timed Search (large boards)", variable=self.difficulty_var , value=4).pack(anchor='w')
+            ttk.Radiobutton(modal_window, text="Monte Carlo (large boards)", variable=self.difficulty_var , value=5).pack(anchor='w')
+
+            # Button to confirm selection
+            confirm_button = ttk.Button(master=modal_window, text="Confirm", command=lambda: self.hide_modal(name="difficulty"))
+            confirm_button.pack(pady=10)
+
+        self.build_modal(name="difficulty", title="Choose Difficulty", width=300, height=225, populate=populate)
+        self.show_modal(name="difficulty", width=300, height=225)
+
+
+    def finish_computer_move(self) -> None:
+        """This function is called by the controller once the computer move (searched off the main thread) has been played."""
+        self.game_controller.update_gui_board()
+        p1_var = self.player1_var.get()
+        p2_var = self.player2_var.get()
+
+        if self.game_controller.check_winner_and_reset(player1_var=p1_var, player2_var=p2_var) or self.game_controller.check_tie_and_reset():
+            return  # Exit early if the game has ended
+        self.state_updater.update_current_player_display()
+
+
+    def handle_redo(self) -> None:
+        """This function is used to handle the Redo button/Ctrl+Y, the computer is asked for its move if its reply wasn't undone as well."""
+        if not self.game_controller.redo_move(): return
+        if self.mode_var.get() == "vs-computer" and self.game.current_player != 'X':
+            self.game_controller.request_computer_move(on_done=self.finish_computer_move)
+
+
+    def handle_undo(self) -> None:
+        """This function is used to handle the Undo button/Ctrl+Z."""
+        self.game_controller.undo_move()
 
 
     def handle_button_click(self, position : int) -> None:
         """This function is used to handle button presses on the tic-tac-toe grid."""
+        if self.game_controller.computer_thinking: return  # Board input is locked while the computer searches for its move
+
         if self.game.make_move(position):
             self.game.switch_player()
             self.game_controller.update_gui_board()
@@ -145,10 +208,9 @@ class PyTacToeGUI(tk.Frame):
             if self.game_controller.check_winner_and_reset(player1_var=p1_var, player2_var=p2_var) or self.game_controller.check_tie_and_reset():
                 return  # Exit early if the game has ended
 
-            # Only make a computer move if the mode is set to 'vs-computer'
+            # Only make a computer move if the mode is set to 'vs-computer', it is searched on a worker thread so the window stays responsive
             if self.mode_var.get() == "vs-computer":
-                self.game.computer_move()
-                self.game_controller.update_gui_board()
-                self.game_controller.check_winner_and_reset(player1_var=self.player1_var.get(), player2_var=self.player2_var.get())
+                self.game_controller.request_computer_move(on_done=self.finish_computer_move)
+                return
             
             self.state_updater.update_current_player_display()
\ No newline at end of file
@@ -4,14 +4,21 @@ This calls the constructor for the PyTacToeGUI class, which handles creating the
 
 It terms of gameplay behavior, the project as implemented, will always have the user go first before the computer does in 'vs-computer' mode.
 In '2-Player' mode, the person who lost the previous game will start the next game.  As a default, upon initiatilization, the 'X' user starts.
+
+With --engine-process the computer moves are searched by a separate engine worker process (engine_worker.py) instead of the GUI process.
 """
 
+import argparse
 import tkinter as tk # import tkinter module for creating GUI
 from gui_main import PyTacToeGUI
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Py-Tac-Toe")
+    parser.add_argument("--engine-process", action="store_true", help="Search computer moves in a separate engine worker process")
+    args = parser.parse_args()
+
     root = tk.Tk() # create self.root window
-    PyTacToeGUI(root, width=660, height=345)
+    PyTacToeGUI(root, width=660, height=345, engine_process=args.engine_process)
     root.mainloop() # execute tkinter 
 
 
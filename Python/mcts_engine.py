@@ -0,0 +1,271 @@
+"""
+This .py file defines the PyTacToeMCTSEngine class, a Monte Carlo Tree Search used by PyTacToeGame for the MCTS logic.
+
+Each iteration selects a path down the tree w/UCT (UCB1 applied to trees), expands one new node, plays a uniformly random game from it
+(the RANDOM logic, sped up by shuffling the empty cells once) and backs the result up the path. The move played is the most visited root move.
+The search runs for a fixed # of iterations or a time budget. With workers > 1 the search is root-parallel: every worker process grows
+its own tree from the same position w/a different seed and the root visit counts are summed, so playouts scale w/the # of cores.
+
+Unlike the minimax engines it needs no evaluation function and no full search, so it plays any board size / k-in-a-row.
+It is not intended to invoke this alone, but rather to use it through the PyTacToeGame class.
+"""
+
+import math
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+from minimax_engine import PARALLEL_POLL_SECONDS, PyTacToeSearchCancelled
+
+DEFAULT_EXPLORATION : float = math.sqrt(2) # UCT exploration constant
+DEFAULT_WORKERS : int = 1                   # Processes per search (1 -> search in-process)
+TIME_CHECK_INTERVAL : int = 64              # Iterations between deadline/stop event checks
+
+RESULT_DRAW : int = 0
+RESULT_X : int = 1
+RESULT_O : int = 2
+
+if TYPE_CHECKING: from concurrent.futures import ProcessPoolExecutor # Imported on first use, keeps the engine quick to import
+
+
+class PyTacToeMCTSNode:
+
+    __slots__ = ("move", "parent", "children", "untried", "visits", "wins", "mover_is_x", "result")
+
+    def __init__(self, move : int, parent : "PyTacToeMCTSNode | None", mover_is_x : bool, untried : list[int], result : int | None):
+        self.move : int = move                              # Move that led to this node (-1 for the root)
+        self.parent : PyTacToeMCTSNode | None = parent
+        self.children : list[PyTacToeMCTSNode] = []
+        self.untried : list[int] = untried                  # Moves not expanded yet, popped from the end (shuffled)
+        self.visits : int = 0
+        self.wins : float = 0.0                             # From the perspective of the player who made self.move, draws count 1/2
+        self.mover_is_x : bool = mover_is_x
+        self.result : int | None = result                   # RESULT_* if the game is over at this node, else None
+
+
+class PyTacToeMCTSEngine:
+
+    def __init__(self, rows : int, cols : int, winning_masks : tuple[int, ...], exploration : float = DEFAULT_EXPLORATION,
+                 workers : int = DEFAULT_WORKERS, iterations : int | None = None, seed : int | None = None):
+        self.rows : int = rows
+        self.cols : int = cols
+        self.cell_count : int = rows * cols
+        self.full_mask : int = (1 << self.cell_count) - 1
+        self.winning_masks : tuple[int, ...] = tuple(winning_masks)
+        self.cell_line_masks : tuple[tuple[int, ...], ...] = tuple(tuple(mask for mask in self.winning_masks if mask >> cell & 1) for cell in range(self.cell_count))
+        self.exploration : float = exploration
+        self.workers : int = workers                # Root-parallel worker processes, 1 searches in-process
+        if iterations is not None and iterations < 1: raise ValueError(f"MCTS iterations must be >= 1 (or None to use the time budget), got {iterations}")
+        self.iterations : int | None = iterations   # Fixed # of iterations per move (split over the workers), None -> use the time budget
+        self.rng = random.Random(seed)
+        self.playouts : int = 0                     # Playouts of the most recent search (summed over the workers)
+        self.total_playouts : int = 0               # Playouts of every search run by this engine
+        self.playouts_per_second : float = 0.0
+
+
+    def best_move(self, x_bits : int, o_bits : int, x_to_move : bool, time_budget : float, stop_event : threading.Event | None = None) -> int:
+        """Searches the position for time_budget seconds (or self.iterations iterations) and returns the most visited move, -1 if the game is over.
+        A move that wins on the spot is played without searching. Raises PyTacToeSearchCancelled if stop_event gets set during the search.
+        Raises ValueError if self.iterations is set but < 1 (it can be changed after construction, e.g. by tournament.py).
+        """
+        if self.iterations is not None and self.iterations < 1: raise ValueError(f"MCTS iterations must be >= 1 (or None to use the time budget), got {self.iterations}")
+        empty = self.full_mask & ~(x_bits | o_bits)
+        if not empty or self.winner(x_bits=x_bits, o_bits=o_bits) is not None: return -1
+        own = x_bits if x_to_move else o_bits
+        for cell in range(self.cell_count):
+            if empty >> cell & 1 and self.completes_line(bits=own | 1 << cell, cell=cell): return cell
+
+        start = time.perf_counter()
+        if self.workers > 1:
+            visits = self.search_parallel(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move, time_budget=time_budget, stop_event=stop_event)
+        else:
+            visits, self.playouts = self.search(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move, iterations=self.iterations,
+                                                time_budget=time_budget, stop_event=stop_event)
+        elapsed = time.perf_counter() - start
+        self.playouts_per_second = self.playouts / elapsed if elapsed > 0 else 0.0
+        self.total_playouts += self.playouts
+        return max(visits, key=lambda move: (visits[move], -move))
+
+
+    def completes_line(self, bits : int, cell : int) -> bool:
+        """Returns True if bits hold a complete line through cell."""
+        for mask in self.cell_line_masks[cell]:
+            if bits & mask == mask: return True
+        return False
+
+
+    def rollout(self, x_bits : int, o_bits : int, x_to_move : bool) -> int:
+        """Plays uniformly random moves until the game ends and returns its RESULT_*."""
+        cells = [cell for cell in range(self.cell_count) if not (x_bits | o_bits) >> cell & 1]
+        self.rng.shuffle(cells) # Playing the shuffled cells in order is the same as picking a random empty cell every move
+        for cell in cells:
+            if x_to_move:
+                x_bits |= 1 << cell
+                if self.completes_line(bits=x_bits, cell=cell): return RESULT_X
+            else:
+                o_bits |= 1 << cell
+                if self.completes_line(bits=o_bits, cell=cell): return RESULT_O
+            x_to_move = not x_to_move
+        return RESULT_DRAW
+
+
+    def search(self, x_bits : int, o_bits : int, x_to_move : bool, iterations : int | None, time_budget : float,
+               stop_event : threading.Event | None = None) -> tuple[dict[int, int], int]:
+        """Grows one tree from the position, returns ({root move: visits}, # of playouts).
+        Stops after iterations iterations if given, otherwise when time_budget runs out. Raises PyTacToeSearchCancelled if stop_event gets set.
+        """
+        deadline = time.perf_counter() + time_budget
+        root = PyTacToeMCTSNode(move=-1, parent=None, mover_is_x=not x_to_move, untried=self.shuffled_moves(x_bits=x_bits, o_bits=o_bits), result=None)
+        log_table : list[float] = [0.0] # log(visits), grown as needed
+        playouts = 0
+
+        while iterations is None or playouts < iterations:
+            if playouts and not playouts % TIME_CHECK_INTERVAL:
+                if stop_event is not None and stop_event.is_set(): raise PyTacToeSearchCancelled()
+                if iterations is None and time.perf_counter() > deadline: break
+            node = root
+            x, o = x_bits, o_bits
+
+            # Selection: descend through fully expanded nodes by UCT
+            while not node.untried and node.children and node.result is None:
+                if node.visits >= len(log_table): log_table.extend(math.log(n) for n in range(len(log_table), node.visits * 2 + 1))
+                scale = self.exploration * math.sqrt(log_table[node.visits])
+                node = max(node.children, key=lambda child: child.wins / child.visits + scale / math.sqrt(child.visits))
+                if node.mover_is_x: x |= 1 << node.move
+                else: o |= 1 << node.move
+
+            # Expansion: add one child for an untried move
+            if node.result is None and node.untried:
+                move = node.untried.pop()
+                mover_is_x = not node.mover_is_x
+                if mover_is_x: x |= 1 << move
+                else: o |= 1 << move
+                if self.completes_line(bits=x if mover_is_x else o, cell=move): result = RESULT_X if mover_is_x else RESULT_O
+                elif (x | o) == self.full_mask: result = RESULT_DRAW
+                else: result = None
+                child = PyTacToeMCTSNode(move=move, parent=node, mover_is_x=mover_is_x,
+                                         untried=self.shuffled_moves(x_bits=x, o_bits=o) if result is None else [], result=result)
+                node.children.append(child)
+                node = child
+
+            # Simulation: random playout from the new node, unless the game already ended there
+            result = node.result if node.result is not None else self.rollout(x_bits=x, o_bits=o, x_to_move=not node.mover_is_x)
+            playouts += 1
+
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                if result == RESULT_DRAW: node.wins += 0.5
+                elif (result == RESULT_X) == node.mover_is_x: node.wins += 1.0
+                node = node.parent
+
+        return {child.move: child.visits for child in root.children}, playouts
+
+
+    def search_parallel(self, x_bits : int, o_bits : int, x_to_move : bool, time_budget : float,
+                        stop_event : threading.Event | None = None) -> dict[int, int]:
+        """Root parallelism: every worker grows its own tree w/its own seed, the root visit counts are summed.
+        stop_event is polled while the workers search, once it is set the workers are stopped and PyTacToeSearchCancelled is raised.
+        """
+        iterations = -(-self.iterations // self.workers) if self.iterations is not None else None
+        jobs = [(self.rows, self.cols, self.winning_masks, self.exploration, x_bits, o_bits, x_to_move, iterations, time_budget, self.rng.getrandbits(32))
+                for _ in range(self.workers)]
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+        with _rollout_pool_lock: # One parallel search at a time, the workers share one stop flag
+            pool, shared_stop = get_rollout_pool(workers=self.workers)
+            shared_stop.stopped.value = 0
+            futures = [pool.submit(run_root_search, job) for job in jobs]
+            try:
+                pending = set(futures)
+                while pending:
+                    if stop_event is not None and stop_event.is_set(): raise PyTacToeSearchCancelled()
+                    _, pending = wait(pending, timeout=PARALLEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                results = [future.result() for future in futures]
+            except BaseException:
+                shared_stop.stopped.value = 1 # Stops the workers still searching, their results are discarded
+                for future in futures: future.cancel()
+                wait(futures)
+                raise
+
+        visits : dict[int, int] = {}
+        self.playouts = 0
+        for worker_visits, playouts in results:
+            for move, count in worker_visits.items(): visits[move] = visits.get(move, 0) + count
+            self.playouts += playouts
+        return visits
+
+
+    def shuffled_moves(self, x_bits : int, o_bits : int) -> list[int]:
+        """Returns the empty cells in random order (the expansion order of a new node)."""
+        moves = [cell for cell in range(self.cell_count) if not (x_bits | o_bits) >> cell & 1]
+        self.rng.shuffle(moves)
+        return moves
+
+
+    def winner(self, x_bits : int, o_bits : int) -> int | None:
+        """Returns RESULT_X or RESULT_O if that side has a complete line, else None."""
+        for mask in self.winning_masks:
+            if x_bits & mask == mask: return RESULT_X
+            if o_bits & mask == mask: return RESULT_O
+        return None
+
+
+def run_root_search(job : tuple) -> tuple[dict[int, int], int]:
+    """Pool entry point: one root-parallel tree search.
+    job = (rows, cols, winning masks, exploration, x_bits, o_bits, x to move, iterations or None, time budget, seed)
+    """
+    rows, cols, winning_masks, exploration, x_bits, o_bits, x_to_move, iterations, time_budget, seed = job
+    engine = PyTacToeMCTSEngine(rows=rows, cols=cols, winning_masks=winning_masks, exploration=exploration, seed=seed)
+    try:
+        return engine.search(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move, iterations=iterations, time_budget=time_budget,
+                             stop_event=_worker_stop)
+    except PyTacToeSearchCancelled:
+        return {}, 0 # Discarded by the parent
+
+
+class PyTacToeSharedStop:
+    """Stop flag of a parallel search, in multiprocessing shared memory. It stands in for the stop_event of the workers' searches (is_set())."""
+
+    def __init__(self, context):
+        self.stopped = context.Value("b", 0, lock=False)
+
+
+    def is_set(self) -> bool:
+        return bool(self.stopped.value)
+
+
+_worker_stop : PyTacToeSharedStop | None = None # Set in every worker process of the rollout pool
+
+def init_rollout_worker(shared_stop : PyTacToeSharedStop) -> None:
+    global _worker_stop
+    _worker_stop = shared_stop
+
+
+_rollout_pools : dict[int, tuple["ProcessPoolExecutor", PyTacToeSharedStop]] = {}
+_rollout_pool_lock = threading.Lock()
+
+def get_rollout_pool(workers : int) -> tuple["ProcessPoolExecutor", PyTacToeSharedStop]:
+    """Returns the process pool (and its stop flag) shared by the parallel searches w/the given # of workers, started on first use.
+    Workers are spawned rather than forked, searches may be started from the GUI's worker thread or the game server.
+    """
+    entry = _rollout_pools.get(workers)
+    if entry is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        context = multiprocessing.get_context("spawn")
+        shared_stop = PyTacToeSharedStop(context=context)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_rollout_worker, initargs=(shared_stop,))
+        entry = _rollout_pools[workers] = (pool, shared_stop)
+    return entry
+
+
+_shared_engines : dict[tuple, PyTacToeMCTSEngine] = {}
+
+def get_shared_mcts_engine(rows : int, cols : int, winning_masks : tuple[int, ...]) -> PyTacToeMCTSEngine:
+    """Returns the engine shared by every game w/this geometry, configure its workers/iterations/exploration there."""
+    key = (rows, cols, tuple(winning_masks))
+    engine = _shared_engines.get(key)
+    if engine is None:
+        engine = _shared_engines[key] = PyTacToeMCTSEngine(rows=rows, cols=cols, winning_masks=winning_masks)
+    return engine
@@ -0,0 +1,554 @@
+"""
+This .py file defines the PyTacToeMinimaxEngine class, the alpha-beta game tree search used by PyTacToeGame for MINIMAX_WIN_IMPOSSIBLE.
+It also defines the PyTacToeTranspositionTable class, a bounded (least recently used eviction) cache of searched positions.
+best_move_timed() is the depth-limited, iterative deepening variant used by ITERATIVE_DEEPENING on boards too large to search to the end.
+With workers > 1 best_move() splits the root moves over a process pool (search_root_parallel()), returning the same move and value as the serial search.
+
+Positions are keyed on their canonical form under the board symmetries (8 for square boards, 4 otherwise), so rotated/mirrored
+positions share one table entry. Engines are shared per board geometry through get_shared_minimax_engine(), which lets the table
+persist across moves and games within one process. An engine keeps the state of the running search (stop event, deadline, node counts) and its
+unsynchronized table on itself, so best_move() and best_move_timed() hold the engine's search_lock: threads sharing an engine take turns.
+
+It is not intended to invoke this alone, but rather to use it through the PyTacToeGame class.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+DEFAULT_TT_SIZE : int = 1 << 18 # Default max # of transposition table entries
+
+WIN : int = 1   # Search values are from the perspective of the side to move (negamax), same scale as the existing minimax (+1/0/-1)
+DRAW : int = 0
+LOSS : int = -1
+
+EXACT : int = 0        # Transposition table entry flags
+LOWER_BOUND : int = 1
+UPPER_BOUND : int = 2
+
+STOP_CHECK_MASK : int = 0x3FF # The stop event is polled every 1024 nodes
+TIME_CHECK_MASK : int = 0x3F  # The timed search checks its deadline (and the stop event) every 64 nodes, its nodes cost more (line evaluation)
+
+PARALLEL_MIN_EMPTY : int = 8    # Root-split searches only pay off w/at least this many empty cells, smaller searches stay in-process
+PARALLEL_POLL_SECONDS : float = 0.02 # How often the parent checks its stop_event while the workers search
+
+HEURISTIC_WIN_SCORE : int = 1 << 40 # Timed search scores: a win found p plies ahead scores HEURISTIC_WIN_SCORE - p, open lines score far below
+SCORE_INFINITY : int = HEURISTIC_WIN_SCORE * 2
+
+
+class PyTacToeSearchCancelled(Exception):
+    """Raised out of a search when its stop_event is set, the transposition table keeps only fully searched entries."""
+
+
+class PyTacToeSearchTimeout(PyTacToeSearchCancelled):
+    """Raised inside best_move_timed() when the time budget runs out, best_move_timed() catches it and returns the best move so far."""
+
+
+if TYPE_CHECKING: from concurrent.futures import ProcessPoolExecutor # Imported on first use, keeps the engine quick to import
+
+
+class PyTacToeSharedSearchState:
+    """Bounds shared by the worker processes of a root-split search, in multiprocessing shared memory:
+    the best exact root value found so far (alpha), the search order index of the move that has it, and a stop flag.
+    It stands in for the stop_event of the workers' engines (is_set()), so a cancelled search stops within ~1000 nodes in every worker.
+    """
+
+    def __init__(self, context):
+        self.lock = context.Lock()
+        self.alpha = context.Value("i", LOSS, lock=False)
+        self.best_index = context.Value("i", 0, lock=False)
+        self.stopped = context.Value("b", 0, lock=False)
+
+
+    def is_set(self) -> bool:
+        return bool(self.stopped.value)
+
+
+    def record(self, index : int, value : int) -> None:
+        """Records the exact value of the root move at index, if it beats the best so far (ties go to the earlier move, like the serial search)."""
+        with self.lock:
+            if value > self.alpha.value or (value == self.alpha.value and index < self.best_index.value):
+                self.alpha.value = value
+                self.best_index.value = index
+
+
+    def reset(self) -> None:
+        """Prepares the state for a new search."""
+        self.alpha.value = LOSS - 1
+        self.best_index.value = 0
+        self.stopped.value = 0
+
+
+    def window_alpha(self, index : int) -> int | None:
+        """Returns the alpha to search the root move at index w/, None if it can't become the best move anymore.
+        Moves after the current best only need to beat it, moves before it must also tie it to take its place.
+        """
+        with self.lock:
+            alpha, best_index = self.alpha.value, self.best_index.value
+        if index > best_index: return alpha if alpha < WIN else None
+        return alpha - 1
+
+
+def build_board_symmetries(rows : int, cols : int) -> list[tuple[int, ...]]:
+    """Returns the cell permutations (perm[cell] -> mapped cell) of the board symmetries.
+    Square boards have 8 (rotations and reflections), rectangular boards have 4 (identity, both flips and the 180 degree rotation).
+    The identity permutation is always first.
+    """
+    def index(r : int, c : int) -> int: return r * cols + c
+
+    transforms = [
+        lambda r, c: (r, c),                            # identity
+        lambda r, c: (r, cols - 1 - c),                 # horizontal flip
+        lambda r, c: (rows - 1 - r, c),                 # vertical flip
+        lambda r, c: (rows - 1 - r, cols - 1 - c),      # 180 degree rotation
+    ]
+    if rows == cols:
+        transforms += [
+            lambda r, c: (c, r),                        # main diagonal reflection
+            lambda r, c: (c, rows - 1 - r),             # 90 degree rotation
+            lambda r, c: (cols - 1 - c, r),             # 270 degree rotation
+            lambda r, c: (cols - 1 - c, rows - 1 - r),  # anti-diagonal reflection
+        ]
+    return [tuple(index(*transform(i // cols, i % cols)) for i in range(rows * cols)) for transform in transforms]
+
+
+class PyTacToeTranspositionTable:
+
+    def __init__(self, max_entries : int = DEFAULT_TT_SIZE):
+        self.max_entries : int = max_entries
+        self.entries : OrderedDict[int, tuple[int, int, int]] = OrderedDict() # key -> (value, flag, canonical best move)
+        self.hits : int = 0
+        self.misses : int = 0
+        self.evictions : int = 0
+
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+    def clear(self) -> None:
+        """Removes every entry and resets the hit/miss/eviction counters."""
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+    def lookup(self, key : int) -> tuple[int, int, int] | None:
+        """Returns the entry stored for key (marking it as most recently used), or None if there isn't one."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+
+    def resize(self, max_entries : int) -> None:
+        """Changes the max # of entries, evicting the least recently used entries if the table is now over capacity."""
+        self.max_entries = max_entries
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+    def store(self, key : int, entry : tuple[int, int, int]) -> None:
+        """Stores entry for key, evicting the least recently used entry once the table is full."""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+class PyTacToeMinimaxEngine:
+
+    def __init__(self, rows : int, cols : int, winning_masks : tuple[int, ...], tt_size : int = DEFAULT_TT_SIZE):
+        self.rows : int = rows
+        self.cols : int = cols
+        self.cell_count : int = rows * cols
+        self.full_mask : int = (1 << self.cell_count) - 1
+        self.winning_masks : tuple[int, ...] = tuple(winning_masks)
+        self.cell_line_masks : tuple[tuple[int, ...], ...] = tuple(tuple(mask for mask in self.winning_masks if mask >> cell & 1) for cell in range(self.cell_count))
+        self.transposition_table = PyTacToeTranspositionTable(max_entries=tt_size)
+        self.nodes_visited : int = 0        # Nodes visited by the most recent search
+        self.total_nodes_visited : int = 0  # Nodes visited by every search run by this engine
+        self.stop_event : threading.Event | None = None # Set by best_move() for the duration of a cancellable search
+        self.deadline : float | None = None             # time.perf_counter() deadline of the running timed search
+        self.limited_table : dict[int, tuple[int, int, int, int]] = {} # Timed search entries (depth, score, flag, canonical move), per search
+        self.iteration_best : tuple[int, int] | None = None # (move, score) of the best root move of the running iteration
+        self.completed_depth : int = 0                  # Deepest iteration completed by the most recent timed search
+        self.workers : int = 1                          # Processes for best_move(), > 1 splits the root moves over a process pool
+        self.search_lock = threading.RLock()            # Held by best_move()/best_move_timed(), re-entrant as a timed search of a finished game calls best_move()
+
+        # Timed search static evaluation: a line holding only one side's marks is worth 10^(marks - 1) to that side
+        win_length = self.winning_masks[0].bit_count() if self.winning_masks else 1
+        self.line_weights : tuple[int, ...] = tuple(0 if marks == 0 else 10 ** (marks - 1) for marks in range(win_length + 1))
+
+        # Static move ordering: cells on the most winning lines first (center, then corners, then sides on 3x3), ties by index
+        self.move_order : tuple[int, ...] = tuple(sorted(range(self.cell_count), key=lambda cell: (-self.count_lines_through(cell), cell)))
+
+        # Symmetry permutations, applied to the combined key (own bits | opp bits << cell_count) a byte at a time via lookup tables
+        self.symmetries : list[tuple[int, ...]] = build_board_symmetries(rows=rows, cols=cols)
+        self.inverse_symmetries : list[tuple[int, ...]] = [tuple(perm.index(cell) for cell in range(self.cell_count)) for perm in self.symmetries]
+        self.symmetry_byte_tables : list[list[list[int]]] = [self.build_byte_tables(perm=perm) for perm in self.symmetries]
+
+
+    def best_move(self, x_bits : int, o_bits : int, x_to_move : bool, stop_event : threading.Event | None = None) -> tuple[int, int]:
+        """Searches the given position and returns (best move, game value from X's perspective: +1 X wins, 0 draw, -1 O wins).
+        The best move is the first move (in search order) achieving the game value, or -1 if the position is already terminal.
+        Raises PyTacToeSearchCancelled if stop_event gets set during the search (e.g. from the GUI thread).
+        """
+        with self.search_lock: # Per-search state lives on the engine, searches of one engine run one at a time
+            self.nodes_visited = 0
+            self.stop_event = stop_event
+            own, opp = (x_bits, o_bits) if x_to_move else (o_bits, x_bits)
+            try:
+                if self.workers > 1 and (self.full_mask & ~(own | opp)).bit_count() >= PARALLEL_MIN_EMPTY:
+                    move, value = self.search_root_parallel(own=own, opp=opp)
+                else:
+                    move, value = self.search_root(own=own, opp=opp)
+            finally:
+                self.stop_event = None
+                self.total_nodes_visited += self.nodes_visited
+            return move, value if x_to_move else -value
+
+
+    def best_move_timed(self, x_bits : int, o_bits : int, x_to_move : bool, time_budget : float,
+                        stop_event : threading.Event | None = None) -> tuple[int, int]:
+        """Iterative deepening alpha-beta search w/a hard time budget (seconds), for boards too large to search to the end.
+        Searches depth 1, 2, ... w/the open-line evaluation at the horizon, until the budget runs out, the game is solved or the board fills up.
+        Returns (best move of the deepest completed iteration, its score from X's perspective), a move is always returned for a non-terminal position.
+        Raises PyTacToeSearchCancelled if stop_event gets set, self.completed_depth holds the deepest completed iteration.
+        """
+        with self.search_lock:
+            self.nodes_visited = 0
+            self.completed_depth = 0
+            own, opp = (x_bits, o_bits) if x_to_move else (o_bits, x_bits)
+            empty = self.full_mask & ~(own | opp)
+            if self.has_line(own) or self.has_line(opp) or not empty:
+                _, value = self.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move)
+                return -1, value * HEURISTIC_WIN_SCORE
+
+            root_moves = self.ordered_moves(empty=empty)
+            best_move, best_score = root_moves[0], 0
+            self.stop_event = stop_event
+            self.deadline = time.perf_counter() + time_budget
+            self.limited_table = {}
+            try:
+                for depth in range(1, empty.bit_count() + 1):
+                    self.iteration_best = None
+                    best_move, best_score = self.search_root_limited(own=own, opp=opp, moves=root_moves, depth=depth)
+                    self.completed_depth = depth
+                    root_moves.remove(best_move)
+                    root_moves.insert(0, best_move) # Principal variation first in the next iteration
+                    if abs(best_score) >= HEURISTIC_WIN_SCORE - self.cell_count: break # Forced win/loss found, deeper won't change it
+            except PyTacToeSearchTimeout:
+                # The unfinished iteration searched the previous best move first, a move that beat it at the new depth is better still
+                if self.iteration_best is not None and (self.completed_depth == 0 or self.iteration_best[0] != best_move):
+                    best_move, best_score = self.iteration_best
+            finally:
+                self.stop_event = None
+                self.deadline = None
+                self.limited_table = {}
+                self.total_nodes_visited += self.nodes_visited
+            return best_move, best_score if x_to_move else -best_score
+
+
+    def build_byte_tables(self, perm : tuple[int, ...]) -> list[list[int]]:
+        """Builds the per-byte lookup tables that apply a cell permutation to a combined (own | opp << cell_count) key."""
+        key_perm = perm + tuple(cell + self.cell_count for cell in perm) # Same permutation applied to both halves of the key
+        tables : list[list[int]] = []
+        for shift in range(0, len(key_perm), 8):
+            table : list[int] = []
+            for byte in range(256):
+                mapped = 0
+                for bit in range(8):
+                    if byte >> bit & 1 and shift + bit < len(key_perm): mapped |= 1 << key_perm[shift + bit]
+                table.append(mapped)
+            tables.append(table)
+        return tables
+
+
+    def canonical_key(self, own : int, opp : int) -> tuple[int, int]:
+        """Returns (canonical key, index of the symmetry that produced it) for a position, the key is the smallest over all symmetries."""
+        key = own | opp << self.cell_count
+        best_key = -1
+        best_symmetry = 0
+        for symmetry, tables in enumerate(self.symmetry_byte_tables):
+            mapped = 0
+            remaining = key
+            for table in tables:
+                mapped |= table[remaining & 0xFF]
+                remaining >>= 8
+            if best_key < 0 or mapped < best_key:
+                best_key = mapped
+                best_symmetry = symmetry
+        return best_key, best_symmetry
+
+
+    def count_lines_through(self, cell : int) -> int:
+        """Returns the # of winning lines that pass through the given cell."""
+        return sum(1 for mask in self.winning_masks if mask >> cell & 1)
+
+
+    def evaluate(self, x_bits : int, o_bits : int, x_to_move : bool) -> int:
+        """Returns the game value of the given position from X's perspective (+1 X wins, 0 draw, -1 O wins)."""
+        return self.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move)[1]
+
+
+    def evaluate_lines(self, own : int, opp : int) -> int:
+        """Static evaluation for the side to move (own): open lines (only one side's marks) count for that side, weighted by their # of marks."""
+        weights = self.line_weights
+        score = 0
+        for mask in self.winning_masks:
+            own_line = own & mask
+            opp_line = opp & mask
+            if own_line:
+                if not opp_line: score += weights[own_line.bit_count()]
+            elif opp_line: score -= weights[opp_line.bit_count()]
+        return score
+
+
+    def has_line(self, bits : int) -> bool:
+        """Returns True if the given bitboard completes any of the winning lines."""
+        for mask in self.winning_masks:
+            if bits & mask == mask: return True
+        return False
+
+
+    def negamax(self, own : int, opp : int, last_move : int, alpha : int, beta : int) -> int:
+        """Fail-soft alpha-beta negamax, returns the value of the position for the side to move (own).
+        last_move is the cell the opponent just played, only the lines through it can have been completed.
+        """
+        self.nodes_visited += 1
+        if not self.nodes_visited & STOP_CHECK_MASK and self.stop_event is not None and self.stop_event.is_set():
+            raise PyTacToeSearchCancelled()
+        for mask in self.cell_line_masks[last_move]:
+            if opp & mask == mask: return LOSS # The previous move completed a line
+        empty = self.full_mask & ~(own | opp)
+        if not empty: return DRAW
+
+        key, symmetry = self.canonical_key(own=own, opp=opp)
+        entry = self.transposition_table.lookup(key)
+        tt_move = -1
+        if entry is not None:
+            value, flag, canonical_move = entry
+            if flag == EXACT: return value
+            if flag == LOWER_BOUND: alpha = max(alpha, value)
+            else: beta = min(beta, value)
+            if alpha >= beta: return value
+            tt_move = self.inverse_symmetries[symmetry][canonical_move]
+
+        alpha_orig = alpha
+        best_value = LOSS - 1
+        best_move = -1
+        for move in self.ordered_moves(empty=empty, first_move=tt_move):
+            value = -self.negamax(own=opp, opp=own | (1 << move), last_move=move, alpha=-beta, beta=-alpha)
+            if value > best_value:
+                best_value = value
+                best_move = move
+                if value > alpha: alpha = value
+                if alpha >= beta: break
+
+        if best_value <= alpha_orig: flag = UPPER_BOUND
+        elif best_value >= beta: flag = LOWER_BOUND
+        else: flag = EXACT
+        self.transposition_table.store(key, (best_value, flag, self.symmetries[symmetry][best_move]))
+        return best_value
+
+
+    def negamax_limited(self, own : int, opp : int, last_move : int, depth : int, ply : int, alpha : int, beta : int) -> int:
+        """Depth-limited fail-soft alpha-beta negamax for best_move_timed(), returns the score for the side to move (own).
+        Positions at the horizon (depth 0) get the open-line evaluation, wins are scored HEURISTIC_WIN_SCORE - ply.
+        """
+        self.nodes_visited += 1
+        if not self.nodes_visited & TIME_CHECK_MASK:
+            if self.stop_event is not None and self.stop_event.is_set(): raise PyTacToeSearchCancelled()
+            if time.perf_counter() > self.deadline: raise PyTacToeSearchTimeout()
+        for mask in self.cell_line_masks[last_move]:
+            if opp & mask == mask: return ply - HEURISTIC_WIN_SCORE # The previous move completed a line
+        empty = self.full_mask & ~(own | opp)
+        if not empty: return 0
+        if depth == 0: return self.evaluate_lines(own=own, opp=opp)
+
+        # Identical positions always sit at the same ply below the root (same # of marks), so win scores can be shared through the table
+        key, symmetry = self.canonical_key(own=own, opp=opp)
+        entry = self.limited_table.get(key)
+        tt_move = -1
+        if entry is not None:
+            entry_depth, score, flag, canonical_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT: return score
+                if flag == LOWER_BOUND: alpha = max(alpha, score)
+                else: beta = min(beta, score)
+                if alpha >= beta: return score
+            tt_move = self.inverse_symmetries[symmetry][canonical_move]
+
+        alpha_orig = alpha
+        best_score = -SCORE_INFINITY
+        best_move = -1
+        for move in self.ordered_moves(empty=empty, first_move=tt_move):
+            score = -self.negamax_limited(own=opp, opp=own | (1 << move), last_move=move, depth=depth - 1, ply=ply + 1, alpha=-beta, beta=-alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha: alpha = score
+                if alpha >= beta: break
+
+        if best_score <= alpha_orig: flag = UPPER_BOUND
+        elif best_score >= beta: flag = LOWER_BOUND
+        else: flag = EXACT
+        self.limited_table[key] = (depth, best_score, flag, self.symmetries[symmetry][best_move])
+        return best_score
+
+
+    def ordered_moves(self, empty : int, first_move : int = -1) -> list[int]:
+        """Returns the empty cells in search order, with first_move (e.g. the transposition table move) tried first if given."""
+        moves = [cell for cell in self.move_order if empty >> cell & 1 and cell != first_move]
+        if first_move >= 0: moves.insert(0, first_move)
+        return moves
+
+
+    def search_root(self, own : int, opp : int) -> tuple[int, int]:
+        """Searches the root position with a full window, returns (best move, value for the side to move)."""
+        self.nodes_visited += 1
+        if self.has_line(own): return -1, WIN
+        if self.has_line(opp): return -1, LOSS
+        empty = self.full_mask & ~(own | opp)
+        if not empty: return -1, DRAW
+
+        alpha = LOSS
+        best_value = LOSS - 1
+        best_move = -1
+        for move in self.ordered_moves(empty=empty):
+            value = -self.negamax(own=opp, opp=own | (1 << move), last_move=move, alpha=-WIN, beta=-alpha)
+            if value > best_value:
+                best_value = value
+                best_move = move
+                if value > alpha: alpha = value
+                if value >= WIN: break # Can't do better than a win
+        return best_move, best_value
+
+
+    def search_root_parallel(self, own : int, opp : int) -> tuple[int, int]:
+        """Root-split search_root(): every root move is searched by a worker process, each w/its own shared engine and transposition table.
+        Workers search w/the window (best exact value so far, WIN) like the serial search, widened by one for moves ordered before the
+        current best so a tie still counts, so every move that could be the best gets its exact value. Moves after a winning move are skipped. The best move is then picked exactly like the serial search does
+        (the first move in search order w/the highest value), so the result doesn't depend on the # of workers or their timing.
+        """
+        self.nodes_visited += 1
+        if self.has_line(own): return -1, WIN
+        if self.has_line(opp): return -1, LOSS
+        moves = self.ordered_moves(empty=self.full_mask & ~(own | opp))
+        if not moves: return -1, DRAW
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+        with _search_pool_lock: # One root-split search at a time, the workers share one set of bounds
+            pool, shared = get_search_pool(workers=self.workers)
+            shared.reset()
+            jobs = [(self.rows, self.cols, self.winning_masks, own, opp, move, index) for index, move in enumerate(moves)]
+            futures = [pool.submit(run_root_move, jobs[0])]
+            try:
+                # The first (best ordered) move is searched alone, its value bounds the windows of the others (young brothers wait)
+                for batch in (futures[:1], None):
+                    if batch is None:
+                        batch = [pool.submit(run_root_move, job) for job in jobs[1:]]
+                        futures.extend(batch)
+                    pending = set(batch)
+                    while pending:
+                        if self.stop_event is not None and self.stop_event.is_set(): raise PyTacToeSearchCancelled()
+                        _, pending = wait(pending, timeout=PARALLEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                results = [future.result() for future in futures]
+            except BaseException:
+                shared.stopped.value = 1 # Stops the workers still searching, their results are discarded
+                for future in futures: future.cancel()
+                wait(futures)
+                raise
+
+        best_move, best_value = -1, LOSS - 1
+        for move, (value, exact, nodes) in zip(moves, results):
+            self.nodes_visited += nodes
+            if exact and value > best_value: best_move, best_value = move, value
+        return best_move, best_value
+
+
+    def search_root_limited(self, own : int, opp : int, moves : list[int], depth : int) -> tuple[int, int]:
+        """Searches the root moves (in the given order) to depth, returns (best move, score for the side to move)."""
+        alpha = -SCORE_INFINITY
+        best_score = -SCORE_INFINITY
+        best_move = -1
+        for move in moves:
+            score = -self.negamax_limited(own=opp, opp=own | (1 << move), last_move=move, depth=depth - 1, ply=1, alpha=-SCORE_INFINITY, beta=-alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                self.iteration_best = (move, score)
+                if score > alpha: alpha = score
+        return best_move, best_score
+
+
+def run_root_move(job : tuple) -> tuple[int, bool, int]:
+    """Pool entry point: searches one root move of a root-split search in this worker's shared engine.
+    job = (rows, cols, winning masks, own bits, opp bits, root move, index of the move in search order)
+    Returns (value of the move for the side to move at the root, True if the value is exact, nodes visited), (LOSS - 1, False, 0) if skipped.
+    """
+    rows, cols, winning_masks, own, opp, move, index = job
+    shared = _worker_search_state
+    alpha = shared.window_alpha(index=index)
+    if alpha is None or shared.is_set(): return LOSS - 1, False, 0 # An earlier move already wins
+
+    engine = get_shared_minimax_engine(rows=rows, cols=cols, winning_masks=winning_masks)
+    engine.nodes_visited = 0
+    engine.stop_event = shared
+    try:
+        value = -engine.negamax(own=opp, opp=own | (1 << move), last_move=move, alpha=-WIN, beta=-alpha)
+    except PyTacToeSearchCancelled:
+        return LOSS - 1, False, engine.nodes_visited
+    finally:
+        engine.stop_event = None
+    exact = value > alpha # Values up to alpha are only upper bounds, those moves can't be the best
+    if exact: shared.record(index=index, value=value)
+    return value, exact, engine.nodes_visited
+
+
+_worker_search_state : PyTacToeSharedSearchState | None = None # Set in every worker process of the search pool
+
+def init_search_worker(shared : PyTacToeSharedSearchState) -> None:
+    global _worker_search_state
+    _worker_search_state = shared
+
+
+_search_pools : dict[int, tuple["ProcessPoolExecutor", PyTacToeSharedSearchState]] = {}
+_search_pool_lock = threading.Lock()
+
+def get_search_pool(workers : int) -> tuple["ProcessPoolExecutor", PyTacToeSharedSearchState]:
+    """Returns the process pool (and its shared bounds) used by root-split searches w/the given # of workers, started on first use.
+    Workers are spawned rather than forked, searches may be started from the GUI's worker thread or the game server.
+    The workers keep their engines (and transposition tables) across searches.
+    """
+    entry = _search_pools.get(workers)
+    if entry is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        context = multiprocessing.get_context("spawn")
+        shared = PyTacToeSharedSearchState(context=context)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_search_worker, initargs=(shared,))
+        entry = _search_pools[workers] = (pool, shared)
+    return entry
+
+
+_shared_engines : dict[tuple, PyTacToeMinimaxEngine] = {}
+
+def get_shared_minimax_engine(rows : int, cols : int, winning_masks : tuple[int, ...], tt_size : int | None = None) -> PyTacToeMinimaxEngine:
+    """Returns the process-wide engine for the given board geometry, creating it on first use.
+    Sharing the engine keeps its transposition table warm across moves and games. If tt_size is given the table is resized to it.
+    """
+    geometry = (rows, cols, tuple(winning_masks))
+    engine = _shared_engines.get(geometry)
+    if engine is None:
+        engine = PyTacToeMinimaxEngine(rows=rows, cols=cols, winning_masks=winning_masks, tt_size=tt_size or DEFAULT_TT_SIZE)
+        _shared_engines[geometry] = engine
+    elif tt_size is not None:
+        with engine.search_lock: engine.transposition_table.resize(max_entries=tt_size)
+    return engine
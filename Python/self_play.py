@@ -0,0 +1,175 @@
+"""
+This .py file is a headless entry point (no tkinter) that plays games between two PyTacToeGameComputerLogic strategies.
+
+Games are split into jobs and spread over a process pool. Each job seeds its own RNG from the base seed and its job index,
+so a run is reproducible regardless of the # of worker processes. Results are aggregated into win/draw/loss counts (from the
+perspective of strategy A), a histogram of game lengths and timing figures.
+
+Example:
+    python self_play.py --games 1000000 --strategy-a HEURISTIC_DIFFICULT --strategy-b RANDOM --alternate
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+from game_log import OUTCOME_DRAW, OUTCOME_O, OUTCOME_X, PyTacToeGameLogWriter, PyTacToeGameRecord
+from game_logic import PyTacToeGame, PyTacToeGameComputerLogic
+
+DEFAULT_JOB_SIZE : int = 1000 # Games per job submitted to the pool
+
+
+def parse_logic(name : str) -> PyTacToeGameComputerLogic:
+    """Parses a strategy given by enum name (case-insensitive) or value, e.g. 'RANDOM', 'minimax_win_impossible' or '3'."""
+    if name.isdigit(): return PyTacToeGameComputerLogic(int(name))
+    try:
+        return PyTacToeGameComputerLogic[name.upper()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"Unknown strategy '{name}', choose from: {', '.join(logic.name for logic in PyTacToeGameComputerLogic)}")
+
+
+def play_headless_game(game : PyTacToeGame, x_logic : PyTacToeGameComputerLogic, o_logic : PyTacToeGameComputerLogic) -> tuple[str | None, int]:
+    """Plays one game from the empty board with 'X' moving first, returns (winning mark or None for a draw, # of moves played)."""
+    game.reset_game()
+    game.current_player = 'X'
+    moves : int = 0
+    while True:
+        game.computer_logic_enum = x_logic if game.current_player == 'X' else o_logic
+        game.computer_move()
+        moves += 1
+        winner = game.check_winner()
+        if winner: return winner, moves
+        if game.check_tie(): return None, moves
+
+
+class PyTacToeSelfPlayResult:
+
+    def __init__(self):
+        self.games : int = 0
+        self.wins : int = 0                             # Counts are from the perspective of strategy A
+        self.draws : int = 0
+        self.losses : int = 0
+        self.wins_by_side : Counter = Counter()         # Side ('X'/'O') strategy A played when it won
+        self.length_histogram : Counter = Counter()     # # of moves -> # of games
+        self.cpu_seconds : float = 0.0                  # CPU time of the worker processes (process_time), summed over jobs
+        self.wall_seconds : float = 0.0
+        self.log_data = bytearray()                     # Encoded game log records of the games, only filled when logging (not merged)
+
+
+    def merge(self, other : "PyTacToeSelfPlayResult") -> None:
+        """Adds the counts and timings of another (partial) result into this one."""
+        self.games += other.games
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        self.wins_by_side.update(other.wins_by_side)
+        self.length_histogram.update(other.length_histogram)
+        self.cpu_seconds += other.cpu_seconds
+
+
+    def to_dict(self) -> dict:
+        """Returns the result as a JSON serializable dict."""
+        return {
+            "games": self.games, "wins": self.wins, "draws": self.draws, "losses": self.losses,
+            "wins_by_side": dict(self.wins_by_side),
+            "length_histogram": {str(length): count for length, count in sorted(self.length_histogram.items())},
+            "cpu_seconds": self.cpu_seconds, "wall_seconds": self.wall_seconds,
+            "games_per_second": self.games / self.wall_seconds if self.wall_seconds else 0.0,
+        }
+
+
+def run_job(job : tuple) -> PyTacToeSelfPlayResult:
+    """Worker entry point: plays one job's worth of games and returns its partial result.
+    job = (# of games, index of the job's first game, seed, strategy A, strategy B, alternate sides, rows, cols, win length, log games)
+    """
+    games, first_game, seed, logic_a, logic_b, alternate, rows, cols, win_length, log_games = job
+    start = time.process_time()
+    game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+    game.rng = random.Random(seed)
+    result = PyTacToeSelfPlayResult()
+
+    for game_index in range(first_game, first_game + games):
+        a_side = 'O' if alternate and game_index % 2 else 'X'
+        x_logic, o_logic = (logic_a, logic_b) if a_side == 'X' else (logic_b, logic_a)
+        winner, moves = play_headless_game(game=game, x_logic=x_logic, o_logic=o_logic)
+
+        if log_games:
+            result.log_data += PyTacToeGameRecord(moves=list(game.move_history), outcome={'X': OUTCOME_X, 'O': OUTCOME_O, None: OUTCOME_DRAW}[winner],
+                                                  mode='self-play', x_logic=x_logic.value, o_logic=o_logic.value,
+                                                  rows=rows, cols=cols, win_length=win_length).encode()
+
+        result.games += 1
+        result.length_histogram[moves] += 1
+        if winner is None: result.draws += 1
+        elif winner == a_side:
+            result.wins += 1
+            result.wins_by_side[a_side] += 1
+        else: result.losses += 1
+
+    result.cpu_seconds = time.process_time() - start
+    return result
+
+
+def run_self_play(games : int, logic_a : PyTacToeGameComputerLogic, logic_b : PyTacToeGameComputerLogic, workers : int | None = None,
+                  seed : int = 0, alternate : bool = False, rows : int = 3, cols : int = 3, win_length : int = 3,
+                  job_size : int = DEFAULT_JOB_SIZE, log_path : str | None = None) -> PyTacToeSelfPlayResult:
+    """Plays games between strategy A and strategy B over a process pool (workers=1 runs in-process) and returns the aggregated result.
+    If log_path is given every game is appended to that binary game log (see game_log.py), in job completion order.
+    """
+    jobs = [(min(job_size, games - first), first, seed * 1_000_003 + index, logic_a, logic_b, alternate, rows, cols, win_length, log_path is not None)
+            for index, first in enumerate(range(0, games, job_size))]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    result = PyTacToeSelfPlayResult()
+    game_log = PyTacToeGameLogWriter(path=log_path) if log_path else None
+
+    def collect(partial : PyTacToeSelfPlayResult) -> None:
+        if game_log is not None: game_log.append_encoded(data=partial.log_data, count=partial.games)
+        result.merge(partial)
+
+    if workers == 1:
+        for job in jobs: collect(run_job(job))
+    else:
+        with Pool(processes=workers) as pool:
+            for partial in pool.imap_unordered(run_job, jobs): collect(partial)
+    if game_log is not None: game_log.close()
+
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless self-play between two Py-Tac-Toe computer strategies.")
+    parser.add_argument("--games", type=int, default=10000, help="# of games to play")
+    parser.add_argument("--strategy-a", type=parse_logic, default=PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT, help="Strategy A (plays 'X' unless --alternate)")
+    parser.add_argument("--strategy-b", type=parse_logic, default=PyTacToeGameComputerLogic.RANDOM, help="Strategy B")
+    parser.add_argument("--alternate", action="store_true", help="Alternate which strategy plays 'X' (moves first) every game")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: # of CPU cores)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed, each job derives its own RNG seed from it")
+    parser.add_argument("--job-size", type=int, default=DEFAULT_JOB_SIZE, help="Games per job submitted to the pool")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the result as JSON to this file")
+    parser.add_argument("--log", dest="log_path", default=None, help="Append every game to this binary game log")
+    args = parser.parse_args()
+
+    result = run_self_play(games=args.games, logic_a=args.strategy_a, logic_b=args.strategy_b, workers=args.workers, seed=args.seed,
+                           alternate=args.alternate, rows=args.rows, cols=args.cols, win_length=args.win_length, job_size=args.job_size,
+                           log_path=args.log_path)
+    summary = result.to_dict()
+
+    print(f"{args.strategy_a.name} vs {args.strategy_b.name}: {result.games} games on a {args.rows}x{args.cols} board ({args.win_length} in a row)")
+    print(f"  A wins: {result.wins}  draws: {result.draws}  A losses: {result.losses}  (A wins by side: {dict(result.wins_by_side)})")
+    print(f"  Game lengths: {summary['length_histogram']}")
+    print(f"  {result.wall_seconds:.2f}s wall, {result.cpu_seconds:.2f}s worker CPU, {summary['games_per_second']:.0f} games/s")
+
+    if args.json_path:
+        with open(args.json_path, "w") as file: json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+This .py file defines the PyTacToeSolvedTable class, a precomputed table of every reachable 3x3 position, and the builder that generates it.
+
+Each position is stored as one 16-bit record at a perfect index (the base-3 number formed by the cells: 0 empty, 1 X, 2 O):
+    bits 0-8    mask of the optimal moves for the side to move
+    bits 9-10   game value (0 unreachable, 1 O wins, 2 draw, 3 X wins)
+    bits 11-14  move chosen by the HEURISTIC_DIFFICULT logic (15 if none)
+The file is loaded through mmap, so probing it during play is an O(1) read with no search.
+
+Run this file directly to regenerate or verify the table:
+    python solved_table.py build        # enumerate all reachable positions and write solved_3x3.bin
+    python solved_table.py verify       # check every record against the exhaustive minimax and the heuristic logic
+"""
+
+import mmap
+import os
+import struct
+
+SOLVED_TABLE_PATH : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solved_3x3.bin")
+
+HEADER_FORMAT : str = "<4sBBBBI" # magic, version, rows, cols, win length, record count
+HEADER_SIZE : int = struct.calcsize(HEADER_FORMAT)
+MAGIC : bytes = b"PTTS"
+VERSION : int = 1
+CELL_COUNT : int = 9
+RECORD_COUNT : int = 3 ** CELL_COUNT
+
+VALUE_SHIFT : int = 9
+HEURISTIC_SHIFT : int = 11
+NO_MOVE : int = 15
+VALUE_TO_CODE : dict[int, int] = {-1: 1, 0: 2, 1: 3}
+CODE_TO_VALUE : dict[int, int] = {1: -1, 2: 0, 3: 1}
+
+TERNARY_WEIGHTS : tuple[int, ...] = tuple(sum(3 ** i for i in range(CELL_COUNT) if bits >> i & 1) for bits in range(1 << CELL_COUNT))
+
+
+def position_index(x_bits : int, o_bits : int) -> int:
+    """Returns the perfect index of a 3x3 position, the base-3 number with digit 1 for X cells and 2 for O cells."""
+    return TERNARY_WEIGHTS[x_bits] + 2 * TERNARY_WEIGHTS[o_bits]
+
+
+class PyTacToeSolvedTable:
+
+    def __init__(self, path : str = SOLVED_TABLE_PATH):
+        self.path : str = path
+        with open(path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, rows, cols, win_length, record_count = struct.unpack_from(HEADER_FORMAT, self.mmap, 0)
+        if magic != MAGIC or version != VERSION or (rows, cols, win_length, record_count) != (3, 3, 3, RECORD_COUNT):
+            self.mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} 3x3 solved table.")
+        self.records = memoryview(self.mmap)[HEADER_SIZE:HEADER_SIZE + 2 * RECORD_COUNT].cast("H") if _NATIVE_LITTLE_ENDIAN else None
+
+
+    def best_moves(self, x_bits : int, o_bits : int) -> int:
+        """Returns the mask of the optimal moves for the side to move in the given position (0 if terminal or unreachable)."""
+        return self.record(x_bits=x_bits, o_bits=o_bits) & 0x1FF
+
+
+    def close(self) -> None:
+        """Releases the memory map."""
+        if self.records is not None: self.records.release()
+        self.mmap.close()
+
+
+    def heuristic_move(self, x_bits : int, o_bits : int) -> int:
+        """Returns the move the HEURISTIC_DIFFICULT logic makes in the given position, or -1 if there is none."""
+        move = self.record(x_bits=x_bits, o_bits=o_bits) >> HEURISTIC_SHIFT & 0xF
+        return -1 if move == NO_MOVE else move
+
+
+    def record(self, x_bits : int, o_bits : int) -> int:
+        """Returns the raw 16-bit record stored for the given position."""
+        index = position_index(x_bits=x_bits, o_bits=o_bits)
+        if self.records is not None: return self.records[index]
+        return struct.unpack_from("<H", self.mmap, HEADER_SIZE + 2 * index)[0]
+
+
+    def value(self, x_bits : int, o_bits : int) -> int | None:
+        """Returns the game value of the given position from X's perspective (+1 X wins, 0 draw, -1 O wins), or None if unreachable."""
+        return CODE_TO_VALUE.get(self.record(x_bits=x_bits, o_bits=o_bits) >> VALUE_SHIFT & 0x3)
+
+
+_NATIVE_LITTLE_ENDIAN : bool = struct.pack("=H", 1) == struct.pack("<H", 1) # memoryview.cast reads native order, the file is little-endian
+
+_shared_tables : dict[str, PyTacToeSolvedTable | None] = {}
+
+def load_shared_solved_table(path : str = SOLVED_TABLE_PATH) -> PyTacToeSolvedTable | None:
+    """Returns the process-wide solved table for path (mapped on first use), or None if the file is missing or invalid."""
+    if path not in _shared_tables:
+        try:
+            _shared_tables[path] = PyTacToeSolvedTable(path=path)
+        except (OSError, ValueError):
+            _shared_tables[path] = None
+    return _shared_tables[path]
+
+
+def enumerate_positions(game) -> dict[tuple[int, int], int]:
+    """Enumerates every reachable position from the empty board, returns {(x_bits, o_bits): game value from X's perspective}."""
+    values : dict[tuple[int, int], int] = {}
+
+    def solve(x_bits : int, o_bits : int, x_to_move : bool) -> int:
+        if (x_bits, o_bits) in values: return values[(x_bits, o_bits)]
+        value = game.minimax_evaluate_bits(x_bits=x_bits, o_bits=o_bits)
+        if value is None:
+            empty = game.full_mask & ~(x_bits | o_bits)
+            if x_to_move: value = max(solve(x_bits | 1 << pos, o_bits, False) for pos in range(CELL_COUNT) if empty >> pos & 1)
+            else: value = min(solve(x_bits, o_bits | 1 << pos, True) for pos in range(CELL_COUNT) if empty >> pos & 1)
+        values[(x_bits, o_bits)] = value
+        return value
+
+    solve(0, 0, True)
+    return values
+
+
+def build_records(game) -> list[int]:
+    """Builds the record list for every index of the table, using the given PyTacToeGame for the rules and the heuristic logic."""
+    from game_logic import PyTacToeGameComputerLogic
+
+    values = enumerate_positions(game=game)
+    records : list[int] = [0] * RECORD_COUNT
+    saved_state = (game.x_bits, game.o_bits, game.current_player, game.computer_logic_enum)
+    game.computer_logic_enum = PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT
+
+    for (x_bits, o_bits), value in values.items():
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        best_mask = 0
+        heuristic = NO_MOVE
+        if game.minimax_evaluate_bits(x_bits=x_bits, o_bits=o_bits) is None:
+            empty = game.full_mask & ~(x_bits | o_bits)
+            for pos in range(CELL_COUNT):
+                if not empty >> pos & 1: continue
+                child = (x_bits | 1 << pos, o_bits) if x_to_move else (x_bits, o_bits | 1 << pos)
+                if values[child] == value: best_mask |= 1 << pos
+
+            game.x_bits, game.o_bits = x_bits, o_bits
+            game.current_player = 'X' if x_to_move else 'O'
+            heuristic = game.computer_move_heuristic_logic(empty_positions=game.get_empty_positions())
+        records[position_index(x_bits=x_bits, o_bits=o_bits)] = best_mask | VALUE_TO_CODE[value] << VALUE_SHIFT | heuristic << HEURISTIC_SHIFT
+
+    game.x_bits, game.o_bits, game.current_player, game.computer_logic_enum = saved_state
+    return records
+
+
+def write_table(records : list[int], path : str = SOLVED_TABLE_PATH) -> None:
+    """Writes the header and records to path (replacing it atomically)."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, 3, 3, 3, RECORD_COUNT))
+        file.write(struct.pack(f"<{RECORD_COUNT}H", *records))
+    os.replace(temp_path, path)
+
+
+def verify_table(table : PyTacToeSolvedTable, game) -> int:
+    """Checks every reachable position of the table against the exhaustive minimax (return_move_minimax_logic) and the heuristic logic.
+    Returns the # of positions checked, raises ValueError on the first mismatch.
+    """
+    from game_logic import PyTacToeGameComputerLogic
+
+    values = enumerate_positions(game=game)
+    game.computer_logic_enum = PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT
+    for (x_bits, o_bits) in values:
+        game.x_bits, game.o_bits = x_bits, o_bits
+        board = game.board
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        value = game.return_move_minimax_logic(board=board, is_maximizing=x_to_move)
+        if table.value(x_bits=x_bits, o_bits=o_bits) != value:
+            raise ValueError(f"Value mismatch for {board}: table {table.value(x_bits=x_bits, o_bits=o_bits)}, minimax {value}")
+        if game.minimax_evaluate_bits(x_bits=x_bits, o_bits=o_bits) is not None: continue
+
+        mark = 'X' if x_to_move else 'O'
+        for pos in game.get_empty_positions():
+            board[pos] = mark
+            is_best = game.return_move_minimax_logic(board=board, is_maximizing=not x_to_move) == value
+            board[pos] = game.empty_mark
+            if is_best != bool(table.best_moves(x_bits=x_bits, o_bits=o_bits) >> pos & 1):
+                raise ValueError(f"Best move mismatch for {board} at {pos}")
+
+        game.current_player = mark
+        if table.heuristic_move(x_bits=x_bits, o_bits=o_bits) != game.computer_move_heuristic_logic(empty_positions=game.get_empty_positions()):
+            raise ValueError(f"Heuristic move mismatch for {board}")
+    return len(values)
+
+
+def main() -> None:
+    from game_logic import PyTacToeGame
+
+    import argparse # CLI only, keeps the table quick to import for the game
+    parser = argparse.ArgumentParser(description="Build or verify the precomputed 3x3 solved-position table.")
+    parser.add_argument("command", choices=("build", "verify"))
+    parser.add_argument("--path", default=SOLVED_TABLE_PATH, help="Table file (default: solved_3x3.bin next to this file)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        write_table(records=build_records(game=PyTacToeGame()), path=args.path)
+        print(f"Wrote {RECORD_COUNT} records to {args.path}")
+    else:
+        table = PyTacToeSolvedTable(path=args.path)
+        checked = verify_table(table=table, game=PyTacToeGame())
+        table.close()
+        print(f"Verified {checked} reachable positions in {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+This .py file defines the PyTacToeTablebase class, the solved 4x4 endgame tablebases (4 and 3 in a row), and the retrograde solver that builds them.
+
+The solver enumerates every position of the 4x4 board at once (NumPy arrays over the perfect index), marks the reachable ones w/a forward pass
+and then works backward from the terminal positions, one move count at a time from the full board down to the empty one:
+a terminal position gets its result, every other position the best of its successors for the side to move.
+Each position is stored as one 2-bit game value at the same base-3 perfect index as the 3x3 solved table (0 empty, 1 X, 2 O per cell),
+four positions per byte, position i in bits 2 * (i % 4):
+    0 unreachable, 1 O wins, 2 draw, 3 X wins
+That is 3^16 / 4 bytes (~10.3 MiB) per tablebase. The files are loaded through mmap, so a probe is an O(1) read, and the optimal moves
+of a position are the successors w/the same value (one probe per empty cell). The files are generated, not checked in.
+
+Run this file directly to build or verify a tablebase (building needs NumPy, probing doesn't):
+    python tablebase.py build --win-length 4     # solve 4x4 4-in-a-row and write tablebase_4x4_k4.bin
+    python tablebase.py verify --win-length 3    # check random positions against the alpha-beta engine
+"""
+
+import mmap
+import os
+import struct
+from solved_table import CODE_TO_VALUE, HEADER_FORMAT, HEADER_SIZE, VALUE_TO_CODE
+
+ROWS : int = 4
+COLS : int = 4
+CELL_COUNT : int = ROWS * COLS
+RECORD_COUNT : int = 3 ** CELL_COUNT
+PACKED_SIZE : int = (RECORD_COUNT + 3) // 4
+TABLEBASE_WIN_LENGTHS : tuple[int, ...] = (3, 4)
+MAGIC : bytes = b"PTTB"
+VERSION : int = 1
+
+CODE_UNREACHABLE : int = 0
+CODE_O_WINS : int = VALUE_TO_CODE[-1]
+CODE_DRAW : int = VALUE_TO_CODE[0]
+CODE_X_WINS : int = VALUE_TO_CODE[1] # Codes are ordered like the values, X takes the highest successor code and O the lowest
+
+CELL_WEIGHTS : tuple[int, ...] = tuple(3 ** cell for cell in range(CELL_COUNT))
+LOW_WEIGHTS : tuple[int, ...] = tuple(sum(3 ** i for i in range(8) if bits >> i & 1) for bits in range(256))
+HIGH_WEIGHTS : tuple[int, ...] = tuple(weight * 3 ** 8 for weight in LOW_WEIGHTS)
+
+
+def tablebase_path(win_length : int) -> str:
+    """Returns the default path of the 4x4 tablebase for the given win length (next to this file)."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"tablebase_4x4_k{win_length}.bin")
+
+
+def position_index(x_bits : int, o_bits : int) -> int:
+    """Returns the perfect index of a 4x4 position, the base-3 number with digit 1 for X cells and 2 for O cells."""
+    return LOW_WEIGHTS[x_bits & 0xFF] + HIGH_WEIGHTS[x_bits >> 8] + 2 * (LOW_WEIGHTS[o_bits & 0xFF] + HIGH_WEIGHTS[o_bits >> 8])
+
+
+class PyTacToeTablebase:
+
+    def __init__(self, win_length : int, path : str | None = None):
+        self.win_length : int = win_length
+        self.path : str = path or tablebase_path(win_length=win_length)
+        with open(self.path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, rows, cols, file_win_length, record_count = struct.unpack_from(HEADER_FORMAT, self.mmap, 0)
+        if (magic != MAGIC or version != VERSION or (rows, cols, file_win_length, record_count) != (ROWS, COLS, win_length, RECORD_COUNT)
+                or len(self.mmap) != HEADER_SIZE + PACKED_SIZE):
+            self.mmap.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} 4x4 k={win_length} tablebase.")
+
+
+    def best_moves(self, x_bits : int, o_bits : int) -> int:
+        """Returns the mask of the optimal moves for the side to move in the given position (0 if terminal or unreachable)."""
+        index = position_index(x_bits=x_bits, o_bits=o_bits)
+        code = self.code_at(index=index)
+        if code == CODE_UNREACHABLE: return 0
+        occupied = x_bits | o_bits
+        digit = 1 if x_bits.bit_count() == o_bits.bit_count() else 2
+        best_mask = 0
+        for cell in range(CELL_COUNT):
+            if not occupied >> cell & 1 and self.code_at(index=index + digit * CELL_WEIGHTS[cell]) == code: best_mask |= 1 << cell
+        return best_mask # A terminal position has no reachable successors, so its mask stays 0
+
+
+    def close(self) -> None:
+        """Releases the memory map."""
+        self.mmap.close()
+
+
+    def code(self, x_bits : int, o_bits : int) -> int:
+        """Returns the raw 2-bit code stored for the given position."""
+        return self.code_at(index=position_index(x_bits=x_bits, o_bits=o_bits))
+
+
+    def code_at(self, index : int) -> int:
+        """Returns the raw 2-bit code stored at the given perfect index."""
+        return self.mmap[HEADER_SIZE + (index >> 2)] >> ((index & 3) << 1) & 0x3
+
+
+    def codes(self, indices):
+        """Vectorized code_at(): returns the codes stored at a NumPy array of perfect indices as a uint8 array (needs NumPy)."""
+        import numpy as np
+        packed = np.frombuffer(self.mmap, dtype=np.uint8, count=PACKED_SIZE, offset=HEADER_SIZE)
+        return packed[indices >> 2] >> ((indices & 3) << 1).astype(np.uint8) & 0x3
+
+
+    def value(self, x_bits : int, o_bits : int) -> int | None:
+        """Returns the game value of the given position from X's perspective (+1 X wins, 0 draw, -1 O wins), or None if unreachable."""
+        return CODE_TO_VALUE.get(self.code(x_bits=x_bits, o_bits=o_bits))
+
+
+_shared_tablebases : dict[str, PyTacToeTablebase | None] = {}
+
+def load_shared_tablebase(win_length : int, path : str | None = None) -> PyTacToeTablebase | None:
+    """Returns the process-wide tablebase for the win length (mapped on first use), or None if there is none or the file is missing or invalid."""
+    if win_length not in TABLEBASE_WIN_LENGTHS: return None
+    path = path or tablebase_path(win_length=win_length)
+    if path not in _shared_tablebases:
+        try:
+            _shared_tablebases[path] = PyTacToeTablebase(win_length=win_length, path=path)
+        except (OSError, ValueError):
+            _shared_tablebases[path] = None
+    return _shared_tablebases[path]
+
+
+def solve_tablebase(winning_masks : tuple[int, ...]):
+    """Solves every reachable 4x4 position for the given winning lines by retrograde analysis.
+    Returns the packed tablebase as a NumPy uint8 array of PACKED_SIZE bytes.
+    """
+    import numpy as np
+
+    # x/o bitboards of every perfect index: appending cell i multiplies the index space by 3 w/digits 0 (empty), 1 (X), 2 (O)
+    x_bits = np.zeros(1, dtype=np.uint16)
+    o_bits = np.zeros(1, dtype=np.uint16)
+    for cell in range(CELL_COUNT):
+        bit = np.uint16(1 << cell)
+        x_bits = np.concatenate((x_bits, x_bits | bit, x_bits))
+        o_bits = np.concatenate((o_bits, o_bits, o_bits | bit))
+
+    all_bits = np.arange(1 << CELL_COUNT, dtype=np.uint32)
+    popcount = np.zeros(1 << CELL_COUNT, dtype=np.uint8)
+    has_line = np.zeros(1 << CELL_COUNT, dtype=bool)
+    for cell in range(CELL_COUNT): popcount += (all_bits >> cell & 1).astype(np.uint8)
+    for mask in winning_masks: has_line |= (all_bits & mask) == mask
+
+    x_count, o_count = popcount[x_bits], popcount[o_bits]
+    moves_played = x_count + o_count
+    legal = (x_count == o_count) | (x_count == o_count + 1)
+    x_won, o_won = has_line[x_bits], has_line[o_bits]
+    terminal = x_won | o_won | (moves_played == CELL_COUNT)
+    del x_count, o_count
+
+    layers = [np.flatnonzero(legal & (moves_played == count)) for count in range(CELL_COUNT + 1)] # Indices by # of moves played
+    del legal, moves_played
+    weights = np.array(CELL_WEIGHTS, dtype=np.int64)
+
+    # Forward pass: a position is reachable if a reachable, unfinished position leads to it
+    reachable = np.zeros(RECORD_COUNT, dtype=bool)
+    reachable[0] = True
+    for count in range(CELL_COUNT):
+        parents = layers[count][reachable[layers[count]] & ~terminal[layers[count]]]
+        digit = 1 if count % 2 == 0 else 2
+        occupied = x_bits[parents] | o_bits[parents]
+        for cell in range(CELL_COUNT):
+            reachable[parents[(occupied >> cell & 1) == 0] + digit * weights[cell]] = True
+        layers[count + 1] = layers[count + 1][reachable[layers[count + 1]]]
+    del reachable
+
+    # Backward pass: terminal positions get their result, the others the best successor for the side to move (layer by layer from the full board)
+    codes = np.zeros(PACKED_SIZE * 4, dtype=np.uint8) # Padded to whole bytes, the padding stays unreachable
+    for count in range(CELL_COUNT, -1, -1):
+        layer = layers[count]
+        is_terminal = terminal[layer]
+        done = layer[is_terminal]
+        codes[done] = np.where(x_won[done], CODE_X_WINS, np.where(o_won[done], CODE_O_WINS, CODE_DRAW))
+
+        open_positions = layer[~is_terminal]
+        if not len(open_positions): continue
+        x_to_move = count % 2 == 0
+        digit = 1 if x_to_move else 2
+        occupied = x_bits[open_positions] | o_bits[open_positions]
+        best = np.full(len(open_positions), CODE_O_WINS if x_to_move else CODE_X_WINS, dtype=np.uint8)
+        for cell in range(CELL_COUNT):
+            empty = (occupied >> cell & 1) == 0
+            successors = codes[open_positions[empty] + digit * weights[cell]]
+            best[empty] = np.maximum(best[empty], successors) if x_to_move else np.minimum(best[empty], successors)
+        codes[open_positions] = best
+
+    codes = codes.reshape(-1, 4)
+    return codes[:, 0] | codes[:, 1] << 2 | codes[:, 2] << 4 | codes[:, 3] << 6
+
+
+def write_tablebase(packed, win_length : int, path : str | None = None) -> None:
+    """Writes the header and packed values to path (replacing it atomically)."""
+    path = path or tablebase_path(win_length=win_length)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, ROWS, COLS, win_length, RECORD_COUNT))
+        packed.tofile(file)
+    os.replace(temp_path, path)
+
+
+def verify_tablebase(tablebase : PyTacToeTablebase, samples : int, seed : int = 0) -> int:
+    """Checks the value and the optimal move mask of random reachable positions (random games stopped at a random move) against the alpha-beta engine.
+    Positions w/fewer than 4 moves played are skipped, the engine needs seconds for those on 4x4.
+    Returns the # of positions checked, raises ValueError on the first mismatch.
+    """
+    import random
+    from game_logic import PyTacToeGame
+
+    rng = random.Random(seed)
+    game = PyTacToeGame(rows=ROWS, cols=COLS, win_length=tablebase.win_length)
+    engine = game.minimax_engine
+    checked = 0
+    while checked < samples:
+        x_bits = o_bits = 0
+        moves = rng.sample(range(CELL_COUNT), rng.randrange(4, CELL_COUNT + 1))
+        for count, move in enumerate(moves):
+            if count % 2 == 0: x_bits |= 1 << move
+            else: o_bits |= 1 << move
+            if game.has_line(x_bits) or game.has_line(o_bits): break
+
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        _, value = engine.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move) # Values from X's perspective, like the tablebase
+        if tablebase.value(x_bits=x_bits, o_bits=o_bits) != value:
+            raise ValueError(f"Value mismatch for x={x_bits:#06x} o={o_bits:#06x}: tablebase {tablebase.value(x_bits=x_bits, o_bits=o_bits)}, engine {value}")
+        checked += 1
+        if game.has_line(x_bits) or game.has_line(o_bits): continue
+
+        best_moves = tablebase.best_moves(x_bits=x_bits, o_bits=o_bits)
+        for cell in range(CELL_COUNT):
+            if (x_bits | o_bits) >> cell & 1: continue
+            child = (x_bits | 1 << cell, o_bits) if x_to_move else (x_bits, o_bits | 1 << cell)
+            is_best = engine.best_move(x_bits=child[0], o_bits=child[1], x_to_move=not x_to_move)[1] == value
+            if is_best != bool(best_moves >> cell & 1): raise ValueError(f"Best move mismatch for x={x_bits:#06x} o={o_bits:#06x} at {cell}")
+    return checked
+
+
+def main() -> None:
+    import argparse # CLI only, keeps the tablebase quick to import for the game
+    import time
+    from game_logic import PyTacToeGame
+
+    parser = argparse.ArgumentParser(description="Build or verify the 4x4 endgame tablebases.")
+    parser.add_argument("command", choices=("build", "verify"))
+    parser.add_argument("--win-length", type=int, choices=TABLEBASE_WIN_LENGTHS, default=4)
+    parser.add_argument("--path", default=None, help="Tablebase file (default: tablebase_4x4_k<win length>.bin next to this file)")
+    parser.add_argument("--samples", type=int, default=200, help="# of random positions to verify")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    path = args.path or tablebase_path(win_length=args.win_length)
+
+    start = time.perf_counter()
+    if args.command == "build":
+        winning_masks = PyTacToeGame(rows=ROWS, cols=COLS, win_length=args.win_length).geometry.winning_masks
+        write_tablebase(packed=solve_tablebase(winning_masks=winning_masks), win_length=args.win_length, path=path)
+        print(f"Solved 4x4 k={args.win_length} in {time.perf_counter() - start:.1f}s, wrote {HEADER_SIZE + PACKED_SIZE} bytes to {path}")
+    else:
+        tablebase = PyTacToeTablebase(win_length=args.win_length, path=path)
+        checked = verify_tablebase(tablebase=tablebase, samples=args.samples, seed=args.seed)
+        tablebase.close()
+        print(f"Verified {checked} random positions of {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
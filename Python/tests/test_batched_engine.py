@@ -0,0 +1,72 @@
+import pytest
+np = pytest.importorskip("numpy")
+from batched_engine import DRAW, ONGOING, O, X, PyTacToeBatchedGame
+from game_logic import PyTacToeGame, PyTacToeGameComputerLogic
+
+BATCHED_LOGICS = (PyTacToeGameComputerLogic.HEURISTIC, PyTacToeGameComputerLogic.HEURISTIC_DIFFICULT, PyTacToeGameComputerLogic.MINIMAX_WIN_IMPOSSIBLE)
+
+
+def reachable_positions() -> list[tuple[int, int]]:
+    """Returns every position reachable on 3x3 w/'X' moving first (5478, finished ones included) as (x_bits, o_bits)."""
+    game = PyTacToeGame()
+    seen : set[tuple[int, int]] = set()
+    stack = [(0, 0)]
+    while stack:
+        x_bits, o_bits = stack.pop()
+        if (x_bits, o_bits) in seen: continue
+        seen.add((x_bits, o_bits))
+        if game.has_line(x_bits) or game.has_line(o_bits): continue
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        for cell in range(9):
+            if (x_bits | o_bits) >> cell & 1: continue
+            stack.append((x_bits | 1 << cell, o_bits) if x_to_move else (x_bits, o_bits | 1 << cell))
+    return sorted(seen)
+
+
+POSITIONS = reachable_positions()
+
+
+@pytest.fixture(scope="module")
+def batch() -> PyTacToeBatchedGame:
+    batch = PyTacToeBatchedGame(batch_size=0)
+    batch.load_bitboards(positions=POSITIONS)
+    return batch
+
+
+def scalar_game(x_bits : int, o_bits : int) -> PyTacToeGame:
+    game = PyTacToeGame()
+    game.x_bits, game.o_bits, game.last_move = x_bits, o_bits, -1
+    game.current_player = 'X' if x_bits.bit_count() == o_bits.bit_count() else 'O'
+    return game
+
+
+def test_every_position_is_loaded(batch):
+    assert len(POSITIONS) == 5478
+    assert batch.bitboards() == POSITIONS
+
+
+def test_results_match_scalar_engine(batch):
+    expected = []
+    for x_bits, o_bits in POSITIONS:
+        winner = scalar_game(x_bits=x_bits, o_bits=o_bits).check_winner()
+        expected.append(X if winner == 'X' else O if winner == 'O' else DRAW if (x_bits | o_bits) == 0x1FF else ONGOING)
+    assert batch.check_results().tolist() == expected
+
+
+@pytest.mark.parametrize("logic", BATCHED_LOGICS, ids=lambda logic: logic.name)
+def test_moves_match_scalar_engine_on_every_position(batch, logic):
+    moves = batch.computer_moves(logic=logic).tolist()
+    for (x_bits, o_bits), move, result in zip(POSITIONS, moves, batch.results.tolist()):
+        if result != ONGOING:
+            assert move == -1
+            continue
+        game = scalar_game(x_bits=x_bits, o_bits=o_bits)
+        game.computer_logic_enum = logic
+        assert move == game.select_computer_move(), (hex(x_bits), hex(o_bits))
+
+
+def test_random_moves_are_legal(batch):
+    moves = batch.random_moves()
+    ongoing = batch.results == ONGOING
+    assert np.all(moves[~ongoing] == -1)
+    assert np.all(batch.boards[np.flatnonzero(ongoing), moves[ongoing]] == 0)
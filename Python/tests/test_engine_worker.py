@@ -0,0 +1,88 @@
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from engine_worker import WORKER_PATH, PyTacToeEngineClient, PyTacToeEngineError
+from game_logic import PyTacToeGame, PyTacToeSearchCancelled
+
+
+def run_worker(commands : str, timeout : float = 60) -> list[str]:
+    """Pipes the commands into a fresh worker and returns its reply lines."""
+    result = subprocess.run([sys.executable, WORKER_PATH], input=commands, capture_output=True, text=True, timeout=timeout)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.splitlines()
+
+
+def test_documented_example_replies_bestmove():
+    replies = run_worker("geometry 4 4 4\nposition startpos moves 5 6\ndifficulty 3\ngo id 1\nquit\n")
+    assert len(replies) == 1 and replies[0].startswith("bestmove ") and replies[0].endswith(" id 1")
+
+
+def test_pipelined_batch_ending_in_quit_answers_every_go():
+    commands = "ptt\n" + "".join(f"position startpos moves {move}\ndifficulty 3\ngo id {move}\n" for move in range(9)) + "isready\nquit\ngo id late\n"
+    replies = run_worker(commands)
+    assert replies[:2] == ["id name Py-Tac-Toe", "pttok"]
+    assert [reply.split()[-1] for reply in replies[2:-1]] == [str(move) for move in range(9)]
+    assert all(reply.startswith("bestmove ") for reply in replies[2:-1])
+    assert replies[-1] == "readyok" # Nothing after quit runs
+
+
+def test_end_of_input_runs_queued_commands():
+    assert run_worker("position board XX.OO.... X\ndifficulty 2\ngo\n") == ["bestmove 2"]
+
+
+def test_game_over_and_errors():
+    replies = run_worker("position board XXXOO.... O\ngo id 1\nfoo\ndifficulty 9\nposition board XX\nposition startpos moves 4 4\ngeometry 3 3\n")
+    assert replies[0] == "bestmove none id 1"
+    assert len(replies) == 6 and all(reply.startswith("error ") for reply in replies[1:])
+
+
+def test_stop_cancels_only_the_searches_before_it():
+    worker = subprocess.Popen([sys.executable, WORKER_PATH], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        worker.stdin.write("geometry 5 5 4\ndifficulty 3\ngo id slow\ngo id queued\n") # Impossible on 5x5 doesn't finish in time
+        worker.stdin.flush()
+        time.sleep(0.3)
+        worker.stdin.write("stop\ngeometry 3 3 3\nposition board XX.OO.... X\ngo id after\nquit\n")
+        worker.stdin.flush()
+        replies = worker.communicate(timeout=30)[0].splitlines()
+    finally:
+        worker.kill()
+    assert replies == ["cancelled id slow", "cancelled id queued", "bestmove 2 id after"]
+
+
+def test_client_matches_in_process_moves():
+    client = PyTacToeEngineClient()
+    try:
+        games = []
+        for rows, cols, win_length, difficulty, moves in [(3, 3, 3, 1, [4]), (3, 3, 3, 2, [0, 4, 8]), (3, 3, 3, 3, []), (4, 4, 3, 3, [5, 6, 9])]:
+            game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+            game.send_difficulty_selected_to_game_class(difficulty=difficulty)
+            for move in moves:
+                game.make_move(move)
+                game.switch_player()
+            games.append(game)
+        expected = [game.select_computer_move() for game in games]
+        assert [client.best_move(game=game) for game in games] == expected
+        assert client.best_moves(games=games) == expected
+    finally:
+        client.close()
+    assert client.process.returncode == 0
+
+
+def test_client_cancel_and_worker_exit():
+    client = PyTacToeEngineClient()
+    game = PyTacToeGame(rows=5, cols=5, win_length=4)
+    game.send_difficulty_selected_to_game_class(difficulty=3)
+    stop_event = threading.Event()
+    threading.Timer(0.2, stop_event.set).start()
+    with pytest.raises(PyTacToeSearchCancelled):
+        client.best_move(game=game, stop_event=stop_event)
+
+    small = PyTacToeGame()
+    small.send_difficulty_selected_to_game_class(difficulty=3)
+    assert client.best_move(game=small) == small.select_computer_move() # The late reply of the cancelled search is skipped
+    client.close()
+    with pytest.raises(PyTacToeEngineError):
+        client.best_move(game=small)
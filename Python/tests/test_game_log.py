@@ -0,0 +1,21 @@
+import os
+from game_log import OUTCOME_O, OUTCOME_X, PyTacToeGameLogWriter, PyTacToeGameRecord, decode_record, read_game_log
+
+
+def test_writer_truncates_a_record_cut_short_before_appending(tmp_path):
+    path = str(tmp_path / "games.log")
+    with PyTacToeGameLogWriter(path=path) as writer:
+        for moves in ([4, 0, 8, 2, 6], [0, 1, 2, 3, 4, 5, 6], [8, 7, 6, 5, 4]):
+            writer.append(PyTacToeGameRecord(moves=moves, outcome=OUTCOME_X, mode='2-Player', timestamp=1))
+    with open(path, "rb+") as file: file.truncate(os.path.getsize(path) - 3) # Interrupted write of the last record
+
+    with PyTacToeGameLogWriter(path=path) as writer:
+        for _ in range(3): writer.append(PyTacToeGameRecord(moves=[1, 4, 7], outcome=OUTCOME_X, mode='2-Player', timestamp=2))
+    assert [record.moves for record in read_game_log(path=path, chunk_size=5)] == [[4, 0, 8, 2, 6], [0, 1, 2, 3, 4, 5, 6]] + [[1, 4, 7]] * 3
+
+
+def test_first_player_round_trips():
+    for first_player in ('X', 'O'):
+        record = PyTacToeGameRecord(moves=[0, 3, 1, 4, 2], outcome=OUTCOME_O, mode='2-Player', rows=4, cols=4, win_length=3, first_player=first_player)
+        decoded, _ = decode_record(data=record.encode(), offset=0)
+        assert (decoded.first_player, decoded.moves, decoded.rows) == (first_player, [0, 3, 1, 4, 2], 4)
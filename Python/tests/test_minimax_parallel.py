@@ -0,0 +1,45 @@
+import random
+import pytest
+from game_logic import PyTacToeGame
+from minimax_engine import PARALLEL_MIN_EMPTY, PyTacToeMinimaxEngine
+
+
+def serial_and_parallel(rows : int, cols : int, win_length : int) -> tuple[PyTacToeMinimaxEngine, PyTacToeMinimaxEngine]:
+    """Returns two fresh engines for the geometry, each w/its own transposition table: one serial, one splitting the root over 2 workers.
+    The parallel engine fails the test if a search falls back to the serial search_root().
+    """
+    masks = PyTacToeGame(rows=rows, cols=cols, win_length=win_length).winning_masks
+    serial = PyTacToeMinimaxEngine(rows=rows, cols=cols, winning_masks=masks)
+    parallel = PyTacToeMinimaxEngine(rows=rows, cols=cols, winning_masks=masks)
+    parallel.workers = 2
+    def no_serial_search(own : int, opp : int) -> tuple[int, int]: raise AssertionError("Expected a root-split search")
+    parallel.search_root = no_serial_search
+    return serial, parallel
+
+
+def random_positions(game : PyTacToeGame, marks : int, count : int, seed : int) -> list[tuple[int, int]]:
+    """Returns count random unfinished positions w/the given # of marks, 'X' moving first."""
+    rng = random.Random(seed)
+    positions : list[tuple[int, int]] = []
+    while len(positions) < count:
+        cells = rng.sample(range(game.cell_count), marks)
+        x_bits, o_bits = sum(1 << cell for cell in cells[0::2]), sum(1 << cell for cell in cells[1::2])
+        if not game.has_line(x_bits) and not game.has_line(o_bits): positions.append((x_bits, o_bits))
+    return positions
+
+
+def test_root_split_matches_serial_on_3x3_openings():
+    serial, parallel = serial_and_parallel(rows=3, cols=3, win_length=3)
+    for x_bits, o_bits, x_to_move in [(0, 0, True)] + [(1 << cell, 0, False) for cell in range(9)]:
+        expected = serial.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move)
+        assert parallel.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move) == expected, (x_bits, o_bits)
+
+
+@pytest.mark.parametrize("win_length, marks", [(4, 6), (4, 7), (3, 3), (3, 4)])
+def test_root_split_matches_serial_on_4x4(win_length, marks):
+    serial, parallel = serial_and_parallel(rows=4, cols=4, win_length=win_length)
+    assert 16 - marks >= PARALLEL_MIN_EMPTY
+    for x_bits, o_bits in random_positions(game=PyTacToeGame(rows=4, cols=4, win_length=win_length), marks=marks, count=6, seed=marks):
+        x_to_move = marks % 2 == 0
+        expected = serial.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move)
+        assert parallel.best_move(x_bits=x_bits, o_bits=o_bits, x_to_move=x_to_move) == expected, (hex(x_bits), hex(o_bits))
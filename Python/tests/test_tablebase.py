@@ -0,0 +1,73 @@
+import functools
+import os
+import random
+import pytest
+from game_logic import PyTacToeGame
+from tablebase import CELL_COUNT, PyTacToeTablebase, solve_tablebase, tablebase_path, write_tablebase
+
+
+@pytest.fixture(scope="module", params=[3, 4], ids=["k3", "k4"])
+def tablebase(request, tmp_path_factory) -> PyTacToeTablebase:
+    """The generated tablebase for the win length, solved into a temporary file if it hasn't been generated (needs NumPy)."""
+    win_length = request.param
+    path = tablebase_path(win_length=win_length)
+    if not os.path.exists(path):
+        pytest.importorskip("numpy")
+        path = str(tmp_path_factory.mktemp("tablebase") / os.path.basename(path))
+        write_tablebase(solve_tablebase(winning_masks=PyTacToeGame(rows=4, cols=4, win_length=win_length).winning_masks), win_length=win_length, path=path)
+    tablebase = PyTacToeTablebase(win_length=win_length, path=path)
+    yield tablebase
+    tablebase.close()
+
+
+def exhaustive_negamax(winning_masks : tuple[int, ...]):
+    """Returns value(x_bits, o_bits): the game value from X's perspective by a plain memoized negamax over every continuation, 'X' moving first."""
+    def has_line(bits : int) -> bool: return any(bits & mask == mask for mask in winning_masks)
+
+    @functools.cache
+    def value(x_bits : int, o_bits : int) -> int:
+        if has_line(x_bits): return 1
+        if has_line(o_bits): return -1
+        empty = [cell for cell in range(CELL_COUNT) if not (x_bits | o_bits) >> cell & 1]
+        if not empty: return 0
+        if x_bits.bit_count() == o_bits.bit_count(): return max(value(x_bits | 1 << cell, o_bits) for cell in empty)
+        return min(value(x_bits, o_bits | 1 << cell) for cell in empty)
+    return value
+
+
+def random_positions(game : PyTacToeGame, marks : int, count : int, seed : int) -> list[tuple[int, int]]:
+    """Returns the positions of count random games, each stopped after marks moves or once a side completes a line ('X' moving first)."""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        x_bits = o_bits = 0
+        for ply, cell in enumerate(rng.sample(range(CELL_COUNT), marks)):
+            if ply % 2 == 0: x_bits |= 1 << cell
+            else: o_bits |= 1 << cell
+            if game.has_line(x_bits) or game.has_line(o_bits): break
+        positions.append((x_bits, o_bits))
+    return positions
+
+
+@pytest.mark.parametrize("marks", [7, 8, 10, 13])
+def test_values_and_best_moves_match_exhaustive_negamax(tablebase, marks):
+    game = PyTacToeGame(rows=4, cols=4, win_length=tablebase.win_length)
+    value = exhaustive_negamax(winning_masks=game.winning_masks)
+    for x_bits, o_bits in random_positions(game=game, marks=marks, count=25, seed=marks):
+        expected = value(x_bits, o_bits)
+        assert tablebase.value(x_bits=x_bits, o_bits=o_bits) == expected, (hex(x_bits), hex(o_bits))
+
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        best_moves = 0
+        if not game.has_line(x_bits) and not game.has_line(o_bits):
+            for cell in range(CELL_COUNT):
+                if (x_bits | o_bits) >> cell & 1: continue
+                child = value(x_bits | 1 << cell, o_bits) if x_to_move else value(x_bits, o_bits | 1 << cell)
+                if child == expected: best_moves |= 1 << cell
+        assert tablebase.best_moves(x_bits=x_bits, o_bits=o_bits) == best_moves, (hex(x_bits), hex(o_bits))
+
+
+def test_unreachable_positions_have_no_value(tablebase):
+    assert tablebase.value(x_bits=0, o_bits=1) is None             # 'O' moved first
+    assert tablebase.value(x_bits=0b111, o_bits=0) is None         # 'X' moved three times in a row
+    assert tablebase.value(x_bits=0, o_bits=0) is not None
@@ -0,0 +1,325 @@
+"""
+This .py file is a headless round-robin tournament runner (no tkinter) for PyTacToeGameComputerLogic engine configurations.
+
+Every pair of engines plays --games-per-pair games, alternating which engine plays 'X' (moves first). Games are spread over a process pool,
+each game seeds its RNGs from the base seed, the pair and the game index, so results don't depend on the # of workers or the order games finish in
+(engines w/a time budget rather than a fixed # of iterations still depend on the speed of the machine).
+Finished games are appended to a JSON lines results file as they complete, rerunning w/the same file only plays the games still missing.
+Every result line records its game seed, board geometry and per-move budgets, a rerun w/a different seed, geometry or default budget is rejected
+rather than mixed into the old results.
+
+The report has Elo ratings fit by maximum likelihood over all games, 95% confidence intervals from a bootstrap over each pair's games,
+and per-engine move time statistics, so a faster engine can be checked against the one it replaces for strength.
+
+An engine is given by logic name (or value) w/optional parameters:
+    RANDOM  HEURISTIC_DIFFICULT  MCTS:iterations=500  MCTS:budget=0.01,exploration=1.0  ITERATIVE_DEEPENING:budget=0.2
+    budget      -> PyTacToeGame.search_time_budget (seconds per move, ITERATIVE_DEEPENING and MCTS)
+    iterations  -> MCTS iterations per move instead of the time budget
+    exploration -> MCTS UCT exploration constant
+
+Example:
+    python tournament.py --engines RANDOM HEURISTIC HEURISTIC_DIFFICULT MINIMAX_WIN_IMPOSSIBLE MCTS:iterations=200 --games-per-pair 200 --results results.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import time
+from multiprocessing import Pool
+from game_logic import DEFAULT_SEARCH_TIME_BUDGET, PyTacToeGame, PyTacToeGameComputerLogic
+from mcts_engine import DEFAULT_EXPLORATION
+
+DEFAULT_GAMES_PER_PAIR : int = 50
+DEFAULT_BOOTSTRAP_SAMPLES : int = 200
+ELO_ANCHOR : float = 1500.0     # Average rating of the field
+ELO_PRIOR_DRAWS : float = 1.0   # Virtual drawn games added to every pair, keeps ratings finite for engines that never (or always) score
+ELO_MAX_ITERATIONS : int = 10_000
+ELO_TOLERANCE : float = 1e-10
+ENGINE_PARAMETERS : tuple[str, ...] = ("budget", "iterations", "exploration")
+
+
+class PyTacToeEngineConfig:
+
+    def __init__(self, logic : PyTacToeGameComputerLogic, budget : float | None = None, iterations : int | None = None,
+                 exploration : float | None = None):
+        self.logic : PyTacToeGameComputerLogic = logic
+        self.budget : float | None = budget             # Seconds per move, None -> DEFAULT_SEARCH_TIME_BUDGET
+        self.iterations : int | None = iterations       # MCTS iterations per move, None -> use the time budget
+        self.exploration : float | None = exploration   # MCTS exploration constant, None -> DEFAULT_EXPLORATION
+
+
+    @classmethod
+    def parse(cls, spec : str) -> "PyTacToeEngineConfig":
+        """Parses an engine spec like 'MCTS:iterations=500,exploration=1.0' (see the module docstring)."""
+        name, _, parameters = spec.partition(":")
+        try:
+            logic = PyTacToeGameComputerLogic(int(name)) if name.isdigit() else PyTacToeGameComputerLogic[name.upper()]
+        except (KeyError, ValueError):
+            raise argparse.ArgumentTypeError(f"Unknown engine '{name}', choose from: {', '.join(logic.name for logic in PyTacToeGameComputerLogic)}")
+
+        values : dict[str, float | int] = {}
+        for parameter in filter(None, parameters.split(",")):
+            key, _, value = parameter.partition("=")
+            if key not in ENGINE_PARAMETERS: raise argparse.ArgumentTypeError(f"Unknown engine parameter '{key}' in '{spec}'")
+            try:
+                values[key] = int(value) if key == "iterations" else float(value)
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"Invalid value for '{key}' in '{spec}'")
+            if key == "iterations" and values[key] < 1: raise argparse.ArgumentTypeError(f"MCTS iterations must be >= 1 in '{spec}'")
+        return cls(logic=logic, **values)
+
+
+    @property
+    def time_budget(self) -> float:
+        """Seconds per move this configuration plays w/."""
+        return DEFAULT_SEARCH_TIME_BUDGET if self.budget is None else self.budget
+
+
+    @property
+    def label(self) -> str:
+        """Canonical name of the configuration, identifies it in the results file."""
+        parameters = [f"{key}={getattr(self, key)}" for key in ENGINE_PARAMETERS if getattr(self, key) is not None]
+        return self.logic.name + (":" + ",".join(parameters) if parameters else "")
+
+
+    def configure(self, game : PyTacToeGame) -> None:
+        """Sets the game (and its shared MCTS engine) up to move w/this configuration."""
+        game.computer_logic_enum = self.logic
+        game.search_time_budget = self.time_budget
+        if self.logic == PyTacToeGameComputerLogic.MCTS:
+            engine = game.mcts_engine
+            engine.iterations = self.iterations
+            engine.exploration = DEFAULT_EXPLORATION if self.exploration is None else self.exploration
+            engine.workers = 1 # The tournament already runs one game per worker process
+
+
+def game_seed(seed : int, pair : tuple[str, str], game_index : int) -> int:
+    """Returns the RNG seed of one game, derived from the base seed, the pair and the game index only."""
+    return random.Random(f"{seed}:{pair[0]}:{pair[1]}:{game_index}").getrandbits(64)
+
+
+def play_game(job : tuple) -> dict:
+    """Worker entry point: plays one tournament game and returns its result line.
+    job = (pair of engine labels, game index, seed, rows, cols, win length). The first engine of the pair plays 'X' in even games.
+    """
+    pair, game_index, seed, rows, cols, win_length = job
+    x_label, o_label = pair if game_index % 2 == 0 else pair[::-1]
+    engines = {'X': PyTacToeEngineConfig.parse(x_label), 'O': PyTacToeEngineConfig.parse(o_label)}
+
+    game = PyTacToeGame(rows=rows, cols=cols, win_length=win_length)
+    game.rng = random.Random(seed)
+    game.mcts_engine.rng = random.Random(seed) # Shared per process, reseeded so the game doesn't depend on the games played before it
+    game.current_player = 'X'
+    move_times : dict[str, list[float]] = {'X': [], 'O': []}
+    winner = None
+    while True:
+        side = game.current_player
+        engines[side].configure(game=game)
+        start = time.perf_counter()
+        game.computer_move()
+        move_times[side].append(time.perf_counter() - start)
+        winner = game.check_winner()
+        if winner or game.check_tie(): break
+
+    return {"pair": list(pair), "game": game_index, "x": x_label, "o": o_label, "seed": seed, "geometry": [rows, cols, win_length],
+            "x_budget": engines['X'].time_budget, "o_budget": engines['O'].time_budget, "winner": winner, "moves": list(game.move_history),
+            "x_times": [round(seconds, 7) for seconds in move_times['X']], "o_times": [round(seconds, 7) for seconds in move_times['O']]}
+
+
+def resume_results(path : str) -> list[dict]:
+    """Reads the result lines of an earlier (possibly interrupted) run. A line cut short at the end of the file is truncated away,
+    so the games still missing can be appended after the complete ones.
+    """
+    results : list[dict] = []
+    if not os.path.exists(path): return results
+    valid_size = 0
+    with open(path, "rb") as file:
+        for line in file:
+            try:
+                if not line.endswith(b"\n"): raise ValueError("Partial line")
+                results.append(json.loads(line))
+            except ValueError: # Partial last line of an interrupted run (json.JSONDecodeError is a ValueError)
+                break
+            valid_size += len(line)
+    if valid_size != os.path.getsize(path):
+        with open(path, "rb+") as file: file.truncate(valid_size)
+    return results
+
+
+def check_resumed_results(results : list[dict], seed : int, rows : int, cols : int, win_length : int) -> None:
+    """Raises ValueError if a resumed result line was played w/another seed, board geometry or time budget than this run would use,
+    mixing it in would skew the ratings (and skip games that were never played under this run's settings).
+    """
+    for result in results:
+        pair = tuple(result["pair"])
+        expected = {"seed": game_seed(seed=seed, pair=pair, game_index=result["game"]), "geometry": [rows, cols, win_length],
+                    "x_budget": PyTacToeEngineConfig.parse(result["x"]).time_budget, "o_budget": PyTacToeEngineConfig.parse(result["o"]).time_budget}
+        mismatched = [key for key, value in expected.items() if result.get(key) != value]
+        if mismatched:
+            raise ValueError(f"Game {result['game']} of {pair[0]} vs {pair[1]} in the results file was played w/a different {', '.join(mismatched)} "
+                             f"(expected {', '.join(f'{key}={expected[key]}' for key in mismatched)}), use a new results file for these settings.")
+
+
+def fit_elo(labels : list[str], pair_scores : dict[tuple[str, str], tuple[float, int]]) -> dict[str, float]:
+    """Maximum likelihood Elo ratings (Bradley-Terry model, a draw counts as half a win for each side) via the MM algorithm.
+    pair_scores maps (a, b) to (a's score, # of games). Ratings are centered on ELO_ANCHOR.
+    """
+    scores = {label: 0.0 for label in labels}
+    games : dict[str, dict[str, float]] = {label: {} for label in labels}
+    for a, b in itertools.combinations(labels, 2):
+        score, count = pair_scores.get((a, b), (0.0, 0))
+        if (b, a) in pair_scores:
+            b_score, count = pair_scores[(b, a)]
+            score = count - b_score
+        scores[a] += score + ELO_PRIOR_DRAWS / 2
+        scores[b] += count - score + ELO_PRIOR_DRAWS / 2
+        games[a][b] = games[b][a] = count + ELO_PRIOR_DRAWS
+
+    strengths = {label: 1.0 for label in labels}
+    for _ in range(ELO_MAX_ITERATIONS):
+        updated = {label: scores[label] / sum(count / (strengths[label] + strengths[other]) for other, count in games[label].items())
+                   for label in labels}
+        scale = math.exp(statistics.fmean(math.log(strength) for strength in updated.values())) # Geometric mean 1 -> average rating ELO_ANCHOR
+        updated = {label: strength / scale for label, strength in updated.items()}
+        converged = max(abs(updated[label] - strengths[label]) / strengths[label] for label in labels) < ELO_TOLERANCE
+        strengths = updated
+        if converged: break
+    return {label: ELO_ANCHOR + 400 * math.log10(strength) for label, strength in strengths.items()}
+
+
+class PyTacToeTournamentReport:
+
+    def __init__(self, labels : list[str], results : list[dict], bootstrap_samples : int = DEFAULT_BOOTSTRAP_SAMPLES, seed : int = 0):
+        self.labels : list[str] = labels
+        self.outcomes : dict[tuple[str, str], list[float]] = {}        # Pair -> score of the pair's first engine in every game
+        self.records : dict[str, list[int]] = {label: [0, 0, 0] for label in labels} # Wins, draws, losses
+        self.move_times : dict[str, list[float]] = {label: [] for label in labels}
+
+        for result in results:
+            pair = tuple(result["pair"])
+            if pair[0] not in self.records or pair[1] not in self.records: continue # Engine not in this tournament
+            score = 0.5 if result["winner"] is None else 1.0 if (result["winner"] == 'X') == (result["x"] == pair[0]) else 0.0
+            self.outcomes.setdefault(pair, []).append(score)
+            for label, label_score in ((pair[0], score), (pair[1], 1.0 - score)):
+                self.records[label][0 if label_score == 1.0 else 1 if label_score == 0.5 else 2] += 1
+            self.move_times[result["x"]].extend(result["x_times"])
+            self.move_times[result["o"]].extend(result["o_times"])
+
+        self.elo : dict[str, float] = fit_elo(labels=labels, pair_scores={pair: (sum(scores), len(scores)) for pair, scores in self.outcomes.items()})
+        self.confidence : dict[str, tuple[float, float]] = self.bootstrap(samples=bootstrap_samples, seed=seed)
+
+
+    def bootstrap(self, samples : int, seed : int) -> dict[str, tuple[float, float]]:
+        """Returns the 95% confidence interval of every rating, from refits on each pair's games resampled w/replacement."""
+        if samples <= 0: return {label: (self.elo[label], self.elo[label]) for label in self.labels}
+        rng = random.Random(seed)
+        ratings : dict[str, list[float]] = {label: [] for label in self.labels}
+        for _ in range(samples):
+            pair_scores = {pair: (sum(rng.choices(scores, k=len(scores))), len(scores)) for pair, scores in self.outcomes.items()}
+            for label, rating in fit_elo(labels=self.labels, pair_scores=pair_scores).items(): ratings[label].append(rating)
+        confidence = {}
+        for label, values in ratings.items():
+            values.sort()
+            confidence[label] = (values[int(0.025 * (samples - 1))], values[int(math.ceil(0.975 * (samples - 1)))])
+        return confidence
+
+
+    def move_time_stats(self, label : str) -> dict[str, float]:
+        """Returns the move count and mean/p50/p95/max move time (milliseconds) of an engine."""
+        times = sorted(self.move_times[label])
+        if not times: return {"moves": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        def percentile(fraction : float) -> float: return times[min(len(times) - 1, int(fraction * len(times)))] * 1e3
+        return {"moves": len(times), "mean_ms": statistics.fmean(times) * 1e3, "p50_ms": percentile(0.50), "p95_ms": percentile(0.95),
+                "max_ms": times[-1] * 1e3}
+
+
+    def to_dict(self) -> dict:
+        """Returns the report as a JSON serializable dict, engines sorted by rating."""
+        engines = []
+        for label in sorted(self.labels, key=lambda label: -self.elo[label]):
+            wins, draws, losses = self.records[label]
+            games = wins + draws + losses
+            engines.append({"engine": label, "elo": self.elo[label], "elo_95_low": self.confidence[label][0], "elo_95_high": self.confidence[label][1],
+                            "games": games, "wins": wins, "draws": draws, "losses": losses,
+                            "score": (wins + draws / 2) / games if games else 0.0, "move_time": self.move_time_stats(label=label)})
+        pairs = {f"{a} vs {b}": {"games": len(scores), "score": sum(scores)} for (a, b), scores in sorted(self.outcomes.items())}
+        return {"engines": engines, "pairs": pairs}
+
+
+def run_tournament(engines : list[PyTacToeEngineConfig], games_per_pair : int = DEFAULT_GAMES_PER_PAIR, workers : int | None = None, seed : int = 0,
+                   rows : int = 3, cols : int = 3, win_length : int = 3, results_path : str | None = None) -> list[dict]:
+    """Plays every game of the round robin not already in the results file over a process pool (workers=1 runs in-process).
+    Each finished game is appended to results_path right away, so an interrupted run resumes where it stopped. Returns every result line.
+    Raises ValueError if the results file holds games played w/another seed, geometry or budget.
+    """
+    labels = [engine.label for engine in engines]
+    if len(set(labels)) != len(labels): raise ValueError("Every engine configuration must be different.")
+    results = resume_results(path=results_path) if results_path else []
+    check_resumed_results(results=results, seed=seed, rows=rows, cols=cols, win_length=win_length)
+    done = {(tuple(result["pair"]), result["game"]) for result in results}
+    jobs = [(pair, game_index, game_seed(seed=seed, pair=pair, game_index=game_index), rows, cols, win_length)
+            for pair in itertools.combinations(sorted(labels), 2) for game_index in range(games_per_pair) if (pair, game_index) not in done]
+
+    output = open(results_path, "a") if results_path else None
+    try:
+        def collect(result : dict) -> None:
+            results.append(result)
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for job in jobs: collect(play_game(job))
+        else:
+            with Pool(processes=workers) as pool:
+                for result in pool.imap_unordered(play_game, jobs, chunksize=max(1, len(jobs) // (workers * 16))): collect(result)
+    finally:
+        if output is not None: output.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Round-robin tournament between Py-Tac-Toe engine configurations w/Elo ratings.")
+    parser.add_argument("--engines", nargs="+", type=PyTacToeEngineConfig.parse, default=None,
+                        help="Engine specs, e.g. RANDOM MCTS:iterations=500 (default: every computer logic w/its default settings)")
+    parser.add_argument("--games-per-pair", type=int, default=DEFAULT_GAMES_PER_PAIR, help="Games per pair of engines, sides alternate every game")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: # of CPU cores)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed, each game derives its own RNG seed from it")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--results", dest="results_path", default=None, help="JSON lines file of finished games, resumed if it exists")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_BOOTSTRAP_SAMPLES, help="Bootstrap samples for the rating confidence intervals")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    engines = args.engines or [PyTacToeEngineConfig(logic=logic) for logic in PyTacToeGameComputerLogic]
+    start = time.perf_counter()
+    try:
+        results = run_tournament(engines=engines, games_per_pair=args.games_per_pair, workers=args.workers, seed=args.seed,
+                                 rows=args.rows, cols=args.cols, win_length=args.win_length, results_path=args.results_path)
+    except ValueError as error:
+        parser.error(str(error))
+    report = PyTacToeTournamentReport(labels=[engine.label for engine in engines], results=results, bootstrap_samples=args.bootstrap, seed=args.seed)
+    summary = report.to_dict()
+
+    print(f"{len(engines)} engines, {sum(pair['games'] for pair in summary['pairs'].values())} games on a {args.rows}x{args.cols} board "
+          f"({args.win_length} in a row) in {time.perf_counter() - start:.2f}s")
+    print(f"  {'engine':<40} {'elo':>7} {'95% ci':>17} {'W':>6} {'D':>6} {'L':>6} {'score':>7}  {'mean ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for engine in summary["engines"]:
+        move_time = engine["move_time"]
+        print(f"  {engine['engine']:<40} {engine['elo']:>7.0f} {engine['elo_95_low']:>8.0f}..{engine['elo_95_high']:<7.0f} {engine['wins']:>6} "
+              f"{engine['draws']:>6} {engine['losses']:>6} {engine['score'] * 100:>6.1f}%  {move_time['mean_ms']:>8.3f} {move_time['p95_ms']:>8.3f} "
+              f"{move_time['max_ms']:>8.3f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as file: json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()